@@ -0,0 +1,84 @@
+"""Waits that race outcomes, with timeouts learned from observed latency.
+
+``race`` waits for whichever of several outcomes shows up first. For
+example, after a folder save it waits for either the new folder in the list
+or the duplicate-folder modal. The happy path no longer sits out a 3 s
+timeout waiting for a modal that never comes. The outcomes are joined into
+one comma-separated selector, so a single ``wait_for_selector`` does the
+racing. That works the same on async pages and on the sync wrapper
+(onboardingEngine.SyncPage).
+
+LatencyTracker keeps the recent durations per wait and sizes each timeout
+from them: p95 times MULTIPLIER plus SLACK_MS, never below FLOOR_MS and
+never above the old fixed timeout. It falls back to the fixed timeout until
+MIN_SAMPLES have been seen. A wait that times out is not a latency sample
+(we never saw the real duration), so it is kept out of the percentiles.
+Instead the next wait for that key gets the full fixed timeout, until one
+succeeds again.
+"""
+
+from collections import defaultdict, deque
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from onboardingTrace import percentile
+
+WINDOW = 50
+MIN_SAMPLES = 5
+MULTIPLIER = 4.0
+SLACK_MS = 250
+FLOOR_MS = 500
+
+
+class LatencyTracker:
+    """Recent durations per wait key; share one between engines so a wave learns together."""
+
+    def __init__(self, window=WINDOW, min_samples=MIN_SAMPLES, multiplier=MULTIPLIER, slack_ms=SLACK_MS,
+                 floor_ms=FLOOR_MS):
+        self._samples = defaultdict(lambda: deque(maxlen=window))
+        self._timed_out = set()
+        self.min_samples = min_samples
+        self.multiplier = multiplier
+        self.slack_ms = slack_ms
+        self.floor_ms = floor_ms
+
+    def record(self, key, ms):
+        self._samples[key].append(ms)
+        self._timed_out.discard(key)
+
+    def record_timeout(self, key):
+        """A wait for ``key`` ran out; the next one gets the full default timeout."""
+        self._timed_out.add(key)
+
+    def timeout_ms(self, key, default_ms):
+        if key in self._timed_out:
+            return default_ms
+        samples = self._samples.get(key)
+        if not samples or len(samples) < self.min_samples:
+            return default_ms
+        learned = percentile(list(samples), 95) * self.multiplier + self.slack_ms
+        return int(min(default_ms, max(self.floor_ms, learned)))
+
+    def snapshot(self):
+        """{key: (samples, p50, p95)} for logs and reports."""
+        return {
+            key: (len(values), percentile(list(values), 50), percentile(list(values), 95))
+            for key, values in self._samples.items() if values
+        }
+
+
+async def race(page, outcomes, timeout_ms):
+    """Wait for the first visible outcome; returns its name, or None on timeout.
+
+    ``outcomes`` is an ordered {name: css selector}. When several are visible
+    at once, the first listed wins, so list decisive outcomes (error modals)
+    first.
+    """
+    try:
+        await page.wait_for_selector(", ".join(outcomes.values()), state="visible", timeout=timeout_ms)
+    except PlaywrightTimeoutError:
+        return None
+    for name, selector in outcomes.items():
+        if await page.is_visible(selector):
+            return name
+    return None
@@ -0,0 +1,91 @@
+"""Deferred loading of the EMIS desktop-automation libraries.
+
+pyautogui, pygetwindow, pyperclip and pywinauto take a long time to import
+(pywinauto pulls in comtypes and the UIA type library), and most sessions
+never use the Password Reset automation. ``available()`` answers "is it
+installed?" from the import system's finders without importing anything.
+``load()`` does the real imports once, on first use, and caches the result.
+
+The imports in ``_import_modules`` are plain ``import`` statements, so
+PyInstaller's static analysis still bundles the libraries into the frozen
+build.
+"""
+
+import importlib.util
+import threading
+from collections import namedtuple
+
+AUTOMATION_MODULES = ("pyautogui", "pygetwindow", "pyperclip", "pywinauto")
+
+AutomationModules = namedtuple("AutomationModules", ["pyautogui", "gw", "pyperclip", "Application", "Desktop"])
+
+
+class AutomationUnavailable(RuntimeError):
+    pass
+
+
+def _import_modules():
+    import pyautogui
+    import pygetwindow as gw
+    import pyperclip
+    from pywinauto import Application, Desktop
+
+    return AutomationModules(pyautogui, gw, pyperclip, Application, Desktop)
+
+
+class AutomationLoader:
+    def __init__(self, modules=AUTOMATION_MODULES, importer=_import_modules):
+        self.modules = tuple(modules)
+        self._importer = importer
+        self._loaded = None
+        self._error = ""
+        self._missing = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._loaded is not None
+
+    @property
+    def error(self):
+        return self._error
+
+    def missing(self):
+        """Names of required modules that are not installed (nothing is imported)."""
+        if self._missing is None:
+            missing = []
+            for name in self.modules:
+                try:
+                    found = importlib.util.find_spec(name) is not None
+                except (ImportError, ValueError):
+                    found = False
+                if not found:
+                    missing.append(name)
+            self._missing = missing
+        return list(self._missing)
+
+    def available(self):
+        if self._loaded is not None:
+            return True
+        return not self._error and not self.missing()
+
+    def load(self):
+        """Import the automation stack (once) and return AutomationModules.
+
+        Raises AutomationUnavailable if a module is missing or fails to import.
+        """
+        with self._lock:
+            if self._loaded is not None:
+                return self._loaded
+            if self._error:
+                raise AutomationUnavailable(self._error)
+            missing = self.missing()
+            if missing:
+                self._error = f"not installed: {', '.join(missing)}"
+                raise AutomationUnavailable(self._error)
+            try:
+                self._loaded = self._importer()
+            except Exception as exc:
+                self._error = str(exc) or exc.__class__.__name__
+                raise AutomationUnavailable(self._error) from exc
+            return self._loaded
@@ -0,0 +1,304 @@
+"""Latency benchmark for the non-GUI core of practice-admin.py.
+
+practice-admin.py is loaded with stand-in tkinter modules, and a headless
+UnifiedToolApp (no window, no widgets) drives the same methods the buttons
+call. For each size it builds a synthetic project base that mirrors the real
+layout: two ``work-items-in`` roots with N practices each, and one of them
+inside a git clone of a local bare "origin". It then times:
+
+* config_load       _load_paths_config() against a saved paths-config.json
+* create            _onboarding_task() for one new practice (Create Files)
+* validate_current  _validate_current_creation() for that practice
+* offboard          offboard_practice() for that practice
+* git_flow          run_git_push() for one newly onboarded practice, pushing to origin
+
+For each operation it records the median wall time, file opens, directory
+listings and subprocess spawns (counted with an audit hook), and the peak
+traced Python memory. ``--save-baseline`` writes the results as JSON.
+``--baseline`` compares against a saved file and exits 1 on any regression
+beyond the tolerances. Wall times are machine-specific, so regenerate the
+baseline on the machine that runs the check. Runs on plain Linux with no
+display and no network.
+
+    python benchmarks/bench_core.py [--sizes 100,1000,10000] [--repeat 3]
+        [--baseline benchmarks/baselines/bench_core.json] [--save-baseline PATH]
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from practice_count import PRACTICE_COUNT_DIR, WORK_ITEMS_FILE, PracticeCountRegistry  # noqa: E402
+from practice_onboarding import make_request, offboard_practice, practice_folder_name  # noqa: E402
+from work_items_store import dump_json_bytes  # noqa: E402
+
+DEFAULT_SIZES = (100, 1000, 10000)
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "bench_core.json")
+# Allowed growth over the baseline before a metric counts as a regression
+TOLERANCES = {"wall_ms": 0.5, "peak_kb": 0.25, "opens": 0.1, "listdirs": 0.1, "spawns": 0.0}
+# Absolute slack so tiny numbers (a 2 ms operation, 3 opens) don't flap
+ABSOLUTE_SLACK = {"wall_ms": 5.0, "peak_kb": 64.0, "opens": 2, "listdirs": 1, "spawns": 0}
+
+_TK_MODULES = ("tkinter", "tkinter.filedialog", "tkinter.messagebox", "tkinter.scrolledtext", "tkinter.ttk")
+
+
+# ── Loading practice-admin.py without Tk ─────────────────────────────────────
+
+def load_practice_admin():
+    """Import practice-admin.py with stand-in tkinter modules."""
+    saved = {name: sys.modules.get(name) for name in _TK_MODULES}
+    stub = types.ModuleType("tkinter")
+    stub.END = "end"
+    sys.modules["tkinter"] = stub
+    for name in _TK_MODULES[1:]:
+        module = types.ModuleType(name)
+        setattr(stub, name.split(".")[1], module)
+        sys.modules[name] = module
+    try:
+        spec = importlib.util.spec_from_file_location("practice_admin", os.path.join(REPO_DIR, "practice-admin.py"))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    finally:
+        for name, original in saved.items():
+            if original is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = original
+
+
+class _NullTask:
+    def progress(self, fraction=None, text=""):
+        pass
+
+
+def headless_app(pa, root_folders, git_repo_path):
+    """A UnifiedToolApp with only the state the core methods use."""
+    app = pa.UnifiedToolApp.__new__(pa.UnifiedToolApp)
+    app.emis_logger = None
+    app._root_folders = list(root_folders)
+    app._git_repo_path = git_repo_path
+    app._git_service = None
+    app._practice_counts = PracticeCountRegistry()
+    return app
+
+
+# ── Synthetic tree ───────────────────────────────────────────────────────────
+
+def _git(args, cwd):
+    subprocess.run(["git"] + args, cwd=cwd, check=True, capture_output=True, text=True)
+
+
+def populate_root(root_folder, size):
+    os.makedirs(os.path.join(root_folder, PRACTICE_COUNT_DIR), exist_ok=True)
+    entries = []
+    for i in range(size):
+        ods = f"B{i:05d}"
+        name = f"Synthetic Practice {i}"
+        folder = os.path.join(root_folder, practice_folder_name(name, ods))
+        os.makedirs(folder, exist_ok=True)
+        with open(os.path.join(folder, WORK_ITEMS_FILE), "wb") as handle:
+            handle.write(dump_json_bytes([{"payload": {"ods_code": ods}}]))
+        entries.append({"payload": {"ods_code": ods, "docman_practice_display_name": f"{name.title()} ({ods})"}})
+    with open(os.path.join(root_folder, PRACTICE_COUNT_DIR, WORK_ITEMS_FILE), "wb") as handle:
+        handle.write(dump_json_bytes(entries))
+
+
+def build_tree(base, size):
+    """Create a project base with ``size`` practices per root; returns the paths."""
+    origin = os.path.join(base, "origin.git")
+    repo = os.path.join(base, "postie-bots")
+    roots = [
+        os.path.join(base, "postie_bots_python", "devdata", "work-items-in"),
+        os.path.join(repo, "devdata", "work-items-in"),
+    ]
+    _git(["init", "--bare", "-q", "-b", "main", origin], base)
+    _git(["clone", "-q", origin, repo], base)
+    for key, value in (("user.name", "bench"), ("user.email", "bench@example.invalid"), ("gc.auto", "0")):
+        _git(["config", key, value], repo)
+    for root in roots:
+        populate_root(root, size)
+    _git(["checkout", "-q", "-b", "main"], repo)
+    _git(["add", "-A"], repo)
+    _git(["commit", "-q", "-m", f"synthetic tree ({size} practices)"], repo)
+    _git(["push", "-q", "-u", "origin", "main"], repo)
+    _git(["remote", "set-head", "origin", "main"], repo)
+
+    config = os.path.join(base, "paths-config.json")
+    with open(config, "w", encoding="utf-8") as handle:
+        json.dump({"project_base": base, "git_repo_path": repo, "root_folders": roots}, handle, indent=4)
+    return config, roots, repo
+
+
+# ── Measurement ──────────────────────────────────────────────────────────────
+
+class _Counters:
+    """Counts file opens, directory listings and process spawns via audit events."""
+
+    EVENTS = {"open": "opens", "os.scandir": "listdirs", "os.listdir": "listdirs", "subprocess.Popen": "spawns"}
+
+    def __init__(self):
+        self.active = False
+        self.counts = dict.fromkeys(self.EVENTS.values(), 0)
+        sys.addaudithook(self._hook)
+
+    def _hook(self, event, _args):
+        if self.active:
+            key = self.EVENTS.get(event)
+            if key is not None:
+                self.counts[key] += 1
+
+    def start(self):
+        self.counts = dict.fromkeys(self.EVENTS.values(), 0)
+        self.active = True
+
+    def stop(self):
+        self.active = False
+        return dict(self.counts)
+
+
+def measure(counters, fn, repeat, setup=None):
+    """Run fn ``repeat`` times: once traced (memory + counts), the rest for wall time.
+
+    ``setup(i)``, if given, runs untimed before each call.
+    """
+    if setup is not None:
+        setup(0)
+    tracemalloc.start()
+    counters.start()
+    start = time.perf_counter()
+    fn(0)
+    traced_wall = time.perf_counter() - start
+    counts = counters.stop()
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    walls = []
+    for i in range(1, repeat):
+        if setup is not None:
+            setup(i)
+        start = time.perf_counter()
+        fn(i)
+        walls.append(time.perf_counter() - start)
+    wall = statistics.median(walls) if walls else traced_wall
+    return {"wall_ms": round(wall * 1000, 2), "peak_kb": round(peak / 1024, 1), **counts}
+
+
+def bench_size(pa, counters, size, repeat):
+    with tempfile.TemporaryDirectory(prefix=f"bench-core-{size}-") as base:
+        config, roots, repo = build_tree(base, size)
+        pa.PATHS_CONFIG_FILE = config
+        app = headless_app(pa, roots, repo)
+        task = _NullTask()
+        requests = [make_request(f"Bench Practice {i}", f"Z{i:04d}") for i in range(repeat)]
+
+        def create(i):
+            summary, _practices, checks = app._onboarding_task(task, roots, [requests[i]], True)
+            assert summary.ok and checks[0], (summary.failures, checks)
+
+        def validate(i):
+            request = requests[i]
+            passed, issues, _notes = app._validate_current_creation(
+                request.practice_name, request.ods, request.system_type
+            )
+            assert passed, issues
+
+        def offboard(i):
+            assert offboard_practice(roots, requests[i].ods, registry=app._practice_counts) == len(roots)
+
+        git_requests = [make_request(f"Git Practice {i}", f"G{i:04d}") for i in range(repeat)]
+
+        def git_setup(i):
+            # Each flow starts from the base branch, as after a fresh checkout
+            _git(["checkout", "-q", "main"], repo)
+            app._onboarding_task(task, roots, [git_requests[i]], True)
+
+        def git_flow(i):
+            request = git_requests[i]
+            committed, message = app.run_git_push(f"onboard/{request.ods.lower()}", f"Onboarded: {request.ods}", True)
+            assert committed and "push completed" in message, message
+
+        return {
+            "config_load": measure(counters, lambda i: pa._load_paths_config(), repeat),
+            "create": measure(counters, create, repeat),
+            "validate_current": measure(counters, validate, repeat),
+            "offboard": measure(counters, offboard, repeat),
+            "git_flow": measure(counters, git_flow, repeat, setup=git_setup),
+        }
+
+
+def compare(results, baseline):
+    """Return a list of human-readable regressions against baseline."""
+    regressions = []
+    for size, operations in results.items():
+        for operation, metrics in operations.items():
+            reference = baseline.get(size, {}).get(operation)
+            if not reference:
+                continue
+            for metric, value in metrics.items():
+                if metric not in reference:
+                    continue
+                limit = reference[metric] * (1 + TOLERANCES[metric]) + ABSOLUTE_SLACK[metric]
+                if value > limit:
+                    regressions.append(
+                        f"{size}/{operation}: {metric} {value} > {limit:.1f} (baseline {reference[metric]})"
+                    )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", default=None,
+                        help=f"compare against this file (default: {os.path.relpath(DEFAULT_BASELINE, REPO_DIR)} "
+                             f"if it exists)")
+    parser.add_argument("--save-baseline", metavar="PATH", default=None)
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    pa = load_practice_admin()
+    counters = _Counters()
+    results = {}
+    for size in sizes:
+        results[str(size)] = bench_size(pa, counters, size, max(1, args.repeat))
+
+    print(f"{'size':>6}  {'operation':<18}{'wall ms':>10}{'peak KiB':>11}{'opens':>8}{'listdirs':>10}{'spawns':>8}")
+    for size, operations in results.items():
+        for operation, m in operations.items():
+            print(f"{size:>6}  {operation:<18}{m['wall_ms']:>10.2f}{m['peak_kb']:>11.1f}"
+                  f"{m['opens']:>8}{m['listdirs']:>10}{m['spawns']:>8}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save_baseline)), exist_ok=True)
+        with open(args.save_baseline, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=4)
+            handle.write("\n")
+        print(f"Baseline written to {args.save_baseline}")
+        return 0
+
+    baseline_path = args.baseline or (DEFAULT_BASELINE if os.path.exists(DEFAULT_BASELINE) else None)
+    if not baseline_path:
+        return 0
+    with open(baseline_path, "r", encoding="utf-8") as handle:
+        regressions = compare(results, json.load(handle))
+    for regression in regressions:
+        print(f"REGRESSION: {regression}")
+    if not regressions:
+        print(f"No regressions against {baseline_path}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
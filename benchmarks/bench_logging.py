@@ -0,0 +1,98 @@
+"""Records/second of the practice-admin debug log, before and after group commit.
+
+"before" is the old SafeFileHandler (write + flush + fsync per record, called
+on the logging thread). "after" is log_pipeline with each durability mode;
+the clock stops once the listener has written and committed every record.
+
+    python benchmarks/bench_logging.py [--records 5000]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from log_pipeline import DURABILITY_MODES, GroupCommitFileHandler, LogPipeline  # noqa: E402
+
+FORMAT = "%(relativeCreated)d INFO: %(message)s"
+
+
+class LegacySafeFileHandler(logging.FileHandler):
+    """Copy of the handler practice-admin.py used before the pipeline."""
+
+    def emit(self, record):
+        super().emit(record)
+        self.flush()
+
+    def flush(self):
+        super().flush()
+        try:
+            if self.stream and hasattr(self.stream, "fileno"):
+                os.fsync(self.stream.fileno())
+        except OSError:
+            pass
+
+
+def _logger(name):
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    return logger
+
+
+def bench_legacy(path, records):
+    logger = _logger("bench.legacy")
+    handler = LegacySafeFileHandler(path, encoding="utf-8")
+    handler.setFormatter(logging.Formatter(FORMAT))
+    logger.addHandler(handler)
+    start = time.perf_counter()
+    for i in range(records):
+        logger.info("automation step %d finished", i)
+    elapsed = time.perf_counter() - start
+    logger.removeHandler(handler)
+    handler.close()
+    return elapsed, elapsed
+
+
+def bench_pipeline(path, records, durability):
+    logger = _logger(f"bench.pipeline.{durability}")
+    handler = GroupCommitFileHandler(path, encoding="utf-8", durability=durability)
+    handler.setFormatter(logging.Formatter(FORMAT))
+    pipeline = LogPipeline(logger, [handler]).start()
+    start = time.perf_counter()
+    for i in range(records):
+        logger.info("automation step %d finished", i)
+    caller = time.perf_counter() - start
+    pipeline.stop()
+    return caller, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        rows.append(("before: SafeFileHandler", *bench_legacy(os.path.join(tmp, "legacy.log"), args.records)))
+        for durability in DURABILITY_MODES:
+            path = os.path.join(tmp, f"pipeline-{durability}.log")
+            rows.append((f"after: pipeline/{durability}", *bench_pipeline(path, args.records, durability)))
+            with open(path, encoding="utf-8") as handle:
+                written = sum(1 for _ in handle)
+            if written != args.records:
+                raise SystemExit(f"pipeline/{durability} wrote {written} of {args.records} records")
+
+    print(f"{'variant':<28}{'caller rec/s':>16}{'durable rec/s':>16}")
+    for name, caller, total in rows:
+        print(f"{name:<28}{args.records / caller:>16,.0f}{args.records / total:>16,.0f}")
+
+
+if __name__ == "__main__":
+    main()
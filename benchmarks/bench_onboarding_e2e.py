@@ -0,0 +1,144 @@
+"""End-to-end onboarding benchmark against the local Docman stand-in.
+
+It starts mockDocman.MockDocmanServer on localhost, optionally with a
+FaultProfile, then onboards ``--practices`` synthetic practices through
+concurrentOnboarding with headless Chromium, once for each ``--concurrency``
+value. Each run gets a fresh server and fresh trace, checkpoint and
+navigation-cache directories, so every run does the full work. Per run it
+reports:
+
+* each practice's wall time and its time in each step (from the span traces)
+* p50/p95 per step across the practices, and the share of time spent waiting
+* practices/min and overlap, and browser pool hits, misses and launch time
+* whether the server actually holds every folder, group, view and search
+  setting (a failed save is only caught here)
+
+Exits 1 if a practice failed or did not verify. ``--allow-failures`` skips
+that check, which is useful when error injection is on. Needs Playwright
+with Chromium installed (``playwright install chromium``); no network.
+
+    python benchmarks/bench_onboarding_e2e.py [--practices 8] [--concurrency 1 4]
+        [--latency-ms 50 --jitter-ms 30 --error-rate 0.01 --seed 7] [--json out.json]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+from collections import defaultdict
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from mockDocman import MockDocmanServer, add_fault_arguments, fault_profile_from_args  # noqa: E402
+from onboardingTrace import TRACE_DIR_ENV, iter_spans, percentile  # noqa: E402
+
+STEPS = ("folders", "user_groups", "views", "search_settings")
+EXPECTED_SEARCH = {"search_in": "patient", "search_using": "Name, DOB or NHS", "hide_synthetic": True}
+
+
+def verify(state, folders, groups, views):
+    """Names the server is missing for one practice (empty when fully onboarded)."""
+    if state is None:
+        return ["no state"]
+    missing = [f"folder {name}" for name in folders if name not in state["folders"]]
+    missing += [f"group {name}" for name in groups if name not in state["groups"]]
+    missing += [f"view {name}" for name in views if name not in state["views"]]
+    missing += [f"search {key}" for key, value in EXPECTED_SEARCH.items() if state["search"].get(key) != value]
+    return missing
+
+
+def step_times(trace_root):
+    """{ods: {"job": ms, "wait": ms, step: ms}} from the last run of each practice."""
+    times = defaultdict(dict)
+    for span in iter_spans([trace_root]):
+        if span["kind"] == "job":
+            times[span["ods"]]["job"] = span["ms"]
+            times[span["ods"]]["wait"] = span.get("wait_ms")
+        elif span["kind"] == "step":
+            times[span["ods"]][span["name"]] = times[span["ods"]].get(span["name"], 0) + span["ms"]
+    return times
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--practices", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--headed", action="store_true")
+    parser.add_argument("--browser-path", help="Chrome/Chromium executable (default: Playwright's Chromium)")
+    parser.add_argument("--allow-failures", action="store_true")
+    parser.add_argument("--json", help="write the results here as JSON")
+    add_fault_arguments(parser)
+    args = parser.parse_args(argv)
+
+    try:
+        from concurrentOnboarding import PracticeCredentials, run_concurrent
+        from docmanNavigation import CACHE_ENV
+        from onboardingCheckpoint import CHECKPOINT_DIR_ENV
+        from onboardingEngine import DEFAULT_USER_GROUPS, DEFAULT_VIEW_GROUPS, ONBOARDING_FOLDERS
+    except ImportError as e:
+        print(f"Cannot run: {e}. Install Playwright and run `playwright install chromium`.")
+        return 2
+
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    practices = [PracticeCredentials(f"M{n:05d}", "bench", "bench") for n in range(1, args.practices + 1)]
+    faults = fault_profile_from_args(args)
+    results = []
+    failed = False
+
+    for concurrency in args.concurrency:
+        with tempfile.TemporaryDirectory(prefix="onboarding-e2e-") as workdir:
+            os.environ[TRACE_DIR_ENV] = os.path.join(workdir, "traces")
+            os.environ[CHECKPOINT_DIR_ENV] = os.path.join(workdir, "checkpoints")
+            os.environ[CACHE_ENV] = os.path.join(workdir, "nav-cache.json")
+            with MockDocmanServer(faults=faults) as server:
+                report = run_concurrent(practices, base_url=server.url, concurrency=concurrency,
+                                        headless=not args.headed, attempt_id=f"bench-c{concurrency}",
+                                        browser_path=args.browser_path)
+                states = {practice.ods: server.state(practice.ods) for practice in practices}
+                fault_counts = dict(server.fault_counts)
+            times = step_times(os.environ[TRACE_DIR_ENV])
+
+        print(f"concurrency {concurrency}: " + report.lines()[0])
+        if fault_counts:
+            print(f"  injected: {fault_counts}")
+        for line in report.pool_stats.lines():
+            print(f"  {line.strip()}")
+        print(f"  {'ods':<8}{'wall s':>8}" + "".join(f"{step:>17}" for step in STEPS) + "  result")
+        run = {"concurrency": concurrency, "wall_s": report.wall_seconds,
+               "practices_per_min": report.practices_per_minute, "faults": fault_counts,
+               "pool": {"hits": report.pool_stats.hits, "misses": report.pool_stats.misses,
+                        "launch_ms": report.pool_stats.launch_ms}, "practices": []}
+        for result in report.results:
+            missing = verify(states.get(result.ods), ONBOARDING_FOLDERS, DEFAULT_USER_GROUPS, DEFAULT_VIEW_GROUPS)
+            steps = times.get(result.ods, {})
+            status = "ok" if result.success and not missing else (
+                f"FAILED: {result.error}" if not result.success else f"NOT VERIFIED: missing {', '.join(missing)}"
+            )
+            failed = failed or status != "ok"
+            print(f"  {result.ods:<8}{result.seconds:>8.1f}"
+                  + "".join(f"{steps.get(step, 0) / 1000:>16.1f}s" for step in STEPS) + f"  {status}")
+            run["practices"].append({"ods": result.ods, "wall_s": result.seconds, "success": result.success,
+                                     "missing": missing, "steps_ms": {step: steps.get(step) for step in STEPS}})
+        for step in STEPS:
+            values = [times[ods][step] for ods in times if step in times[ods]]
+            if values:
+                print(f"  {step:<16} p50 {percentile(values, 50) / 1000:>6.1f}s  p95 {percentile(values, 95) / 1000:>6.1f}s")
+        shares = [times[ods]["wait"] / times[ods]["job"] for ods in times if times[ods].get("wait") is not None
+                  and times[ods].get("job")]
+        if shares:
+            print(f"  {'waiting':<16} p50 {percentile(shares, 50):>6.0%}   p95 {percentile(shares, 95):>6.0%}  of wall time")
+            run["wait_share_p50"] = percentile(shares, 50)
+        print()
+        results.append(run)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as handle:
+            json.dump({"faults": faults._asdict(), "runs": results}, handle, indent=2)
+    return 1 if failed and not args.allow_failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
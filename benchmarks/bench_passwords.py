@@ -0,0 +1,117 @@
+"""Throughput and uniformity of password_policy.generate_many.
+
+Throughput compares the old generate-and-retry generator from
+practice-admin.py (one ``secrets.choice`` per character) with
+``generate_many`` for each policy.
+
+The uniformity check draws ``--samples`` passwords per policy and runs two
+chi-square tests. The first checks per-character frequencies against the
+exact frequencies of a uniform draw over all valid passwords
+(password_policy.expected_char_frequencies). The second checks that each
+position is equally likely to hold each class, since the layout must not
+favour any position. It also verifies every password satisfies its policy,
+and exits 1 if anything fails at the 0.1% significance level.
+
+    python benchmarks/bench_passwords.py [--count 20000] [--samples 50000]
+"""
+
+import argparse
+import math
+import os
+import secrets
+import string
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from password_policy import (  # noqa: E402
+    DOCMAN_POLICY,
+    STRICT_POLICY,
+    expected_char_frequencies,
+    generate_many,
+    satisfies,
+)
+
+POLICIES = (STRICT_POLICY, DOCMAN_POLICY)
+
+
+def legacy_strict_password(length=10):
+    """Copy of the generator practice-admin.py used before password_policy."""
+    alphabet = string.ascii_letters + string.digits
+    while True:
+        password = "".join(secrets.choice(alphabet) for _ in range(length))
+        if any(ch.isupper() for ch in password) and any(ch.isdigit() for ch in password):
+            return password
+
+
+def chi_square_critical(dof, z=3.090):
+    """Upper critical value at the 0.1% level (Wilson-Hilferty approximation)."""
+    k = 2.0 / (9.0 * dof)
+    return dof * (1.0 - k + z * math.sqrt(k)) ** 3
+
+
+def chi_square(observed, expected):
+    return sum((observed.get(key, 0) - value) ** 2 / value for key, value in expected.items())
+
+
+def check_uniformity(policy, samples):
+    passwords = generate_many(samples, policy)
+    invalid = sum(1 for password in passwords if not satisfies(password, policy))
+    results = []
+
+    # Character frequencies pooled over all positions
+    frequencies = expected_char_frequencies(policy)
+    total_chars = samples * policy.length
+    observed = Counter("".join(passwords))
+    expected = {ch: p * total_chars for ch, p in frequencies.items()}
+    results.append(("characters", chi_square(observed, expected), len(expected) - 1))
+
+    # Class per position: every position has the same class distribution
+    class_of = {ch: index for index, char_class in enumerate(policy.classes) for ch in char_class.chars}
+    class_share = [sum(frequencies[ch] for ch in char_class.chars) for char_class in policy.classes]
+    observed = Counter((position, class_of[ch]) for password in passwords for position, ch in enumerate(password))
+    expected = {
+        (position, index): share * samples
+        for position in range(policy.length)
+        for index, share in enumerate(class_share)
+    }
+    results.append(("class x position", chi_square(observed, expected), len(expected) - policy.length))
+    return invalid, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=20000, help="passwords per throughput run")
+    parser.add_argument("--samples", type=int, default=50000, help="passwords per uniformity check")
+    args = parser.parse_args(argv)
+
+    print(f"{'generator':<36}{'passwords/s':>14}")
+    start = time.perf_counter()
+    for _ in range(args.count):
+        legacy_strict_password()
+    print(f"{'before: retry loop (strict)':<36}{args.count / (time.perf_counter() - start):>14,.0f}")
+    for policy in POLICIES:
+        start = time.perf_counter()
+        generate_many(args.count, policy)
+        print(f"{'after: generate_many (' + policy.name + ')':<36}{args.count / (time.perf_counter() - start):>14,.0f}")
+
+    failed = False
+    print()
+    print(f"{'policy':<10}{'test':<20}{'chi2':>12}{'dof':>6}{'critical':>12}  result")
+    for policy in POLICIES:
+        invalid, results = check_uniformity(policy, args.samples)
+        if invalid:
+            failed = True
+            print(f"{policy.name:<10}{invalid} password(s) violate the policy  FAIL")
+        for name, statistic, dof in results:
+            critical = chi_square_critical(dof)
+            ok = statistic <= critical
+            failed = failed or not ok
+            print(f"{policy.name:<10}{name:<20}{statistic:>12.1f}{dof:>6}{critical:>12.1f}  {'ok' if ok else 'FAIL'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""Import-time breakdown of practice-admin.py, kept as a regression check.
+
+Runs ``python -X importtime`` on a fresh interpreter that only imports the
+module (no window is created) and prints the slowest imports by cumulative
+time. The check fails (exit 1) if any of the EMIS automation libraries are
+imported eagerly again, or if the total exceeds ``--budget-ms``.
+
+    python benchmarks/check_import_time.py [--top 15] [--budget-ms 1500]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from automation_loader import AUTOMATION_MODULES  # noqa: E402
+
+TARGET = os.path.join(REPO_DIR, "practice-admin.py")
+# Anything that must stay out of the startup path until first use
+DEFERRED_MODULES = AUTOMATION_MODULES + ("comtypes", "pyscreeze", "pymsgbox", "pytweening")
+
+_LOADER = (
+    "import importlib.util, sys; "
+    "sys.path.insert(0, {repo!r}); "
+    "spec = importlib.util.spec_from_file_location('practice_admin', {target!r}); "
+    "spec.loader.exec_module(importlib.util.module_from_spec(spec))"
+)
+
+
+def measure(python=sys.executable, target=TARGET):
+    """Return [(module, self_us, cumulative_us, depth)] in import order."""
+    code = _LOADER.format(repo=REPO_DIR, target=target)
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", code], capture_output=True, text=True, cwd=REPO_DIR
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"import of {target} failed:\n{result.stderr}")
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        name = name.rstrip()
+        # Nested imports are indented two spaces per level below the first
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=None, help="fail if the total exceeds this")
+    args = parser.parse_args(argv)
+
+    rows = measure()
+    total_us = sum(cum for _name, _self, cum, depth in rows if depth == 0)
+    print(f"{'module':<48}{'self ms':>10}{'cumulative ms':>16}")
+    for name, self_us, cum_us, _depth in sorted(rows, key=lambda row: row[2], reverse=True)[: args.top]:
+        print(f"{name[:48]:<48}{self_us / 1000:>10.1f}{cum_us / 1000:>16.1f}")
+    print(f"total: {total_us / 1000:.1f} ms across {len(rows)} module(s)")
+
+    problems = []
+    eager = sorted({name.split(".")[0] for name, _self, _cum, _depth in rows} & set(DEFERRED_MODULES))
+    if eager:
+        problems.append(f"imported at startup but should be deferred: {', '.join(eager)}")
+    if args.budget_ms is not None and total_us / 1000 > args.budget_ms:
+        problems.append(f"total import time {total_us / 1000:.1f} ms exceeds budget {args.budget_ms:.1f} ms")
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
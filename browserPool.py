@@ -0,0 +1,270 @@
+"""A pool of warm Chromium browsers that hands out a fresh context per practice.
+
+Launching Chromium is the biggest fixed cost of onboarding a practice, and a
+browser that has served many practices slowly grows. BrowserPool keeps
+``size`` browsers launched and gives each practice a new context on the least
+busy one. Contexts are never reused, so sessions never leak between
+practices. Browsers are recycled:
+
+* after ``max_jobs`` contexts have been closed on them
+* once their process tree passes ``max_rss_mb`` (needs psutil; skipped without it)
+* when they disconnect (crashed or killed)
+
+A recycled browser takes no new contexts and is closed when its last one
+closes. A replacement is launched in the background straight away, so the
+next practice usually still finds a warm browser. A context served by an
+already-running browser is a hit; one that had to wait for a launch is a
+miss. PoolStats counts both, along with launches, launch times and recycles.
+
+``pool_settings()`` reads defaults from DOCMAN_POOL_BROWSERS,
+DOCMAN_POOL_MAX_JOBS and DOCMAN_POOL_MAX_RSS_MB.
+"""
+
+import asyncio
+import os
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+
+try:
+    import psutil
+except ImportError:  # RSS recycling is optional
+    psutil = None
+
+DEFAULT_SIZE = 1
+DEFAULT_MAX_JOBS = 25
+SIZE_ENV = "DOCMAN_POOL_BROWSERS"
+MAX_JOBS_ENV = "DOCMAN_POOL_MAX_JOBS"
+MAX_RSS_ENV = "DOCMAN_POOL_MAX_RSS_MB"
+
+# Recycle reasons
+MAX_JOBS = "max_jobs"
+MAX_RSS = "max_rss"
+DISCONNECTED = "disconnected"
+
+
+def _env_number(name, convert, default):
+    value = os.environ.get(name, "").strip()
+    if not value:
+        return default
+    try:
+        number = convert(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a number, got {value!r}") from None
+    if not number > 0:
+        raise ValueError(f"{name} must be greater than 0, got {value!r}")
+    return number
+
+
+def pool_settings():
+    """BrowserPool keyword arguments (size, max_jobs, max_rss_mb) from the environment.
+
+    Raises ValueError naming the variable when one is set to something that is not a positive number.
+    """
+    return {
+        "size": _env_number(SIZE_ENV, int, DEFAULT_SIZE),
+        "max_jobs": _env_number(MAX_JOBS_ENV, int, DEFAULT_MAX_JOBS),
+        "max_rss_mb": _env_number(MAX_RSS_ENV, float, None),
+    }
+
+
+class PoolStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.launch_ms = []
+        self.recycled = Counter()
+        self.peak_rss_mb = 0.0
+
+    @property
+    def launches(self):
+        return len(self.launch_ms)
+
+    @property
+    def hit_rate(self):
+        served = self.hits + self.misses
+        return self.hits / served if served else 0.0
+
+    def lines(self):
+        line = f"Browser pool: {self.hits} hit(s), {self.misses} miss(es) ({self.hit_rate:.0%} warm), " \
+               f"{self.launches} launch(es)"
+        if self.launch_ms:
+            line += f" averaging {sum(self.launch_ms) / len(self.launch_ms) / 1000:.1f}s"
+        lines = [line]
+        if self.recycled:
+            lines.append("  recycled: " + ", ".join(f"{count} by {reason}" for reason, count in
+                                                    sorted(self.recycled.items())))
+        if self.peak_rss_mb:
+            lines.append(f"  peak browser RSS: {self.peak_rss_mb:.0f} MB")
+        return lines
+
+
+class PooledBrowser:
+    def __init__(self, browser, process=None):
+        self.browser = browser
+        self.process = process  # psutil.Process of the browser, when known
+        self.active = 0
+        self.jobs = 0
+        self.retired = None  # recycle reason once retired
+
+    def rss_mb(self):
+        """RSS of the browser and its renderer/GPU processes; None when it cannot be read."""
+        if self.process is None:
+            return None
+        try:
+            processes = [self.process] + self.process.children(recursive=True)
+        except psutil.Error:
+            return None
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                pass  # a renderer exited between listing and reading
+        return total / (1024 * 1024)
+
+
+class BrowserPool:
+    def __init__(self, playwright, size=DEFAULT_SIZE, headless=True, browser_path=None,
+                 max_jobs=DEFAULT_MAX_JOBS, max_rss_mb=None, logger=None):
+        """``playwright``: a started ``async_playwright()``; ``max_jobs``/``max_rss_mb``: None disables."""
+        self._playwright = playwright
+        self.size = max(1, size)
+        self._headless = headless
+        self._browser_path = browser_path
+        self.max_jobs = max_jobs
+        self.max_rss_mb = max_rss_mb if psutil is not None else None
+        self._logger = logger
+        self._browsers = []
+        self._launching = set()
+        self._launch_lock = asyncio.Lock()
+        self.stats = PoolStats()
+        if max_rss_mb and psutil is None and logger is not None:
+            logger.warning("psutil is not installed; browsers will not be recycled by memory use")
+
+    async def start(self):
+        """Launch the pool's browsers up front, so the first practices are already warm.
+
+        A failed launch is only logged; the first practice to need a browser tries again.
+        """
+        await asyncio.gather(*(self._start_launch() for _ in range(self.size - len(self._live()))),
+                             return_exceptions=True)
+
+    async def close(self):
+        for task in list(self._launching):
+            task.cancel()
+        for pooled in self._browsers:
+            await self._close(pooled)
+        self._browsers = []
+
+    @asynccontextmanager
+    async def context(self, **kwargs):
+        """A new context on a warm browser; closed, and its browser maybe recycled, on exit."""
+        pooled = await self._acquire()
+        context = None
+        try:
+            context = await pooled.browser.new_context(**kwargs)
+            yield context
+        finally:
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception:
+                    pass
+            pooled.active -= 1
+            pooled.jobs += 1
+            await self._check(pooled)
+
+    async def _acquire(self):
+        for pooled in list(self._browsers):
+            if pooled.retired is None and not pooled.browser.is_connected():
+                self._retire(pooled, DISCONNECTED)
+                await self._check(pooled)
+        live = self._live()
+        if live:
+            self.stats.hits += 1
+        else:
+            self.stats.misses += 1
+            if self._launching:
+                await asyncio.wait(set(self._launching))
+            live = self._live() or [await self._start_launch()]
+        pooled = min(live, key=lambda candidate: candidate.active)
+        pooled.active += 1
+        return pooled
+
+    def _live(self):
+        return [pooled for pooled in self._browsers if pooled.retired is None]
+
+    def _start_launch(self):
+        task = asyncio.ensure_future(self._launch())
+        self._launching.add(task)
+        task.add_done_callback(self._launched)
+        return task
+
+    def _launched(self, task):
+        self._launching.discard(task)
+        if not task.cancelled() and task.exception() is not None and self._logger is not None:
+            self._logger.warning(f"[pool] Browser launch failed: {task.exception()}")
+
+    async def _launch(self):
+        # One launch at a time, so a new browser process can be told apart from the ones before it
+        async with self._launch_lock:
+            before = self._browser_pids()
+            start = time.perf_counter()
+            browser = await self._playwright.chromium.launch(headless=self._headless,
+                                                             executable_path=self._browser_path)
+            self.stats.launch_ms.append((time.perf_counter() - start) * 1000)
+            pooled = PooledBrowser(browser, self._new_browser_process(before))
+            self._browsers.append(pooled)
+        if self._logger is not None:
+            self._logger.info(f"[pool] Launched a browser in {self.stats.launch_ms[-1] / 1000:.1f}s")
+        return pooled
+
+    async def _check(self, pooled):
+        if pooled.retired is None:
+            if not pooled.browser.is_connected():
+                self._retire(pooled, DISCONNECTED)
+            elif self.max_jobs and pooled.jobs >= self.max_jobs:
+                self._retire(pooled, MAX_JOBS)
+            else:
+                rss = pooled.rss_mb() if self.max_rss_mb else None
+                if rss is not None:
+                    self.stats.peak_rss_mb = max(self.stats.peak_rss_mb, rss)
+                    if rss > self.max_rss_mb:
+                        self._retire(pooled, MAX_RSS)
+        if pooled.retired is not None and pooled.active == 0 and pooled in self._browsers:
+            self._browsers.remove(pooled)
+            await self._close(pooled)
+
+    def _retire(self, pooled, reason):
+        pooled.retired = reason
+        self.stats.recycled[reason] += 1
+        if self._logger is not None:
+            self._logger.info(f"[pool] Recycling a browser after {pooled.jobs} job(s): {reason}")
+        if len(self._live()) + len(self._launching) < self.size:
+            self._start_launch()  # warm replacement
+
+    async def _close(self, pooled):
+        try:
+            if pooled.browser.is_connected():
+                await pooled.browser.close()
+        except Exception:
+            pass
+
+    def _browser_pids(self):
+        """PIDs of the processes Playwright's driver has started (browser main processes)."""
+        if not self.max_rss_mb:
+            return set()
+        try:
+            return {process.pid for driver in psutil.Process().children() for process in driver.children()}
+        except psutil.Error:
+            return set()
+
+    def _new_browser_process(self, before):
+        new = self._browser_pids() - before
+        if len(new) != 1:
+            return None  # cannot tell which one is ours; this browser is only recycled by job count
+        try:
+            return psutil.Process(new.pop())
+        except psutil.Error:
+            return None
@@ -5,7 +5,7 @@ if exist dist rd /s /q dist
 
 echo 🔨 Building EXE...
 :: This line now uses the correct filename from your screenshot
-pyinstaller --onefile --noconfirm --add-data "check-ods-mismatch.ps1;." onboarding.py
+pyinstaller --onefile --noconfirm onboarding.py
 
 echo.
 if %errorlevel% equ 0 (
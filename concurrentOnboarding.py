@@ -0,0 +1,222 @@
+"""Onboard a wave of practices concurrently from one event loop.
+
+All practices share a browserPool.BrowserPool of warm Chromium browsers
+driven through ``playwright.async_api`` (one browser by default). Every
+practice gets a fresh browser context, so cookies, storage and the Docman
+session never leak from one practice to the next. It also gets its own
+OnboardingEngine and a logger tagged with its ODS code. ``concurrency`` caps
+how many practices are in flight at once. While one page waits on Docman,
+the others keep working, so a single process can drive dozens of practices
+without a thread or a browser for each.
+
+A failure (login rejected, a step raising, even the browser dying) is
+recorded against that practice only. The pool replaces a dead browser, and
+recycles browsers after ``max_jobs_per_browser`` practices or past
+``max_rss_mb``, and the rest of the wave carries on. ``run_concurrent``
+returns a WaveReport with the per-practice results and aggregate throughput.
+
+To try it without the live service, point it at mockDocman:
+
+    python mockDocman.py --port 8765
+    python concurrentOnboarding.py practices.csv --base-url http://127.0.0.1:8765 -j 4
+
+practices.csv has ``ods_code,username,password`` columns.
+"""
+
+import argparse
+import asyncio
+import csv
+import logging
+import sys
+import time
+from collections import namedtuple
+
+from playwright.async_api import async_playwright
+
+from adaptiveWait import LatencyTracker
+from browserPool import DEFAULT_MAX_JOBS, BrowserPool, pool_settings
+from docmanNavigation import NavigationCache
+from onboardingEngine import OnboardingEngine, make_job_payload
+
+DOCMAN_URL = "https://production.docman.thirdparty.nhs.uk"
+DEFAULT_CONCURRENCY = 4
+
+# Login form variants seen across Docman builds
+ODS_FIELD = '#OdsCode, #OrganisationCode, input[name="OdsCode"]'
+USERNAME_FIELD = '#Username, #UserName, input[name="Username"]'
+PASSWORD_FIELD = '#Password, input[name="Password"]'
+SUBMIT_BUTTON = 'button[type="submit"], button:has-text("Sign In")'
+SIGNED_IN = "a:has-text('Settings')"
+
+PracticeCredentials = namedtuple("PracticeCredentials", ["ods", "username", "password"])
+# slot: which of the ``concurrency`` slots ran the practice
+PracticeResult = namedtuple("PracticeResult", ["ods", "success", "error", "seconds", "slot"])
+
+
+class DocmanLoginError(RuntimeError):
+    pass
+
+
+class WaveReport:
+    def __init__(self, results, wall_seconds, concurrency, pool_stats=None):
+        self.results = sorted(results, key=lambda result: result.ods)
+        self.wall_seconds = wall_seconds
+        self.concurrency = concurrency
+        self.pool_stats = pool_stats
+
+    @property
+    def succeeded(self):
+        return [result for result in self.results if result.success]
+
+    @property
+    def failed(self):
+        return [result for result in self.results if not result.success]
+
+    @property
+    def practices_per_minute(self):
+        return len(self.results) * 60 / self.wall_seconds if self.wall_seconds else 0.0
+
+    @property
+    def speedup(self):
+        """Sum of per-practice time over wall time; 1.0 means no overlap at all."""
+        busy = sum(result.seconds for result in self.results)
+        return busy / self.wall_seconds if self.wall_seconds else 0.0
+
+    def lines(self):
+        lines = [
+            f"Onboarded {len(self.succeeded)}/{len(self.results)} practice(s) in {self.wall_seconds:.1f}s "
+            f"with concurrency {self.concurrency}: {self.practices_per_minute:.1f} practices/min, "
+            f"{self.speedup:.1f}x overlap"
+        ]
+        if self.pool_stats is not None:
+            lines += self.pool_stats.lines()
+        for result in self.results:
+            status = "ok" if result.success else f"FAILED: {result.error}"
+            lines.append(f"  {result.ods}: {result.seconds:.1f}s [slot {result.slot}] {status}")
+        return lines
+
+
+def load_practices(path):
+    """Read ods_code,username,password rows from a CSV file."""
+    with open(path, newline="", encoding="utf-8") as handle:
+        return [
+            PracticeCredentials(row["ods_code"].strip().upper(), row["username"], row["password"])
+            for row in csv.DictReader(handle)
+            if row.get("ods_code", "").strip()
+        ]
+
+
+async def docman_login(page, base_url, practice, timeout_ms=30000):
+    await page.goto(f"{base_url.rstrip('/')}/Account/Login")
+    await page.fill(ODS_FIELD, practice.ods, timeout=timeout_ms)
+    await page.fill(USERNAME_FIELD, practice.username, timeout=timeout_ms)
+    await page.fill(PASSWORD_FIELD, practice.password, timeout=timeout_ms)
+    await page.click(SUBMIT_BUTTON, timeout=timeout_ms)
+    await page.wait_for_load_state("domcontentloaded")
+    if "/account/login" in page.url.lower():
+        raise DocmanLoginError(f"Docman login rejected for {practice.ods}")
+    await page.wait_for_selector(SIGNED_IN, timeout=timeout_ms)
+
+
+class _PracticeLogAdapter(logging.LoggerAdapter):
+    def process(self, msg, kwargs):
+        return f"[{self.extra['ods']}] {msg}", kwargs
+
+
+async def onboard_practice(pool, practice, base_url, logger, attempt_id, engine_factory=OnboardingEngine,
+                           **engine_kwargs):
+    """Log in and onboard one practice in a fresh pool context; returns (success, error)."""
+    async with pool.context() as context:
+        page = await context.new_page()
+        await docman_login(page, base_url, practice)
+        engine = engine_factory(page, _PracticeLogAdapter(logger, {"ods": practice.ods}), **engine_kwargs)
+        success, error, _pause = await engine.process(make_job_payload(practice.ods, attempt_id))
+    return success, error
+
+
+async def run_concurrent_async(practices, base_url=DOCMAN_URL, concurrency=DEFAULT_CONCURRENCY, headless=True,
+                               engine_factory=OnboardingEngine, logger=None, attempt_id="wave", on_result=None,
+                               browser_path=None, browsers=1, max_jobs_per_browser=DEFAULT_MAX_JOBS,
+                               max_rss_mb=None):
+    """Onboard every practice with at most ``concurrency`` in flight; returns a WaveReport.
+
+    ``browser_path``: a Chrome/Chromium executable to use instead of Playwright's bundled one.
+    ``browsers``, ``max_jobs_per_browser``, ``max_rss_mb``: see browserPool.BrowserPool.
+    """
+    logger = logger or logging.getLogger("onboarding.wave")
+    practices = list(practices)
+    slots = asyncio.Queue()
+    for number in range(1, max(1, concurrency) + 1):
+        slots.put_nowait(number)
+    results = []
+    # Deep links learned by the first practice are reused by the rest of the wave
+    nav_cache = NavigationCache()
+    latency = LatencyTracker()
+
+    def record(result):
+        results.append(result)
+        level = logging.INFO if result.success else logging.WARNING
+        logger.log(level, f"[{result.ods}] {'done' if result.success else 'failed'} in {result.seconds:.1f}s"
+                          + ("" if result.success else f": {result.error}"))
+        if on_result is not None:
+            on_result(result)
+
+    async with async_playwright() as playwright:
+        pool = BrowserPool(playwright, size=browsers, headless=headless, browser_path=browser_path,
+                           max_jobs=max_jobs_per_browser, max_rss_mb=max_rss_mb, logger=logger)
+
+        async def onboard(practice):
+            slot = await slots.get()
+            start = time.perf_counter()
+            try:
+                success, error = await onboard_practice(pool, practice, base_url, logger, attempt_id, engine_factory,
+                                                        nav_cache=nav_cache, latency=latency)
+            except Exception as e:
+                detail = str(e).strip().splitlines()
+                success, error = False, f"{type(e).__name__}: {detail[0] if detail else ''}"
+            finally:
+                slots.put_nowait(slot)
+            record(PracticeResult(practice.ods, success, error, time.perf_counter() - start, slot))
+
+        start = time.perf_counter()
+        try:
+            if practices:
+                await pool.start()
+            await asyncio.gather(*(onboard(practice) for practice in practices))
+        finally:
+            await pool.close()
+    return WaveReport(results, time.perf_counter() - start, concurrency, pool.stats)
+
+
+def run_concurrent(practices, **kwargs):
+    """Blocking entry point for sync callers (OnboardingBot, the CLI)."""
+    return asyncio.run(run_concurrent_async(practices, **kwargs))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("practices", help="CSV with ods_code,username,password columns")
+    parser.add_argument("--base-url", default=DOCMAN_URL)
+    parser.add_argument("-j", "--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--headed", action="store_true", help="show the browser windows")
+    parser.add_argument("--browser-path", help="Chrome/Chromium executable (default: Playwright's Chromium)")
+    settings = pool_settings()
+    parser.add_argument("--browsers", type=int, default=settings["size"], help="warm browsers to keep in the pool")
+    parser.add_argument("--max-jobs-per-browser", type=int, default=settings["max_jobs"],
+                        help="recycle a browser after this many practices (0: never)")
+    parser.add_argument("--max-rss-mb", type=float, default=settings["max_rss_mb"],
+                        help="recycle a browser once it uses this much memory (needs psutil)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    report = run_concurrent(load_practices(args.practices), base_url=args.base_url,
+                            concurrency=args.concurrency, headless=not args.headed,
+                            browser_path=args.browser_path, browsers=args.browsers,
+                            max_jobs_per_browser=args.max_jobs_per_browser, max_rss_mb=args.max_rss_mb)
+    for line in report.lines():
+        print(line)
+    return 0 if not report.failed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
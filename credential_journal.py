@@ -0,0 +1,355 @@
+"""Append-only credential journal with an O(1) "latest entry" index.
+
+Every password change is one JSON line appended to the journal::
+
+    {"seq": 12, "timestamp": "2026-01-05T09:14:02", "context": "Expired",
+     "ods": "A12345", "password": "..."}
+
+A sidecar index (``<journal>.idx``) maps each key (``ods:<ODS>`` and
+``context:<context>``) to the byte offset of its newest line, so ``latest()``
+is one seek and one read however long the journal gets. The index records
+the journal size it covers. On open, only the tail written after that point
+is scanned, so a stale or missing index (say, after a crash) is repaired
+rather than trusted.
+
+Appends are locked across processes (work_items_store.FileLock). A single
+``append`` is fsynced like the old password log. Inside ``with
+journal.batch():`` appends are written as they come and fsynced once at the
+end, which is what bulk rotations want. ``compact(keep)`` rewrites the
+journal atomically, keeping the newest ``keep`` entries per practice (or per
+context for entries without an ODS code). Auto-compaction waits until the
+journal has at least doubled since the last compaction, so a journal whose
+kept entries alone reach ``auto_compact`` is not rewritten on every append.
+"""
+
+import json
+import os
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import datetime
+
+from work_items_store import DEFAULT_LOCK_TIMEOUT, FileLock, atomic_write_bytes
+
+# Set to point practice-admin and the Docman bots at the same journal
+JOURNAL_ENV = "CREDENTIAL_JOURNAL"
+INDEX_SUFFIX = ".idx"
+INDEX_VERSION = 1
+DEFAULT_KEEP = 5
+# Index is rewritten after this many unbatched appends (it self-repairs anyway)
+INDEX_SAVE_EVERY = 32
+
+CredentialEntry = namedtuple("CredentialEntry", ["seq", "timestamp", "context", "ods", "password"])
+
+
+def journal_path(default):
+    """The shared journal if JOURNAL_ENV is set, otherwise ``default``."""
+    return os.environ.get(JOURNAL_ENV) or default
+
+
+def _keys(record):
+    keys = [f"context:{record.get('context', '')}"]
+    if record.get("ods"):
+        keys.append(f"ods:{record['ods']}")
+    return keys
+
+
+def _primary_key(record):
+    return f"ods:{record['ods']}" if record.get("ods") else f"context:{record.get('context', '')}"
+
+
+def _entry(record):
+    return CredentialEntry(
+        record.get("seq", 0),
+        record.get("timestamp", ""),
+        record.get("context", ""),
+        record.get("ods", ""),
+        record.get("password", ""),
+    )
+
+
+class CredentialJournal:
+    def __init__(self, path, lock_timeout=DEFAULT_LOCK_TIMEOUT, lock_dir=None, auto_compact=None,
+                 keep=DEFAULT_KEEP):
+        """``auto_compact``: compact down to ``keep`` per key once the journal holds this many entries."""
+        self.path = path
+        self.index_path = path + INDEX_SUFFIX
+        self.auto_compact = auto_compact
+        self.keep = keep
+        self._file_lock = FileLock(path, lock_timeout, lock_dir)
+        self._mutex = threading.RLock()
+        self._batch_handle = None
+        self._unsaved = 0
+        self._reset()
+        with self._mutex:
+            self._load_index()
+            self._sync()
+
+    def _reset(self):
+        self._latest = {}
+        self._size = 0
+        self._ino = None
+        self._next_seq = 1
+        self._count = 0
+        # Entries left by the last compaction; the next one waits until the journal doubles
+        self._compacted = 0
+
+    def __len__(self):
+        with self._mutex:
+            self._refresh()
+            return self._count
+
+    # ── Index maintenance ────────────────────────────────────────────────
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+            if data.get("version") != INDEX_VERSION:
+                return
+            self._latest = {key: tuple(value) for key, value in data["latest"].items()}
+            self._size = int(data["size"])
+            self._ino = data.get("ino")
+            self._next_seq = int(data["next_seq"])
+            self._count = int(data["count"])
+            self._compacted = int(data.get("compacted", 0))
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            self._reset()
+
+    def _save_index(self):
+        data = {
+            "version": INDEX_VERSION,
+            "ino": self._ino,
+            "size": self._size,
+            "next_seq": self._next_seq,
+            "count": self._count,
+            "compacted": self._compacted,
+            "latest": {key: list(value) for key, value in self._latest.items()},
+        }
+        try:
+            atomic_write_bytes(self.index_path, json.dumps(data).encode("utf-8"))
+            self._unsaved = 0
+        except OSError:
+            pass
+
+    def _sync(self):
+        """Bring the in-memory index up to date with the journal on disk (one stat if current)."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            if self._size or self._latest:
+                self._reset()
+            return
+        if st.st_ino != self._ino or st.st_size < self._size:
+            # Replaced (compacted elsewhere) or truncated: the index no longer applies
+            self._reset()
+            self._ino = st.st_ino
+        if st.st_size > self._size:
+            self._scan(self._size)
+
+    def _refresh(self):
+        if self._batch_handle is not None:
+            # Our own batch is the only writer; just make its lines readable
+            self._batch_handle.flush()
+        else:
+            self._sync()
+
+    def _scan(self, start):
+        with open(self.path, "rb") as handle:
+            handle.seek(start)
+            offset = start
+            for line in handle:
+                if not line.endswith(b"\n"):
+                    break  # torn write at the tail; skipped, and fenced off by the next append
+                self._index_line(line, offset)
+                offset += len(line)
+        self._size = offset
+
+    def _index_line(self, line, offset):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return None
+        if not isinstance(record, dict):
+            return None
+        for key in _keys(record):
+            self._latest[key] = (offset, len(line))
+        try:
+            self._next_seq = max(self._next_seq, int(record.get("seq", 0)) + 1)
+        except (TypeError, ValueError):
+            pass  # a hand-edited or corrupt seq; the line is still indexed
+        self._count += 1
+        return record
+
+    # ── Writing ──────────────────────────────────────────────────────────
+
+    @contextmanager
+    def _locked(self):
+        with self._mutex:
+            if self._batch_handle is not None:
+                yield
+                return
+            with self._file_lock:
+                yield
+
+    @contextmanager
+    def batch(self):
+        """Hold the journal lock and fsync once for every append in the block."""
+        with self._mutex:
+            if self._batch_handle is not None:
+                yield self
+                return
+            with self._file_lock:
+                self._sync()
+                self._batch_handle = open(self.path, "ab")
+                try:
+                    yield self
+                finally:
+                    handle, self._batch_handle = self._batch_handle, None
+                    try:
+                        handle.flush()
+                        os.fsync(handle.fileno())
+                    finally:
+                        handle.close()
+                        self._after_write()
+                        self._save_index()
+
+    def append(self, context, password, ods=""):
+        return self.append_many([(context, password, ods)])[0]
+
+    def append_many(self, entries):
+        """Append (context, password[, ods]) tuples in one write; returns CredentialEntry list."""
+        with self._locked():
+            self._refresh()
+            timestamp = datetime.now().isoformat(timespec="seconds")
+            records = []
+            for entry in entries:
+                context, password = entry[0], entry[1]
+                ods = entry[2] if len(entry) > 2 else ""
+                records.append({
+                    "seq": self._next_seq + len(records),
+                    "timestamp": timestamp,
+                    "context": str(context),
+                    "ods": str(ods or "").strip().upper(),
+                    "password": password,
+                })
+            if not records:
+                return []
+            lines = [(json.dumps(record) + "\n").encode("utf-8") for record in records]
+
+            if self._batch_handle is not None:
+                self._write(self._batch_handle, lines)
+            else:
+                with open(self.path, "ab") as handle:
+                    self._write(handle, lines)
+                    handle.flush()
+                    os.fsync(handle.fileno())
+                self._unsaved += 1
+                self._after_write()
+                if self._unsaved >= INDEX_SAVE_EVERY:
+                    self._save_index()
+            return [_entry(record) for record in records]
+
+    def _write(self, handle, lines):
+        if self._ino is None:
+            self._ino = os.fstat(handle.fileno()).st_ino
+        offset = handle.seek(0, os.SEEK_END)
+        if offset != self._size:
+            # Torn tail from a crashed writer: end it so it is one bad line, not two
+            if offset > 0:
+                handle.write(b"\n")
+                offset += 1
+            self._size = offset
+        for line in lines:
+            self._index_line(line, offset)
+            offset += len(line)
+        handle.write(b"".join(lines))
+        self._size = offset
+
+    def _after_write(self):
+        if self.auto_compact and self._count >= max(self.auto_compact, 2 * self._compacted):
+            self._compact_locked(self.keep)
+
+    # ── Reading ──────────────────────────────────────────────────────────
+
+    def latest(self, ods=None, context=None):
+        """Newest entry for an ODS code (or, failing that, a context); None if absent."""
+        key = f"ods:{str(ods).strip().upper()}" if ods else f"context:{context}"
+        with self._mutex:
+            self._refresh()
+            location = self._latest.get(key)
+            if location is None:
+                return None
+            offset, length = location
+            with open(self.path, "rb") as handle:
+                handle.seek(offset)
+                return _entry(json.loads(handle.read(length)))
+
+    def entries(self):
+        """Every readable entry, oldest first."""
+        with self._mutex:
+            if not os.path.exists(self.path):
+                return []
+            with open(self.path, "rb") as handle:
+                return [_entry(record) for record in self._read_records(handle)]
+
+    @staticmethod
+    def _read_records(handle):
+        for line in handle:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict):
+                yield record
+
+    # ── Maintenance ──────────────────────────────────────────────────────
+
+    def compact(self, keep=None):
+        """Keep the newest ``keep`` entries per key; returns (kept, dropped)."""
+        with self._locked():
+            return self._compact_locked(self.keep if keep is None else keep)
+
+    def _compact_locked(self, keep):
+        if self._batch_handle is not None:
+            self._batch_handle.flush()
+        if not os.path.exists(self.path):
+            return 0, 0
+        with open(self.path, "rb") as handle:
+            records = list(self._read_records(handle))
+        seen = {}
+        kept = []
+        for record in reversed(records):
+            key = _primary_key(record)
+            if seen.get(key, 0) < max(0, keep):
+                seen[key] = seen.get(key, 0) + 1
+                kept.append(record)
+        kept.reverse()
+        payload = b"".join((json.dumps(record) + "\n").encode("utf-8") for record in kept)
+        atomic_write_bytes(self.path, payload)
+        if self._batch_handle is not None:
+            # The batch handle still points at the old inode; continue on the new file
+            self._batch_handle.close()
+            self._batch_handle = open(self.path, "ab")
+        next_seq = self._next_seq
+        self._reset()
+        self._ino = os.stat(self.path).st_ino
+        self._scan(0)
+        self._next_seq = max(self._next_seq, next_seq)
+        self._compacted = self._count
+        self._save_index()
+        return len(kept), len(records) - len(kept)
+
+    def clear(self):
+        with self._locked():
+            atomic_write_bytes(self.path, b"")
+            self._reset()
+            self._ino = os.stat(self.path).st_ino
+            self._save_index()
+
+    def close(self):
+        with self._mutex:
+            if self._unsaved:
+                self._save_index()
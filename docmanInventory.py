@@ -0,0 +1,122 @@
+"""Snapshot of what a Docman practice already has, and what is left to create.
+
+Each settings page lists its existing objects. OnboardingJob reads that list
+once per page, diffs it against the requested names, and only opens create
+dialogs for the missing ones. Names are compared case-insensitively with
+whitespace collapsed, which is how Docman itself treats duplicates.
+
+The list selectors below match the Docman stand-in (mockDocman); they have
+not been checked against every live Docman build. A page where none of a
+list's containers exist therefore has its inventory reported as unavailable
+(``existing_names`` returns None), never as "nothing present": nothing is
+skipped, and no save can be confirmed from the list.
+"""
+
+import re
+from collections import namedtuple
+
+# An existing-object list: the element(s) holding it, and the name cells inside
+InventoryList = namedtuple("InventoryList", ["container", "items"])
+
+FOLDER_LIST = InventoryList(
+    "#folderList, #folders_list, table#folders",
+    "#folderList .folder-name, #folders_list .folder-name, table#folders td.name",
+)
+USER_GROUP_LIST = InventoryList(
+    "#userGroupsTable, table#user_groups",
+    "#userGroupsTable td.group-name, table#user_groups td.name",
+)
+VIEW_LIST = InventoryList("#viewsTable, table#views", "#viewsTable td.view-name, table#views td.name")
+
+_READ_TEXT_JS = "els => els.map(el => el.textContent)"
+_COUNT_JS = "els => els.length"
+
+CREATED = "created"
+SKIPPED = "skipped"
+FAILED = "failed"
+
+
+def normalize_name(name):
+    return re.sub(r"\s+", " ", str(name or "")).strip().casefold()
+
+
+async def existing_names(page, inventory):
+    """Return the normalised names in ``inventory`` (an InventoryList), or None if the page has no such list."""
+    texts = await page.eval_on_selector_all(inventory.items, _READ_TEXT_JS)
+    if not texts and not await page.eval_on_selector_all(inventory.container, _COUNT_JS):
+        return None
+    return {normalize_name(text) for text in texts if text.strip()}
+
+
+def plan(requested, existing):
+    """Split requested names into (missing, present), keeping request order and dropping repeats.
+
+    ``existing`` is what existing_names returned; None (inventory unavailable) leaves everything missing.
+    """
+    existing = existing or set()
+    missing, present, seen = [], [], set()
+    for name in requested:
+        key = normalize_name(name)
+        if key in seen:
+            continue
+        seen.add(key)
+        (present if key in existing else missing).append(name)
+    return missing, present
+
+
+class StepReport:
+    def __init__(self, step):
+        self.step = step
+        self.created = []
+        self.skipped = []
+        self._failed = {}
+        self.inventory_unavailable = False
+
+    @property
+    def failed(self):
+        return [f"{name}: {detail}" if detail else name for name, detail in self._failed.items()]
+
+    def record(self, outcome, name, detail=""):
+        if outcome == CREATED:
+            self.created.append(name)
+        elif outcome == SKIPPED:
+            self.skipped.append(name)
+        else:
+            self._failed[name] = detail
+            return
+        # A retried step can succeed where an earlier pass failed
+        self._failed.pop(name, None)
+
+    def line(self):
+        line = (
+            f"{self.step}: {len(self.created)} created, {len(self.skipped)} skipped, "
+            f"{len(self.failed)} failed"
+        )
+        if self.inventory_unavailable:
+            line += " (inventory unavailable)"
+        return line
+
+
+class OnboardingReport:
+    def __init__(self, ods_code):
+        self.ods_code = ods_code
+        self.steps = []
+
+    def step(self, name):
+        """The report for ``name``, reused if the step runs again (retries, resumes)."""
+        for report in self.steps:
+            if report.step == name:
+                return report
+        report = StepReport(name)
+        self.steps.append(report)
+        return report
+
+    @property
+    def failures(self):
+        return [f"{step.step} {failure}" for step in self.steps for failure in step.failed]
+
+    def lines(self):
+        lines = [f"Onboarding report for {self.ods_code}:"]
+        lines.extend(f"  {step.line()}" for step in self.steps)
+        lines.extend(f"  FAILED {failure}" for failure in self.failures)
+        return lines
@@ -0,0 +1,268 @@
+"""Deep-link navigation to Docman settings pages.
+
+The first time a run reaches a settings page by clicking through the menus,
+Navigator records the page's URL. It caches that URL per Docman host and
+build in a small JSON file. From then on it jumps straight there with one
+``page.goto``.
+
+A deep link only counts once the page's ready selector shows up. If it does
+not, for example after the URL moved in a new build or the request was
+bounced to login, the cached entry is dropped and the click chain runs
+instead, relearning the URL as it goes. A route whose deep link fails
+MAX_FAILURES times in a row is left to the click chain for that host and
+build.
+
+A wave shares one cache, but a settings URL may carry an organisation or
+practice id. So a learned URL is only used for the practice that learned it
+until a second practice's click chain lands on the same URL. If another
+practice lands somewhere else, the URL is practice-specific and the route
+stays on clicks for that host and build. Each route's ready selector only
+matches its own page, so a deep link that lands on the wrong page fails.
+
+The cache is only a hint. A missing, stale or corrupt file just means the
+menus get clicked.
+"""
+
+import json
+import os
+import time
+from collections import namedtuple
+from urllib.parse import urlparse
+
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from work_items_store import atomic_write_json
+
+CACHE_ENV = "DOCMAN_NAV_CACHE"
+DEFAULT_CACHE_PATH = os.path.join("output", "docman-nav-cache.json")
+CACHE_VERSION = 2
+MAX_FAILURES = 2
+# A URL seen by this many practices is shared, not practice-specific
+SHARED_AFTER = 2
+DEEP_LINK_TIMEOUT_MS = 5000
+# LatencyTracker key for "ready selector visible after a deep link"
+PAGE_READY = "page_ready"
+
+# exit: what to click to leave the page when the next route has to be clicked to
+Route = namedtuple("Route", ["name", "chain", "ready", "exit"])
+
+SETTINGS = "a:has-text('Settings')"
+
+FOLDERS_TOP_LEVEL = Route(
+    "folders_top_level",
+    (SETTINGS, 'span:has-text("Filing")', 'a:has-text("Document Folders")',
+     'td >> a:has-text("Filing")', 'a:has-text("Top Level Folder")'),
+    "a#addFolder",
+    "a:has-text('Back to application')",
+)
+USER_GROUPS = Route(
+    "user_groups",
+    (SETTINGS, 'span:has-text("Users")', 'a:has-text("User Groups")'),
+    # Exact text: has-text('Create') also matches the Views page's "Create New View"
+    "a:text-is('Create')",
+    None,
+)
+VIEWS = Route(
+    "views",
+    (SETTINGS, 'span:has-text("Tasks")', 'a:has-text("Views")'),
+    "a:has-text('Create New View')",
+    None,
+)
+SEARCH_SETTINGS = Route(
+    "search_settings",
+    (SETTINGS, 'a:has-text("My profile")', 'a:has-text("Search settings")'),
+    "div#s2id_dm-search-in",
+    None,
+)
+
+_BUILD_JS = """() => {
+    const meta = document.querySelector('meta[name="application-version"], meta[name="version"], meta[name="build"]');
+    if (meta) return meta.content;
+    const tagged = document.querySelector("[data-build], [data-version]");
+    return tagged ? (tagged.dataset.build || tagged.dataset.version) : "";
+}"""
+
+_SIGNED_OUT_PATHS = ("/account/login", "/account/prelogin", "/account/logout")
+
+
+def cache_path(default=DEFAULT_CACHE_PATH):
+    return os.environ.get(CACHE_ENV) or default
+
+
+class NavigationCache:
+    """``{"<host>|<build>": {route: {"path", "seen", "failures", "varies"}}}`` persisted as JSON.
+
+    ``seen`` lists the ODS codes whose click chain landed on ``path``.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or cache_path()
+        self._entries = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+            if data.get("version") == CACHE_VERSION and isinstance(data.get("sites"), dict):
+                return data["sites"]
+        except (OSError, ValueError, AttributeError):
+            pass
+        return {}
+
+    def _save(self):
+        try:
+            atomic_write_json(self.path, {"version": CACHE_VERSION, "sites": self._entries})
+        except OSError:
+            pass
+
+    def lookup(self, site, route, ods=None):
+        """The deep link for ``ods``: its own URL, or one shared by SHARED_AFTER practices."""
+        entry = self._entries.get(site, {}).get(route)
+        if not entry or self.pinned(site, route):
+            return None
+        seen = entry.get("seen", [])
+        if ods in seen or len(seen) >= SHARED_AFTER:
+            return entry.get("path")
+        return None
+
+    def pinned(self, site, route):
+        """True once the deep link failed too often, or turned out to differ per practice."""
+        entry = self._entries.get(site, {}).get(route, {})
+        return entry.get("varies", False) or entry.get("failures", 0) >= MAX_FAILURES
+
+    def learn(self, site, route, path, ods=None):
+        if not ods:
+            return  # cannot tell whether the URL is specific to a practice
+        routes = self._entries.setdefault(site, {})
+        entry = routes.get(route)
+        if entry and entry.get("path") == path:
+            # Same URL again: keep its failure count, note one more practice landing here
+            seen = entry.setdefault("seen", [])
+            if ods not in seen and len(seen) < SHARED_AFTER:
+                seen.append(ods)
+                self._save()
+            return
+        if entry and any(other != ods for other in entry.get("seen", [])):
+            # Another practice landed on a different URL: the path carries a practice id
+            entry["varies"] = True
+            self._save()
+            return
+        if any(name != route and other.get("path") == path for name, other in routes.items()):
+            return  # one URL for several pages (client-side routing): not a usable deep link
+        routes[route] = {"path": path, "seen": [ods], "failures": 0}
+        self._save()
+
+    def confirm(self, site, route):
+        entry = self._entries.get(site, {}).get(route)
+        if entry and entry.get("failures"):
+            entry["failures"] = 0
+            self._save()
+
+    def forget(self, site, route):
+        entry = self._entries.setdefault(site, {}).setdefault(route, {})
+        entry["failures"] = entry.get("failures", 0) + 1
+        self._save()
+
+
+class Navigator:
+    def __init__(self, page, logger, cache=None, latency=None):
+        """``latency``: an adaptiveWait.LatencyTracker sizing the deep-link ready wait."""
+        self.page = page
+        self._logger = logger
+        self._latency = latency
+        self.cache = cache if cache is not None else NavigationCache()
+        self._site = None
+        self._home = None
+        self._current = None
+        self.ods = None
+        self.deep_links = 0
+        self.click_chains = 0
+
+    def start(self, ods):
+        """Begin a new practice: deep links are looked up and learned for ``ods``."""
+        self.ods = str(ods).strip().upper() if ods else None
+        self._site = None
+        self._home = None
+        self._current = None
+
+    async def _site_key(self):
+        if self._site is None:
+            self._home = self.page.url
+            host = urlparse(self.page.url).netloc
+            try:
+                build = await self.page.evaluate(_BUILD_JS)
+            except Exception:
+                build = ""
+            self._site = f"{host}|{build or 'unknown'}"
+        return self._site
+
+    async def goto(self, route):
+        """Open ``route`` by deep link when one is known, otherwise by clicking."""
+        site = await self._site_key()
+        path = self.cache.lookup(site, route.name, self.ods)
+        if path and await self._deep_link(route, path):
+            self.cache.confirm(site, route.name)
+            self.deep_links += 1
+            self._current = route
+            return
+        if path:
+            self._logger.warning(f"[nav] Deep link for {route.name} stopped working; clicking through instead")
+            self.cache.forget(site, route.name)
+            # Wherever the failed link landed, the menus start from the page we signed in to
+            self._current = None
+            await self.page.goto(self._home)
+
+        await self._click_chain(route)
+        self.click_chains += 1
+        self._current = route
+        if not self.cache.pinned(site, route.name):
+            learned = self._path_of(self.page.url)
+            if learned:
+                self.cache.learn(site, route.name, learned, self.ods)
+
+    async def leave(self):
+        """Click the current page's exit link, if it has one (only needed before a click chain)."""
+        route, self._current = self._current, None
+        if route is not None and route.exit:
+            await self.page.click(route.exit)
+
+    async def _deep_link(self, route, path):
+        parsed = urlparse(self.page.url)
+        timeout_ms = DEEP_LINK_TIMEOUT_MS
+        if self._latency is not None:
+            timeout_ms = self._latency.timeout_ms(PAGE_READY, timeout_ms)
+        try:
+            await self.page.goto(f"{parsed.scheme}://{parsed.netloc}{path}")
+            if self._path_of(self.page.url) is None:
+                return False
+            start = time.perf_counter()
+            await self.page.wait_for_selector(route.ready, timeout=timeout_ms)
+            if self._latency is not None:
+                self._latency.record(PAGE_READY, (time.perf_counter() - start) * 1000)
+            return True
+        except PlaywrightTimeoutError:
+            if self._latency is not None:
+                self._latency.record_timeout(PAGE_READY)  # the next deep link gets the full timeout
+            return False
+        except PlaywrightError:
+            return False
+
+    async def _click_chain(self, route):
+        if self._current is not None and self._current.exit:
+            name = self._current.name
+            try:
+                await self.leave()
+            except PlaywrightTimeoutError:
+                self._logger.warning(f"[nav] Could not leave {name}. Proceeding anyway.")
+        for selector in route.chain:
+            await self.page.click(selector)
+        await self.page.wait_for_selector(route.ready)
+
+    @staticmethod
+    def _path_of(url):
+        """Path and query of a settings page URL; None for the login pages."""
+        parsed = urlparse(url)
+        if not parsed.path or parsed.path.lower().startswith(_SIGNED_OUT_PATHS):
+            return None
+        return parsed.path + (f"?{parsed.query}" if parsed.query else "")
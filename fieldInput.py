@@ -0,0 +1,125 @@
+"""Text-entry strategies for Docman form fields.
+
+Docman enables confirm buttons from input/keyup handlers, which is why the
+jobs used to type one character at a time with sleeps in between. FieldInput
+tries the fast ways first and checks that each one worked:
+
+* "fill":   Playwright ``fill``; fires a real ``input`` event
+* "script": native value setter, then input/keyup/change events dispatched
+            from page JS, for builds whose handlers ignore ``fill``
+* "type":   throttled per-key typing; the old behaviour, kept as a fallback
+
+An entry only counts once the field holds the value and, if a confirm
+selector is given, that button is enabled. Given a LatencyTracker, the wait
+for the button is sized from how long it has taken to enable so far, so a
+strategy the page ignores fails fast instead of holding for the full
+timeout. The strategy that worked is tried first for that field from then
+on. Every attempt is logged with its timing, so the logs show which path
+each Docman build takes.
+
+The strategies are coroutines written against ``playwright.async_api``. The
+sync OnboardingJob drives them through onboardingEngine.SyncPage.
+"""
+
+import time
+from collections import namedtuple
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+# LatencyTracker key for "confirm button enabled after entry"
+CONFIRM_ENABLED = "confirm_enabled"
+
+FieldTiming = namedtuple("FieldTiming", ["selector", "strategy", "ms", "verified"])
+
+_SET_VALUE_JS = """(el, value) => {
+    const proto = el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+    Object.getOwnPropertyDescriptor(proto, "value").set.call(el, value);
+    for (const type of ["input", "keyup", "change"]) {
+        el.dispatchEvent(new Event(type, { bubbles: true }));
+    }
+}"""
+
+
+class FieldInputError(RuntimeError):
+    pass
+
+
+class FillStrategy:
+    name = "fill"
+    verify_timeout_ms = 1500
+
+    async def enter(self, locator, value):
+        await locator.fill(value)
+
+
+class ScriptStrategy:
+    name = "script"
+    verify_timeout_ms = 1500
+
+    async def enter(self, locator, value):
+        await locator.evaluate(_SET_VALUE_JS, value)
+
+
+class TypeStrategy:
+    name = "type"
+    verify_timeout_ms = 8000
+
+    def __init__(self, delay_ms=50):
+        self.delay_ms = delay_ms
+
+    async def enter(self, locator, value):
+        await locator.fill("")
+        type_keys = getattr(locator, "press_sequentially", None) or locator.type
+        await type_keys(value, delay=self.delay_ms)
+
+
+DEFAULT_STRATEGIES = (FillStrategy(), ScriptStrategy(), TypeStrategy())
+
+
+class FieldInput:
+    def __init__(self, page, logger, strategies=DEFAULT_STRATEGIES, latency=None):
+        self.page = page
+        self._logger = logger
+        self._latency = latency
+        self._strategies = list(strategies)
+        self._preferred = {}
+        self.timings = []
+
+    def _ordered(self, selector):
+        preferred = self._preferred.get(selector)
+        return sorted(self._strategies, key=lambda strategy: strategy.name != preferred)
+
+    async def _verified(self, locator, value, confirm_selector, timeout_ms):
+        if confirm_selector:
+            if self._latency is not None:
+                timeout_ms = self._latency.timeout_ms(CONFIRM_ENABLED, timeout_ms)
+            start = time.perf_counter()
+            try:
+                await self.page.wait_for_selector(f"{confirm_selector}:not([disabled])", timeout=timeout_ms)
+            except PlaywrightTimeoutError:
+                if self._latency is not None:
+                    self._latency.record_timeout(CONFIRM_ENABLED)
+                return False
+            if self._latency is not None:
+                self._latency.record(CONFIRM_ENABLED, (time.perf_counter() - start) * 1000)
+        return await locator.input_value() == value
+
+    async def enter(self, selector, value, confirm_selector=None):
+        """Put value into the field; returns the name of the strategy that worked."""
+        locator = self.page.locator(selector)
+        for strategy in self._ordered(selector):
+            start = time.perf_counter()
+            try:
+                await strategy.enter(locator, value)
+                verified = await self._verified(locator, value, confirm_selector, strategy.verify_timeout_ms)
+            except PlaywrightTimeoutError:
+                verified = False
+            ms = (time.perf_counter() - start) * 1000
+            self.timings.append(FieldTiming(selector, strategy.name, ms, verified))
+            self._logger.info(
+                f"[input] {selector} via {strategy.name}: {ms:.0f} ms ({'verified' if verified else 'not verified'})"
+            )
+            if verified:
+                self._preferred[selector] = strategy.name
+                return strategy.name
+        raise FieldInputError(f"No input strategy could enter a value into {selector}")
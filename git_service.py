@@ -0,0 +1,236 @@
+"""Cached git plumbing for the practice-admin git flow.
+
+GitService wraps one repository and answers most questions from a single
+``git for-each-ref`` snapshot (current branch, local branches, origin
+branches, and origin/HEAD's target). The snapshot is reused until a command
+that moves refs runs, ``refs_ttl`` seconds pass, or the ref files change on
+disk (.git/HEAD, packed-refs, the refs/heads and refs/remotes/<remote>
+directories, or the current branch's ref), so commits, checkouts and fetches
+made outside the tool are picked up.
+
+It also avoids network round trips that would not change anything. Before
+fetching, a cheap ``git ls-remote --heads`` lists origin's branches; the
+fetch is skipped only when every one of them matches the remote-tracking
+refs we already have, so no ``origin/*`` ref is left stale. The old ``pull
+--ff-only`` (a second fetch) becomes a local ``merge --ff-only``, and only
+runs when the base branch is actually behind. ``ready()`` (is there a repo
+at all) expires with the snapshot, so fixing the repo path needs no restart.
+
+Every command's duration is recorded in ``timings``. The cached snapshot is
+guarded by a lock, so the Tk thread can ask for the default branch while the
+git lane runs a flow; network commands run outside the lock.
+"""
+
+import os
+import subprocess
+import threading
+import time
+from collections import namedtuple
+
+DEFAULT_REFS_TTL = 30.0
+
+GitTiming = namedtuple("GitTiming", ["command", "seconds", "returncode"])
+
+_REF_FORMAT = "%(HEAD)%09%(objectname)%09%(refname)%09%(symref)"
+
+
+def _parse_heads(ls_remote_output):
+    """{branch: sha} from ``git ls-remote --heads`` output."""
+    heads = {}
+    for line in ls_remote_output.splitlines():
+        sha, _, refname = line.partition("\t")
+        if refname.startswith("refs/heads/"):
+            heads[refname[len("refs/heads/"):]] = sha.strip()
+    return heads
+
+
+class GitCommandError(RuntimeError):
+    pass
+
+
+class PushFailedAfterCommit(GitCommandError):
+    """The commit was made locally; only the push failed."""
+
+
+class GitService:
+    def __init__(self, repo_path, run=None, remote="origin", refs_ttl=DEFAULT_REFS_TTL):
+        """``run(args, cwd)`` must return a CompletedProcess (text mode)."""
+        self.repo_path = repo_path
+        self.remote = remote
+        self.refs_ttl = refs_ttl
+        self._run = run or self._default_run
+        self.timings = []
+        self._ready = None
+        self._refs = None
+        self._refs_stamp = None
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _default_run(args, cwd=None):
+        return subprocess.run(args, cwd=cwd, capture_output=True, text=True, shell=False)
+
+    # ── Command execution ────────────────────────────────────────────────
+
+    def run(self, git_args, mutates_refs=False):
+        start = time.perf_counter()
+        result = self._run(["git"] + list(git_args), cwd=self.repo_path)
+        self.timings.append(GitTiming(" ".join(git_args), time.perf_counter() - start, result.returncode))
+        if mutates_refs:
+            with self._lock:
+                self._refs = None
+        return result
+
+    def run_checked(self, git_args, mutates_refs=False):
+        result = self.run(git_args, mutates_refs=mutates_refs)
+        if result.returncode != 0:
+            cmd = "git " + " ".join(git_args)
+            raise GitCommandError(f"{cmd} failed\nSTDOUT:\n{result.stdout}\nSTDERR:\n{result.stderr}")
+        return result
+
+    def timing_summary(self, since=0):
+        timings = self.timings[since:]
+        total = sum(t.seconds for t in timings)
+        parts = ", ".join(f"{t.command.split()[0]} {t.seconds:.2f}s" for t in timings)
+        return f"{len(timings)} git command(s) in {total:.2f}s ({parts})"
+
+    # ── Cached repository metadata ───────────────────────────────────────
+
+    def ready(self):
+        with self._lock:
+            if self._ready is not None and time.monotonic() - self._ready[1] > self.refs_ttl:
+                self._ready = None
+            if self._ready is None:
+                p = self.repo_path
+                self._ready = (os.path.isdir(p) and os.path.exists(os.path.join(p, ".git")), time.monotonic())
+            return self._ready[0]
+
+    def invalidate(self):
+        with self._lock:
+            self._ready = None
+            self._refs = None
+
+    def _head_stamp(self, head=None):
+        """mtimes of the files a ref change outside the tool would touch."""
+        git_dir = os.path.join(self.repo_path, ".git")
+        paths = ["HEAD", "packed-refs", os.path.join("refs", "heads"), os.path.join("refs", "remotes", self.remote)]
+        if head:
+            paths.append(os.path.join("refs", "heads", *head.split("/")))
+        stamp = []
+        for path in paths:
+            try:
+                st = os.stat(os.path.join(git_dir, path))
+                stamp.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def refs(self):
+        """Return {"head": branch or None, "heads": {...}, "remote": {...}, "remote_head": str|None}."""
+        with self._lock:
+            if self._refs is not None:
+                taken, head_stamp = self._refs_stamp
+                if time.monotonic() - taken > self.refs_ttl or head_stamp != self._head_stamp(self._refs["head"]):
+                    self._refs = None
+            if self._refs is None:
+                result = self.run_checked([
+                    "for-each-ref", f"--format={_REF_FORMAT}", "refs/heads", f"refs/remotes/{self.remote}",
+                ])
+                prefix = f"refs/remotes/{self.remote}/"
+                refs = {"head": None, "heads": {}, "remote": {}, "remote_head": None}
+                for line in result.stdout.splitlines():
+                    parts = line.split("\t")
+                    if len(parts) < 3:
+                        continue
+                    current, sha, refname = parts[0] == "*", parts[1], parts[2]
+                    symref = parts[3] if len(parts) > 3 else ""
+                    if refname.startswith("refs/heads/"):
+                        name = refname[len("refs/heads/"):]
+                        refs["heads"][name] = sha
+                        if current:
+                            refs["head"] = name
+                    elif refname.startswith(prefix):
+                        name = refname[len(prefix):]
+                        if name == "HEAD":
+                            if symref.startswith(prefix):
+                                refs["remote_head"] = symref[len(prefix):]
+                        else:
+                            refs["remote"][name] = sha
+                self._refs = refs
+                self._refs_stamp = (time.monotonic(), self._head_stamp(refs["head"]))
+            return self._refs
+
+    def default_branch(self):
+        if not self.ready():
+            return "main"
+        try:
+            refs = self.refs()
+        except GitCommandError:
+            return "main"
+        if refs["remote_head"]:
+            return refs["remote_head"]
+        return "main" if "main" in refs["heads"] else "master"
+
+    def current_branch(self):
+        return self.refs()["head"]
+
+    def branch_exists(self, branch):
+        return branch in self.refs()["heads"]
+
+    # ── Network operations ───────────────────────────────────────────────
+
+    def fetch_if_stale(self, branch):
+        """Fetch origin unless ls-remote shows all of its branches unchanged. Returns True if it fetched.
+
+        ``branch`` (the base) must already be tracked for the fetch to be skipped.
+        """
+        tracked = self.refs()["remote"]
+        if branch in tracked:
+            probe = self.run(["ls-remote", "--heads", self.remote])
+            if probe.returncode == 0 and _parse_heads(probe.stdout) == tracked:
+                return False
+
+        # --prune drops branches deleted on origin, so the next probe can match again
+        self.run_checked(["fetch", "--prune", self.remote], mutates_refs=True)
+        return True
+
+    def update_base(self, branch):
+        """Check out branch and fast-forward it to origin's copy if behind."""
+        if self.current_branch() != branch:
+            self.run_checked(["checkout", branch])
+            self._moved_head(branch)
+        refs = self.refs()
+        local, remote = refs["heads"].get(branch), refs["remote"].get(branch)
+        if remote and local != remote:
+            self.run_checked(["merge", "--ff-only", f"{self.remote}/{branch}"], mutates_refs=True)
+
+    def switch_branch(self, branch):
+        if self.current_branch() == branch:
+            return
+        if self.branch_exists(branch):
+            self.run_checked(["checkout", branch])
+            self._moved_head(branch)
+        else:
+            self.run_checked(["checkout", "-b", branch])
+            self._moved_head(branch, created=True)
+
+    def _moved_head(self, branch, created=False):
+        # A checkout only moves HEAD, so patch the snapshot instead of re-reading it
+        with self._lock:
+            refs = self._refs
+            if refs is None:
+                return
+            if created:
+                refs["heads"][branch] = refs["heads"].get(refs["head"])
+            refs["head"] = branch
+            self._refs_stamp = (self._refs_stamp[0], self._head_stamp(branch))
+
+    def stage_all(self):
+        """``git add -A``; returns True if anything is staged afterwards."""
+        self.run_checked(["add", "-A"])
+        return self.run(["diff", "--cached", "--quiet"]).returncode != 0
+
+    def commit(self, message):
+        self.run_checked(["commit", "-m", message], mutates_refs=True)
+
+    def push(self, branch):
+        self.run_checked(["push", "-u", self.remote, branch], mutates_refs=True)
@@ -0,0 +1,165 @@
+"""Queue-based logging with group-commit fsync.
+
+Callers log through a QueueHandler and return immediately. A single
+GroupCommitListener thread drains the queue in batches, writes each batch
+to the file handler, and then flushes and fsyncs once per batch: when
+``batch_size`` records have been written, when ``interval`` seconds have
+passed since the last sync, or when the queue goes idle. That replaces the
+old one-fsync-per-record behaviour of SafeFileHandler.
+
+Durability is selectable per file handler:
+
+* "record": fsync after every record (the old behaviour, slowest)
+* "batch":  group commit as described above (default)
+* "none":   flush to the OS per batch, never fsync
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import time
+
+DURABILITY_RECORD = "record"
+DURABILITY_BATCH = "batch"
+DURABILITY_NONE = "none"
+DURABILITY_MODES = (DURABILITY_RECORD, DURABILITY_BATCH, DURABILITY_NONE)
+
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_INTERVAL = 0.2
+
+
+class GroupCommitFileHandler(logging.FileHandler):
+    """FileHandler that writes without flushing; ``commit`` makes it durable."""
+
+    def __init__(self, filename, mode="a", encoding="utf-8", durability=DURABILITY_BATCH):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"Unknown durability '{durability}' (expected one of {', '.join(DURABILITY_MODES)})")
+        super().__init__(filename, mode=mode, encoding=encoding)
+        self.durability = durability
+
+    def emit(self, record):
+        try:
+            msg = self.format(record)
+            with self.lock:
+                if self.stream is None:
+                    self.stream = self._open()
+                self.stream.write(msg + self.terminator)
+            if self.durability == DURABILITY_RECORD:
+                self.commit()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def commit(self):
+        with self.lock:
+            if not self.stream:
+                return
+            self.stream.flush()
+            if self.durability == DURABILITY_NONE:
+                return
+            try:
+                os.fsync(self.stream.fileno())
+            except (OSError, ValueError):
+                pass
+
+    def close(self):
+        self.commit()
+        super().close()
+
+
+class GroupCommitListener(logging.handlers.QueueListener):
+    """QueueListener that hands records over in batches and commits per batch."""
+
+    def __init__(self, log_queue, *handlers, batch_size=DEFAULT_BATCH_SIZE, interval=DEFAULT_INTERVAL,
+                 respect_handler_level=True):
+        super().__init__(log_queue, *handlers, respect_handler_level=respect_handler_level)
+        self.batch_size = max(1, int(batch_size))
+        self.interval = max(0.0, float(interval))
+        self.batches = 0
+        self.records = 0
+
+    def _commit(self):
+        for handler in self.handlers:
+            commit = getattr(handler, "commit", None)
+            if commit is not None:
+                commit()
+            else:
+                handler.flush()
+        self.batches += 1
+
+    def _monitor(self):
+        q = self.queue
+        has_task_done = hasattr(q, "task_done")
+        pending = 0
+        last_commit = time.monotonic()
+        while True:
+            try:
+                timeout = max(0.0, self.interval - (time.monotonic() - last_commit)) if pending else None
+                record = q.get(timeout=timeout) if timeout is not None else q.get()
+            except queue.Empty:
+                self._commit()
+                pending = 0
+                last_commit = time.monotonic()
+                continue
+
+            batch = [record]
+            while len(batch) < self.batch_size and batch[-1] is not self._sentinel:
+                try:
+                    batch.append(q.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = False
+            for item in batch:
+                if item is self._sentinel:
+                    stop = True
+                else:
+                    self.handle(item)
+                    pending += 1
+                    self.records += 1
+                if has_task_done:
+                    q.task_done()
+
+            if stop or pending >= self.batch_size or time.monotonic() - last_commit >= self.interval:
+                if pending:
+                    self._commit()
+                pending = 0
+                last_commit = time.monotonic()
+            if stop:
+                break
+
+
+class LogPipeline:
+    """Wire a logger to QueueHandler -> GroupCommitListener -> handlers."""
+
+    def __init__(self, logger, handlers, batch_size=DEFAULT_BATCH_SIZE, interval=DEFAULT_INTERVAL):
+        self.logger = logger
+        self.queue = queue.SimpleQueue()
+        self.queue_handler = logging.handlers.QueueHandler(self.queue)
+        self.listener = GroupCommitListener(self.queue, *handlers, batch_size=batch_size, interval=interval)
+        self.handlers = list(handlers)
+        self._started = False
+
+    def start(self):
+        if self._started:
+            return self
+        for handler in list(self.logger.handlers):
+            self.logger.removeHandler(handler)
+        self.logger.addHandler(self.queue_handler)
+        self.listener.start()
+        self._started = True
+        atexit.register(self.stop)
+        return self
+
+    def stop(self):
+        if not self._started:
+            return
+        self._started = False
+        atexit.unregister(self.stop)
+        self.logger.removeHandler(self.queue_handler)
+        self.listener.stop()
+        for handler in self.handlers:
+            handler.close()
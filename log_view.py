@@ -0,0 +1,87 @@
+"""Bounded on-screen log for the practice-admin window.
+
+RingLogView keeps the last ``capacity`` lines in a deque and mirrors them into
+a Tk text widget. Once the widget holds ``capacity + slack`` lines, the
+oldest ones are deleted in a single call, so memory use and per-append cost
+stay flat however long the tool runs. The full history only lives in the
+file logs.
+
+A case-insensitive filter narrows the widget to matching lines from the
+in-memory window; new lines that do not match are kept but not shown.
+"""
+
+import tkinter as tk
+from collections import deque
+
+DEFAULT_CAPACITY = 2000
+
+
+class RingLogView:
+    def __init__(self, text_widget, capacity=DEFAULT_CAPACITY, slack=None):
+        self.widget = text_widget
+        self.capacity = max(1, int(capacity))
+        self.slack = max(1, int(slack if slack is not None else self.capacity // 10))
+        self._lines = deque(maxlen=self.capacity)
+        self._shown = 0
+        self._filter = ""
+
+    def __len__(self):
+        return len(self._lines)
+
+    @property
+    def filter_text(self):
+        return self._filter
+
+    def _matches(self, line):
+        return not self._filter or self._filter in line.lower()
+
+    def append(self, messages):
+        """Append one or more messages (multi-line messages are split)."""
+        if isinstance(messages, str):
+            messages = [messages]
+        lines = [line for message in messages for line in str(message).rstrip("\n").split("\n")]
+        if not lines:
+            return
+        self._lines.extend(lines)
+        visible = [line for line in lines if self._matches(line)] if self._filter else lines
+        if not visible:
+            return
+        if len(visible) > self.capacity:
+            visible = visible[-self.capacity:]
+
+        self.widget.configure(state="normal")
+        self.widget.insert(tk.END, "\n".join(visible) + "\n")
+        self._shown += len(visible)
+        if self._shown > self.capacity + self.slack:
+            excess = self._shown - self.capacity
+            self.widget.delete("1.0", f"{excess + 1}.0")
+            self._shown -= excess
+        self.widget.configure(state="disabled")
+        self.widget.see(tk.END)
+
+    def search(self, text):
+        """Return the in-memory lines containing text (case-insensitive)."""
+        needle = str(text or "").lower()
+        if not needle:
+            return list(self._lines)
+        return [line for line in self._lines if needle in line.lower()]
+
+    def set_filter(self, text):
+        needle = str(text or "").strip().lower()
+        if needle == self._filter:
+            return
+        self._filter = needle
+        self._redraw(self.search(needle))
+
+    def clear(self):
+        self._lines.clear()
+        self._redraw([])
+
+    def _redraw(self, lines):
+        self.widget.configure(state="normal")
+        self.widget.delete("1.0", tk.END)
+        if lines:
+            self.widget.insert(tk.END, "\n".join(lines) + "\n")
+        self._shown = len(lines)
+        self.widget.configure(state="disabled")
+        self.widget.see(tk.END)
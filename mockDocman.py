@@ -0,0 +1,579 @@
+"""Local stand-in for the Docman pages the onboarding jobs drive.
+
+Serves just enough of Docman for OnboardingJob to run end to end with no
+network: the login form, the Settings menu, Document Folders -> Filing -> Top
+Level Folder (with the add-folder dialog and the duplicate-folder modal),
+User Groups, Views, and My profile -> Search settings (select2-style
+pickers). It uses the same URLs, element ids and link texts the job relies
+on.
+
+Each login gets its own session cookie, and all state is kept per ODS code,
+so concurrent runs can be checked for cross-talk with ``state(ods)``, or over
+HTTP with ``GET /__state?ods=<ODS>``.
+
+A FaultProfile adds latency and failures to the settings pages and the
+create/update API. It can add a fixed delay plus jitter per request, extra
+latency on API calls, requests that stall, and requests that fail with a 500
+(an error page without the Docman menus, or an API error the page ignores,
+like a lost save). It can also delay the browser-side reactions, such as the
+Confirm link enabling. With a seed, each draw depends only on the seed, the
+practice, the path and how many times that practice has requested it, so a
+seeded profile hits the same requests whatever order the server threads run
+in. ``fault_counts`` says what was injected.
+
+    python mockDocman.py [--port 8765] [--latency-ms 80 --jitter-ms 40 --error-rate 0.02]
+"""
+
+import argparse
+import html
+import json
+import random
+import secrets
+import threading
+import time
+from collections import Counter, namedtuple
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+LOGIN_PATH = "/Account/Login"
+HOME_PATH = "/DocumentViewer/Filing"
+SESSION_COOKIE = "DocmanSession"
+MOCK_BUILD = "mock-1"
+
+# Paths the FaultProfile applies to (login and /__state are never faulted)
+FAULT_PATHS = ("/Settings", "/api/", HOME_PATH)
+
+FaultProfile = namedtuple(
+    "FaultProfile",
+    ["latency_ms", "jitter_ms", "api_latency_ms", "error_rate", "stall_rate", "stall_ms", "ui_delay_ms", "seed"],
+    defaults=(0, 0, 0, 0.0, 0.0, 0, 0, None),
+)
+NO_FAULTS = FaultProfile()
+
+SEARCH_IN_OPTIONS = ("document", "patient", "task")
+SEARCH_USING_OPTIONS = ("NHS number", "Name, DOB or NHS", "Name")
+
+
+class PracticeState:
+    def __init__(self):
+        self.folders = []
+        self.groups = []
+        self.views = {}
+        self.search = {"search_in": "document", "search_using": "NHS number", "hide_synthetic": False}
+
+    def snapshot(self):
+        return {
+            "folders": list(self.folders),
+            "groups": list(self.groups),
+            "views": dict(self.views),
+            "search": dict(self.search),
+        }
+
+
+# ── Page templates ───────────────────────────────────────────────────────────
+
+_STYLE = """
+body { font-family: sans-serif; margin: 0; }
+nav { background: #234; padding: 8px; } nav a { color: #fff; margin-right: 12px; }
+main { padding: 12px; } .hidden { display: none; } .modal { border: 1px solid #999; padding: 8px; }
+a[disabled] { color: #999; pointer-events: none; }
+.select2-choice { display: block; }
+"""
+
+_API_JS = """
+async function api(path, body) {
+    const response = await fetch(path, {method: "POST", credentials: "same-origin",
+        headers: {"Content-Type": "application/json"}, body: JSON.stringify(body)});
+    return {status: response.status, body: await response.json()};
+}
+function show(id) { document.getElementById(id).classList.remove("hidden"); }
+function hide(id) { document.getElementById(id).classList.add("hidden"); }
+function addRow(tableId, cls, name) {
+    const row = document.createElement("tr"); const cell = document.createElement("td");
+    cell.className = cls; cell.textContent = name; row.appendChild(cell);
+    document.getElementById(tableId).appendChild(row);
+}
+"""
+
+
+def _page(title, body, script="", nav=True):
+    menu = (
+        f'<nav><a href="/Settings">Settings</a><a href="{HOME_PATH}">Document Viewer</a>'
+        '<a href="/Account/Logout">Log out</a></nav>'
+        if nav else ""
+    )
+    return (
+        f"<!doctype html><html><head><meta charset='utf-8'><meta name='build' content='{MOCK_BUILD}'><title>{html.escape(title)}</title>"
+        f"<style>{_STYLE}</style></head><body>{menu}<main><h1>{html.escape(title)}</h1>{body}</main>"
+        f"<script>{_API_JS}{script}</script></body></html>"
+    )
+
+
+def _rows(names, cls):
+    return "".join(f'<tr><td class="{cls}">{html.escape(name)}</td></tr>' for name in names)
+
+
+def login_page(error=""):
+    message = f'<p class="error">{html.escape(error)}</p>' if error else ""
+    return _page("Sign in to Continue", f"""{message}
+<form method="post" action="{LOGIN_PATH}">
+  <label>Organisation <input id="OdsCode" name="OdsCode"></label>
+  <label>Username <input id="Username" name="Username"></label>
+  <label>Password <input id="Password" name="Password" type="password"></label>
+  <button type="submit">Sign in</button>
+</form>""", nav=False)
+
+
+def home_page(state):
+    items = "".join(f"<li>{html.escape(name)}</li>" for name in state.folders)
+    return _page("Filing", f'<ul id="folders_list">{items}</ul>')
+
+
+def settings_page():
+    return _page("Settings", """
+<section><span>Filing</span><ul><li><a href="/Settings/DocumentFolders">Document Folders</a></li></ul></section>
+<section><span>Users</span><ul><li><a href="/Settings/UserGroups">User Groups</a></li></ul></section>
+<section><span>Tasks</span><ul><li><a href="/Settings/Views">Views</a></li></ul></section>
+<section><a href="/Settings/MyProfile">My profile</a></section>""")
+
+
+def document_folders_page():
+    return _page("Document Folders", """
+<table id="folderTypes"><tr><td><a href="/Settings/DocumentFolders/Filing">Filing</a></td></tr></table>""")
+
+
+def filing_folders_page():
+    return _page("Filing folders", '<a href="/Settings/DocumentFolders/Filing/TopLevel">Top Level Folder</a>')
+
+
+def top_level_folder_page(state, enable_event="input", ui_delay_ms=0):
+    items = "".join(f'<li><span class="folder-name">{html.escape(name)}</span></li>' for name in state.folders)
+    return _page("Top Level Folder", f"""
+<ul id="folderList">{items}</ul>
+<a id="addFolder" href="#">Add folder</a>
+<div id="addDialog" class="hidden">
+  <input id="txtNewFolderName" type="text">
+  <a id="addFolderConfirm" href="#" disabled>Confirm</a>
+</div>
+<div id="dupModal" class="hidden modal"><p id="dupText"></p>
+  <button id="dupYes">Yes</button><button id="dupNo">No</button></div>
+<p><a href="{HOME_PATH}">Back to application</a></p>""", script=f"""
+const box = document.getElementById("txtNewFolderName");
+const confirmLink = document.getElementById("addFolderConfirm");
+function syncConfirm() {{
+    if (box.value.trim()) confirmLink.removeAttribute("disabled");
+    else confirmLink.setAttribute("disabled", "");
+}}
+box.addEventListener({json.dumps(enable_event)}, () => setTimeout(syncConfirm, {int(ui_delay_ms)}));
+document.getElementById("addFolder").onclick = (e) => {{
+    e.preventDefault(); box.value = ""; syncConfirm(); show("addDialog"); box.focus();
+}};
+function added(name) {{
+    const item = document.createElement("li"); const label = document.createElement("span");
+    label.className = "folder-name"; label.textContent = name; item.appendChild(label);
+    document.getElementById("folderList").appendChild(item);
+    hide("addDialog"); box.value = ""; syncConfirm();
+}}
+confirmLink.onclick = async (e) => {{
+    e.preventDefault();
+    if (confirmLink.hasAttribute("disabled")) return;
+    const name = box.value.trim();
+    const result = await api("/api/folders", {{name}});
+    if (result.status === 409) {{
+        document.getElementById("dupText").textContent =
+            "A folder with the name '" + name + "' already exists. Create a duplicate?";
+        show("dupModal");
+    }} else if (result.status === 200) {{
+        added(name);
+    }}
+}};
+document.getElementById("dupNo").onclick = () => {{ hide("dupModal"); hide("addDialog"); }};
+document.getElementById("dupYes").onclick = async () => {{
+    const name = box.value.trim();
+    hide("dupModal");
+    const result = await api("/api/folders", {{name, allow_duplicate: true}});
+    if (result.status === 200) added(name);
+}};""")
+
+
+def user_groups_page(state):
+    return _page("User Groups", f"""
+<table id="userGroupsTable">{_rows(state.groups, "group-name")}</table>
+<a id="createGroup" href="#">Create</a>
+<div id="groupForm" class="hidden">
+  <input id="group_name_input" type="text"> <a id="confirmGroup" href="#">Confirm</a>
+</div>""", script="""
+const groupBox = document.getElementById("group_name_input");
+document.getElementById("createGroup").onclick = (e) => {
+    e.preventDefault(); groupBox.value = ""; show("groupForm"); groupBox.focus();
+};
+document.getElementById("confirmGroup").onclick = async (e) => {
+    e.preventDefault();
+    const name = groupBox.value.trim();
+    if (!name) return;
+    const result = await api("/api/groups", {name});
+    if (result.status === 200) { addRow("userGroupsTable", "group-name", name); hide("groupForm"); }
+};""")
+
+
+def views_page(state):
+    return _page("Views", f"""
+<table id="viewsTable">{_rows(state.views, "view-name")}</table>
+<a id="createView" href="#">Create New View</a>
+<div id="viewForm" class="hidden">
+  <input id="view_name_input" type="text">
+  <input id="available_to_input" type="text">
+  <select id="sent_to_select"><option value="">(choose)</option><option value="group">User group</option>
+    <option value="user">User</option></select>
+  <input id="sent_to_group_select" type="text">
+  <button id="confirm_create_view" type="button">Save view</button>
+</div>""", script="""
+document.getElementById("createView").onclick = (e) => {
+    e.preventDefault();
+    for (const id of ["view_name_input", "available_to_input", "sent_to_group_select"]) {
+        document.getElementById(id).value = "";
+    }
+    document.getElementById("sent_to_select").value = "";
+    show("viewForm");
+};
+document.getElementById("confirm_create_view").onclick = async () => {
+    const value = (id) => document.getElementById(id).value.trim();
+    const body = {name: value("view_name_input"), available_to: value("available_to_input"),
+        sent_to: value("sent_to_select"), sent_to_group: value("sent_to_group_select")};
+    if (!body.name) return;
+    const result = await api("/api/views", body);
+    if (result.status === 200) { addRow("viewsTable", "view-name", body.name); hide("viewForm"); }
+};""")
+
+
+def my_profile_page():
+    return _page("My profile", '<a href="/Settings/MyProfile/SearchSettings">Search settings</a>')
+
+
+def _select2(field, options, chosen):
+    items = "".join(
+        f'<li class="select2-result"><div class="select2-result-label">{html.escape(option)}</div></li>'
+        for option in options
+    )
+    return (
+        f'<div id="s2id_dm-{field}" class="select2-container" data-field="{field}">'
+        f'<a href="#" class="select2-choice"><span class="select2-chosen">{html.escape(chosen)}</span></a>'
+        f'<ul class="select2-results hidden">{items}</ul></div>'
+    )
+
+
+def search_settings_page(state):
+    checked = " checked" if state.search["hide_synthetic"] else ""
+    return _page("Search settings", f"""
+<label>Search in</label>{_select2("search-in", SEARCH_IN_OPTIONS, state.search["search_in"])}
+<label>Search using</label>{_select2("search-using", SEARCH_USING_OPTIONS, state.search["search_using"])}
+<p><input type="checkbox" id="hide_synthetic_patients"{checked}>
+<label for="hide_synthetic_patients">Hide synthetic patients</label></p>""", script="""
+for (const container of document.querySelectorAll(".select2-container")) {
+    const results = container.querySelector(".select2-results");
+    container.querySelector(".select2-choice").onclick = (e) => {
+        e.preventDefault(); results.classList.toggle("hidden");
+    };
+    for (const item of results.querySelectorAll(".select2-result")) {
+        item.onclick = async () => {
+            const value = item.textContent.trim();
+            container.querySelector(".select2-chosen").textContent = value;
+            results.classList.add("hidden");
+            await api("/api/search", {field: container.dataset.field, value});
+        };
+    }
+}
+document.getElementById("hide_synthetic_patients").onchange = async (e) => {
+    await api("/api/search", {field: "hide-synthetic", value: e.target.checked});
+};""")
+
+
+# ── Server ───────────────────────────────────────────────────────────────────
+
+class MockDocmanServer:
+    """Threaded stand-in server; ``accounts`` maps ODS -> (username, password), None accepts any."""
+
+    def __init__(self, host="127.0.0.1", port=0, accounts=None, folder_enable_event="input", faults=NO_FAULTS):
+        self.accounts = accounts
+        self.folder_enable_event = folder_enable_event
+        self.faults = faults
+        self.fault_counts = Counter()
+        # Without a seed, draws still go through _draw_rng but are not repeatable
+        self._seed = faults.seed if faults.seed is not None else random.randrange(2 ** 32)
+        self._draws = Counter()
+        self._practices = {}
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="mock-docman", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def practice(self, ods):
+        ods = str(ods).strip().upper()
+        with self._lock:
+            return self._practices.setdefault(ods, PracticeState())
+
+    def state(self, ods):
+        with self._lock:
+            practice = self._practices.get(str(ods).strip().upper())
+            return practice.snapshot() if practice else None
+
+    def seed(self, ods, folders=(), groups=(), views=()):
+        """Pre-populate a practice, e.g. to exercise partially onboarded re-runs."""
+        practice = self.practice(ods)
+        with self._lock:
+            practice.folders.extend(folders)
+            practice.groups.extend(groups)
+            for name in views:
+                practice.views[name] = {"available_to": "Everyone", "sent_to": "group", "sent_to_group": name}
+
+    def login(self, ods, username, password):
+        ods = str(ods or "").strip().upper()
+        if not ods or not username or not password:
+            return None
+        if self.accounts is not None and self.accounts.get(ods) != (username, password):
+            return None
+        token = secrets.token_urlsafe(16)
+        self.practice(ods)
+        with self._lock:
+            self._sessions[token] = ods
+        return token
+
+    def session_ods(self, token):
+        with self._lock:
+            return self._sessions.get(token)
+
+    def logout(self, token):
+        with self._lock:
+            self._sessions.pop(token, None)
+
+    def inject(self, path, ods=None):
+        """Apply the FaultProfile to one request: sleeps as configured; True means fail it."""
+        profile = self.faults
+        if profile == NO_FAULTS or not path.startswith(FAULT_PATHS):
+            return False
+        with self._lock:
+            self._draws[(ods, path)] += 1
+            rng = random.Random(f"{self._seed}|{ods}|{path}|{self._draws[(ods, path)]}")
+            jitter = rng.uniform(0, profile.jitter_ms) if profile.jitter_ms else 0
+            stall = rng.random() < profile.stall_rate
+            error = rng.random() < profile.error_rate
+            self.fault_counts["requests"] += 1
+            self.fault_counts["stalls"] += stall
+            self.fault_counts["errors"] += error
+        delay = profile.latency_ms + jitter + (profile.api_latency_ms if path.startswith("/api/") else 0)
+        if stall:
+            delay += profile.stall_ms
+        if delay:
+            time.sleep(delay / 1000)
+        return error
+
+    # Mutations, called from request threads
+
+    def add_folder(self, ods, name, allow_duplicate=False):
+        practice = self.practice(ods)
+        with self._lock:
+            if not allow_duplicate and name.casefold() in (f.casefold() for f in practice.folders):
+                return 409, {"duplicate": True}
+            practice.folders.append(name)
+            return 200, {"ok": True}
+
+    def add_group(self, ods, name):
+        practice = self.practice(ods)
+        with self._lock:
+            if name.casefold() in (g.casefold() for g in practice.groups):
+                return 409, {"error": "A user group with that name already exists"}
+            practice.groups.append(name)
+            return 200, {"ok": True}
+
+    def add_view(self, ods, body):
+        practice = self.practice(ods)
+        name = body.get("name", "")
+        with self._lock:
+            if name in practice.views:
+                return 409, {"error": "A view with that name already exists"}
+            practice.views[name] = {key: body.get(key, "") for key in ("available_to", "sent_to", "sent_to_group")}
+            return 200, {"ok": True}
+
+    def set_search(self, ods, field, value):
+        practice = self.practice(ods)
+        key = {"search-in": "search_in", "search-using": "search_using", "hide-synthetic": "hide_synthetic"}.get(field)
+        if key is None:
+            return 400, {"error": f"unknown field {field}"}
+        with self._lock:
+            practice.search[key] = value
+        return 200, {"ok": True}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(_Handler):
+            mock = server
+
+        return Handler
+
+
+class _Handler(BaseHTTPRequestHandler):
+    mock = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    # Helpers
+
+    def _send(self, status, body, content_type="text/html; charset=utf-8", headers=()):
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _json(self, status, data):
+        self._send(status, json.dumps(data), "application/json")
+
+    def _redirect(self, location, headers=()):
+        self._send(303, "", headers=[("Location", location), *headers])
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length).decode("utf-8") if length else ""
+
+    def _session(self):
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        morsel = cookie.get(SESSION_COOKIE)
+        if morsel is None:
+            return None, None
+        return morsel.value, self.mock.session_ods(morsel.value)
+
+    # Routing
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        path = url.path.rstrip("/") or "/"
+        if path == "/__state":
+            ods = parse_qs(url.query).get("ods", [""])[0]
+            return self._json(200, self.mock.state(ods) or {})
+        if path == LOGIN_PATH:
+            return self._send(200, login_page())
+        token, ods = self._session()
+        if path == "/Account/Logout":
+            if token:
+                self.mock.logout(token)
+            return self._redirect(LOGIN_PATH, [("Set-Cookie", f"{SESSION_COOKIE}=; Path=/; Max-Age=0")])
+        if ods is None:
+            return self._redirect(LOGIN_PATH)
+
+        state = self.mock.practice(ods)
+        pages = {
+            "/": lambda: home_page(state),
+            HOME_PATH: lambda: home_page(state),
+            "/Settings": settings_page,
+            "/Settings/DocumentFolders": document_folders_page,
+            "/Settings/DocumentFolders/Filing": filing_folders_page,
+            "/Settings/DocumentFolders/Filing/TopLevel":
+                lambda: top_level_folder_page(state, self.mock.folder_enable_event, self.mock.faults.ui_delay_ms),
+            "/Settings/UserGroups": lambda: user_groups_page(state),
+            "/Settings/Views": lambda: views_page(state),
+            "/Settings/MyProfile": my_profile_page,
+            "/Settings/MyProfile/SearchSettings": lambda: search_settings_page(state),
+        }
+        render = pages.get(path)
+        if self.mock.inject(path, ods):
+            return self._send(500, _page("Server Error", "<p>Something went wrong. Please try again.</p>", nav=False))
+        if render is None:
+            return self._send(404, _page("Not found", "<p>Page not found</p>"))
+        return self._send(200, render())
+
+    def do_POST(self):
+        path = urlparse(self.path).path.rstrip("/")
+        if path == LOGIN_PATH:
+            form = {key: values[0] for key, values in parse_qs(self._body()).items()}
+            token = self.mock.login(form.get("OdsCode"), form.get("Username"), form.get("Password"))
+            if token is None:
+                return self._send(401, login_page("Sign in failed. Check your details and try again."))
+            return self._redirect(HOME_PATH, [("Set-Cookie", f"{SESSION_COOKIE}={token}; Path=/; HttpOnly")])
+
+        _token, ods = self._session()
+        if ods is None:
+            return self._json(401, {"error": "not signed in"})
+        try:
+            body = json.loads(self._body() or "{}")
+        except ValueError:
+            return self._json(400, {"error": "invalid JSON"})
+        if self.mock.inject(path, ods):
+            return self._json(500, {"error": "An unexpected error occurred"})
+        name = str(body.get("name", "")).strip()
+        if path == "/api/folders":
+            return self._json(*self.mock.add_folder(ods, name, bool(body.get("allow_duplicate"))))
+        if path == "/api/groups":
+            return self._json(*self.mock.add_group(ods, name))
+        if path == "/api/views":
+            return self._json(*self.mock.add_view(ods, dict(body, name=name)))
+        if path == "/api/search":
+            return self._json(*self.mock.set_search(ods, body.get("field"), body.get("value")))
+        return self._json(404, {"error": "unknown endpoint"})
+
+
+def add_fault_arguments(parser):
+    group = parser.add_argument_group("fault injection")
+    group.add_argument("--latency-ms", type=float, default=0, help="added to every settings/API request")
+    group.add_argument("--jitter-ms", type=float, default=0, help="uniform random extra latency")
+    group.add_argument("--api-latency-ms", type=float, default=0, help="extra latency on create/update calls")
+    group.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with a 500")
+    group.add_argument("--stall-rate", type=float, default=0.0, help="share of requests that stall")
+    group.add_argument("--stall-ms", type=float, default=0, help="how long a stalled request hangs")
+    group.add_argument("--ui-delay-ms", type=int, default=0, help="delay before the Confirm link reacts")
+    group.add_argument("--seed", type=int, default=None, help="seed for repeatable fault draws")
+
+
+def fault_profile_from_args(args):
+    return FaultProfile(args.latency_ms, args.jitter_ms, args.api_latency_ms, args.error_rate,
+                        args.stall_rate, args.stall_ms, args.ui_delay_ms, args.seed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--enable-event", default="input", choices=("input", "keyup", "change"),
+                        help="event that enables the add-folder Confirm link")
+    add_fault_arguments(parser)
+    args = parser.parse_args(argv)
+    server = MockDocmanServer(args.host, args.port, folder_enable_event=args.enable_event,
+                              faults=fault_profile_from_args(args))
+    print(f"Mock Docman listening on {server.url} (Ctrl+C to stop)")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+"""Python port of check-ods-mismatch.ps1.
+
+Runs the same checks as the PowerShell script, but in-process and for every
+work-items-in root at once:
+
+1. Practice directories must be named "[Practice Name] (ODS)", the folder ODS
+   must match payload.ods_code, and the folder name must match
+   payload.docman_practice_display_name once normalised.
+2. Every Practice Count entry must map to an existing practice directory.
+
+Folders are listed with os.scandir and the per-practice work-items.json files
+are parsed on a shared thread pool. Results are returned as Finding tuples.
+With a ValidationCache, only folders whose work-items.json changed since the
+previous run are reparsed.
+"""
+
+import hashlib
+import json
+import os
+import re
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from practice_count import (
+    PRACTICE_COUNT_DIR,
+    WORK_ITEMS_FILE,
+    PracticeCountRegistry,
+    normalize_practice_name,
+)
+from work_items_store import atomic_write_bytes
+
+ERROR = "error"
+WARNING = "warning"
+INFO = "info"
+
+# Non-practice folders that should be excluded from validation
+EXCLUDED_FOLDERS = frozenset({
+    "Platform upload",
+    "Scanner",
+    "Verification testing",
+    PRACTICE_COUNT_DIR,
+})
+
+_FOLDER_ODS_RE = re.compile(r"\(([A-Z0-9]{6})\)$", re.IGNORECASE)
+
+Finding = namedtuple("Finding", ["severity", "root", "folder", "code", "message"])
+
+# Cache stamp for a work-items.json that could not be stat'ed; never a cache hit
+_UNREADABLE = "unreadable"
+
+
+def folder_ods(folder_name):
+    """Return the 6-character ODS code at the end of a folder name, or None."""
+    match = _FOLDER_ODS_RE.search(folder_name)
+    return match.group(1).upper() if match else None
+
+
+def list_practice_folders(root_folder):
+    """Return {folder name: full path} for the practice directories in a root."""
+    folders = {}
+    with os.scandir(root_folder) as entries:
+        for entry in entries:
+            if entry.name in EXCLUDED_FOLDERS:
+                continue
+            try:
+                if entry.is_dir():
+                    folders[entry.name] = entry.path
+            except OSError:
+                continue
+    return folders
+
+
+def _parse_payload(raw):
+    try:
+        data = json.loads(raw.decode("utf-8-sig"))
+    except ValueError:
+        return None, "invalid_json"
+    first = data[0] if isinstance(data, list) and data else data
+    payload = first.get("payload") if isinstance(first, dict) else None
+    return (payload if isinstance(payload, dict) else {}), None
+
+
+def load_practice_payload(folder_path):
+    """Return (payload, error_code) for a practice folder's work-items.json."""
+    try:
+        with open(os.path.join(folder_path, WORK_ITEMS_FILE), "rb") as handle:
+            raw = handle.read()
+    except FileNotFoundError:
+        return None, "missing_work_items"
+    except OSError:
+        return None, "invalid_json"
+    return _parse_payload(raw)
+
+
+def check_practice_payload(root_folder, folder_name, payload, error_code=None):
+    """Apply the per-directory checks to an already-loaded payload."""
+    def finding(severity, code, message):
+        return Finding(severity, root_folder, folder_name, code, message)
+
+    if error_code == "missing_work_items":
+        return [finding(ERROR, error_code, f"Missing work-items.json in folder: {folder_name}")]
+    if error_code == "invalid_json":
+        return [finding(ERROR, error_code, f"Invalid JSON in {folder_name}\\work-items.json")]
+
+    found_ods = folder_ods(folder_name)
+    if not found_ods:
+        return [finding(ERROR, "folder_missing_ods", f"Folder missing ODS code: {folder_name}")]
+
+    findings = []
+    expected_ods = str(payload.get("ods_code") or "").strip()
+    if found_ods != expected_ods.upper():
+        findings.append(finding(
+            ERROR, "ods_mismatch", f"ODS mismatch in '{folder_name}': folder={found_ods} json={expected_ods}"
+        ))
+
+    display_name = payload.get("docman_practice_display_name")
+    if display_name:
+        folder_normalized = normalize_practice_name(folder_name)
+        docman_normalized = normalize_practice_name(display_name)
+        if folder_normalized != docman_normalized:
+            findings.append(finding(
+                WARNING,
+                "name_mismatch",
+                f"Name mismatch in '{folder_name}': folder='{folder_normalized}' docman='{docman_normalized}'",
+            ))
+    return findings
+
+
+def check_practice_folder(root_folder, folder_name, folder_path):
+    payload, error_code = load_practice_payload(folder_path)
+    return check_practice_payload(root_folder, folder_name, payload, error_code)
+
+
+def check_practice_count(root_folder, folder_names, registry):
+    """Report Practice Count entries that have no matching practice directory."""
+    count_file = registry.get(root_folder)
+    if not count_file.exists:
+        return [Finding(WARNING, root_folder, PRACTICE_COUNT_DIR, "missing_practice_count",
+                        f"Practice Count work-items.json not found at {count_file.path}")]
+    if count_file.load_error is not None:
+        return [Finding(ERROR, root_folder, PRACTICE_COUNT_DIR, "invalid_practice_count",
+                        "Invalid JSON in Practice Count work-items.json")]
+
+    directory_names = {normalize_practice_name(name) for name in folder_names}
+    findings = []
+    for item in count_file.items():
+        payload = item.get("payload") if isinstance(item, dict) else None
+        display_name = payload.get("docman_practice_display_name") if isinstance(payload, dict) else None
+        if not display_name:
+            continue
+        if normalize_practice_name(display_name) not in directory_names:
+            findings.append(Finding(
+                WARNING, root_folder, PRACTICE_COUNT_DIR, "count_entry_unmapped",
+                f"Practice Count entry not found as directory: {display_name}",
+            ))
+    return findings
+
+
+# ── Incremental cache ────────────────────────────────────────────────────────
+
+class ValidationCache:
+    """Persistent per-folder results keyed by work-items.json fingerprint.
+
+    An entry is reused as-is while the file's (mtime, size) is unchanged. If
+    the stat changed but the SHA-1 of the contents did not, the stored payload
+    is reused and only the stat is refreshed. Anything else is reparsed.
+    Folders that disappeared, and roots that are no longer configured, are
+    pruned on the next run. Roots are compared normalised, like folders.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path):
+        self.path = path
+        self._entries = {}
+        self._dirty = False
+        self.stats = {}
+        self.load()
+
+    def load(self):
+        self._entries = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+            if data.get("version") == self.VERSION:
+                self._entries = dict(data.get("folders") or {})
+        except (OSError, ValueError, AttributeError):
+            pass
+        self._dirty = False
+
+    def save(self):
+        if not self._dirty:
+            return
+        atomic_write_bytes(self.path, json.dumps({"version": self.VERSION, "folders": self._entries}).encode("utf-8"))
+        self._dirty = False
+
+    def clear(self):
+        self._entries = {}
+        self._dirty = True
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _key(folder_path):
+        return os.path.normcase(os.path.abspath(folder_path))
+
+    def evaluate(self, root_folder, folder_name, folder_path):
+        """Return (key, entry, status) for one folder; safe to run on a pool.
+
+        status is "hit" (stat unchanged), "rehash" (contents unchanged) or
+        "parsed". The cache itself is only updated by ``store``.
+        """
+        key = self._key(folder_path)
+        cached = self._entries.get(key)
+        work_items = os.path.join(folder_path, WORK_ITEMS_FILE)
+        try:
+            st = os.stat(work_items)
+            stamp = [st.st_mtime_ns, st.st_size]
+        except FileNotFoundError:
+            stamp = None
+        except OSError:
+            stamp = _UNREADABLE
+
+        if (cached is not None and stamp != _UNREADABLE and cached.get("name") == folder_name
+                and cached.get("stamp") == stamp):
+            return key, cached, "hit"
+
+        digest = None
+        raw = None
+        if stamp:
+            try:
+                with open(work_items, "rb") as handle:
+                    raw = handle.read()
+                digest = hashlib.sha1(raw).hexdigest()
+            except OSError:
+                pass
+
+        if cached is not None and digest is not None and cached.get("sha1") == digest:
+            payload, error_code = cached.get("payload"), cached.get("error")
+            status = "rehash"
+        else:
+            if stamp is None:
+                payload, error_code = None, "missing_work_items"
+            elif raw is None:
+                payload, error_code = None, "invalid_json"
+            else:
+                payload, error_code = _parse_payload(raw)
+            status = "parsed"
+
+        findings = check_practice_payload(root_folder, folder_name, payload, error_code)
+        entry = {
+            "root": root_folder,
+            "name": folder_name,
+            "stamp": stamp,
+            "sha1": digest,
+            "payload": payload,
+            "error": error_code,
+            "findings": [[f.severity, f.code, f.message] for f in findings],
+        }
+        return key, entry, status
+
+    def store(self, key, entry):
+        if self._entries.get(key) is not entry:
+            self._entries[key] = entry
+            self._dirty = True
+
+    def _root_key(self, entry):
+        return self._key(entry["root"]) if entry.get("root") else None
+
+    def _forget(self, stale):
+        for key in stale:
+            del self._entries[key]
+        if stale:
+            self._dirty = True
+        return len(stale)
+
+    def prune(self, root_folder, live_keys):
+        """Forget folders under root_folder that no longer exist; returns count."""
+        root = self._key(root_folder)
+        return self._forget([key for key, entry in self._entries.items()
+                             if self._root_key(entry) == root and key not in live_keys])
+
+    def prune_roots(self, root_folders):
+        """Forget every folder whose root is not one of root_folders; returns count."""
+        roots = {self._key(root_folder) for root_folder in root_folders}
+        return self._forget([key for key, entry in self._entries.items() if self._root_key(entry) not in roots])
+
+
+def _entry_findings(root_folder, folder_name, entry):
+    return [Finding(severity, root_folder, folder_name, code, message)
+            for severity, code, message in entry["findings"]]
+
+
+def _sort_key(finding):
+    return (finding.root, finding.folder == PRACTICE_COUNT_DIR, finding.folder, finding.code)
+
+
+def validate_roots(root_folders, registry=None, max_workers=None, cache=None):
+    """Validate every root and return a sorted list of Finding tuples.
+
+    With a ValidationCache, unchanged folders reuse their stored findings and
+    ``cache.stats`` reports how many were reused, reparsed and pruned.
+    """
+    registry = registry or PracticeCountRegistry()
+    findings = []
+    folders_by_root = {}
+
+    for root_folder in root_folders:
+        if not os.path.isdir(root_folder):
+            findings.append(Finding(INFO, root_folder, "", "missing_root", f"Skipped missing folder: {root_folder}"))
+            continue
+        folders_by_root[root_folder] = list_practice_folders(root_folder)
+
+    jobs = [
+        (root_folder, name, path)
+        for root_folder, folders in folders_by_root.items()
+        for name, path in folders.items()
+    ]
+    if cache is not None:
+        stats = {"hit": 0, "rehash": 0, "parsed": 0, "pruned": 0}
+        live_keys = set()
+        if jobs:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                results = list(pool.map(lambda job: cache.evaluate(*job), jobs))
+            for (root_folder, name, _path), (key, entry, status) in zip(jobs, results):
+                cache.store(key, entry)
+                live_keys.add(key)
+                stats[status] += 1
+                findings.extend(_entry_findings(root_folder, name, entry))
+        for root_folder in folders_by_root:
+            stats["pruned"] += cache.prune(root_folder, live_keys)
+        # Configured roots that are offline right now keep their entries
+        stats["pruned"] += cache.prune_roots(root_folders)
+        cache.stats = stats
+        try:
+            cache.save()
+        except OSError:
+            pass
+    elif jobs:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for result in pool.map(lambda job: check_practice_folder(*job), jobs):
+                findings.extend(result)
+
+    for root_folder, folders in folders_by_root.items():
+        findings.extend(check_practice_count(root_folder, folders, registry))
+
+    findings.sort(key=_sort_key)
+    return findings
+
+
+def format_findings(findings, root_folders):
+    """Render findings as the grouped text the Validate ODS dialog shows."""
+    sections = []
+    for root_folder in root_folders:
+        lines = [f"{f.severity.upper()}: {f.message}" for f in findings
+                 if f.root == root_folder and f.code != "missing_root"]
+        skipped = [f.message for f in findings if f.root == root_folder and f.code == "missing_root"]
+        sections.extend(skipped)
+        if lines:
+            sections.append(f"[{os.path.basename(root_folder)}]\n" + "\n".join(lines))
+    return "\n\n".join(sections) if sections else "No issues detected."
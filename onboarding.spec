@@ -5,7 +5,7 @@ a = Analysis(
     ['onboarding.py'],
     pathex=[],
     binaries=[],
-    datas=[('check-ods-mismatch.ps1', '.')],
+    datas=[],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
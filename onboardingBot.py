@@ -1,7 +1,21 @@
+import asyncio
+
 from docman.DocmanBaseBot import DocmanBaseBot
-from docman.jobs.OnboardingJob import OnboardingJob
+from docman.jobs.OnboardingJob import OnboardingJob, make_job_payload
+from playwright.async_api import async_playwright
 from robocorp import workitems
 
+from adaptiveWait import LatencyTracker
+from browserPool import BrowserPool, pool_settings
+from concurrentOnboarding import (
+    DEFAULT_CONCURRENCY,
+    DOCMAN_URL,
+    PracticeCredentials,
+    onboard_practice,
+    run_concurrent,
+)
+from docmanNavigation import NavigationCache
+
 
 class OnboardingBot(DocmanBaseBot):
     def __init__(self):
@@ -20,31 +34,100 @@ class OnboardingBot(DocmanBaseBot):
         self._configure_job(self._onboarding_job)
 
         # Rebuild Mailroom-like job structure
-        mailroom_job = {
-            "job": {
-                "practice_id": practice_id,
-                "parameters": {
-                    "user_groups": [
-                        "BetterLetter Filing",
-                        "BetterLetter Admin",
-                        "BetterLetter GPs",
-                        "BetterLetter Meds Management",
-                        "BetterLetter Safeguarding",
-                        "BetterLetter Audit"
-                    ],
-                    "view_groups": [
-                        "BetterLetter Filing",
-                        "BetterLetter Rejected",
-                        "BetterLetter Processing",
-                        "BetterLetter Input"
-                    ]
-                }
-            },
-            "attempt_id": job.payload.get("attempt_id", "manual")
-        }
+        mailroom_job = make_job_payload(practice_id, job.payload.get("attempt_id", "manual"))
 
         success, error_message, pause_job = self._onboarding_job.process(mailroom_job)
         if not success:
             raise Exception(f"Onboarding failed: {error_message}")
 
         self._logger.info("Onboarding attended completed successfully.")
+
+    def run_wave(self):
+        """Onboard every practice in the current work item concurrently.
+
+        Payload: {"practices": [{"ods_code", "username", "password"}, ...],
+        optional "concurrency", "docman_url", "headless", "attempt_id", "browsers",
+        "max_jobs_per_browser" and "max_rss_mb"}.
+        Each practice's outcome is written as its own output work item.
+        """
+        self._logger.info("Starting concurrent onboarding wave.")
+        item = workitems.inputs.current
+        payload = item.payload
+        practices = [
+            PracticeCredentials(str(entry["ods_code"]).strip().upper(), entry["username"], entry["password"])
+            for entry in payload["practices"]
+        ]
+        settings = pool_settings()
+
+        report = run_concurrent(
+            practices,
+            base_url=payload.get("docman_url", DOCMAN_URL),
+            concurrency=int(payload.get("concurrency", DEFAULT_CONCURRENCY)),
+            headless=payload.get("headless", True),
+            logger=self._logger,
+            attempt_id=payload.get("attempt_id", "wave"),
+            browsers=int(payload.get("browsers", settings["size"])),
+            max_jobs_per_browser=int(payload.get("max_jobs_per_browser", settings["max_jobs"])),
+            max_rss_mb=payload.get("max_rss_mb", settings["max_rss_mb"]),
+        )
+        for result in report.results:
+            workitems.outputs.create(payload={
+                "ods_code": result.ods,
+                "success": result.success,
+                "error": result.error,
+                "seconds": round(result.seconds, 1),
+            })
+        for line in report.lines():
+            self._logger.info(line)
+        if report.failed:
+            raise Exception(
+                f"Onboarding failed for {len(report.failed)} practice(s): "
+                + ", ".join(result.ods for result in report.failed)
+            )
+
+    def run_queue(self):
+        """Onboard every input work item in turn on a pool of warm browsers.
+
+        run_attended sets up a new browser for each item; here the browsers stay
+        up across items and each practice gets a fresh context. Item payload:
+        {"ods_code", "username", "password"}, optional "docman_url" and
+        "attempt_id". Pool size and recycling come from browserPool.pool_settings().
+        """
+        self._logger.info("Starting pooled onboarding queue.")
+        stats = asyncio.run(self._drain_queue())
+        for line in stats.lines():
+            self._logger.info(line)
+
+    async def _drain_queue(self):
+        nav_cache = NavigationCache()
+        latency = LatencyTracker()
+        async with async_playwright() as playwright:
+            pool = BrowserPool(playwright, headless=True, logger=self._logger, **pool_settings())
+            await pool.start()
+            try:
+                # Items are reserved one at a time, so they are onboarded one after another
+                for item in workitems.inputs:
+                    payload = item.payload if isinstance(item.payload, dict) else {}
+                    ods = str(payload.get("ods_code", "")).strip().upper() or "unknown"
+                    try:
+                        # Parsed inside the try, so one malformed item fails on its own
+                        practice = PracticeCredentials(
+                            str(payload["ods_code"]).strip().upper(), payload["username"], payload["password"]
+                        )
+                        success, error = await onboard_practice(
+                            pool, practice, payload.get("docman_url", DOCMAN_URL), self._logger,
+                            payload.get("attempt_id", "manual"), nav_cache=nav_cache, latency=latency,
+                        )
+                    except KeyError as e:
+                        success, error = False, f"Work item payload is missing {e}"
+                    except Exception as e:
+                        success, error = False, f"{type(e).__name__}: {e}"
+                    workitems.outputs.create(payload={"ods_code": ods, "success": success, "error": error})
+                    if success:
+                        item.done()
+                    else:
+                        self._logger.error(f"Onboarding failed for {ods}: {error}")
+                        item.fail(workitems.ExceptionType.APPLICATION, message=error)
+            finally:
+                await pool.close()
+        return pool.stats
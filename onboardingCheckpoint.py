@@ -0,0 +1,126 @@
+"""Per-practice checkpoints and retry policies for onboarding runs.
+
+A run for one ODS code and attempt_id keeps its progress in
+``<checkpoint dir>/<ODS>/<attempt_id>.json``. The checkpoint dir defaults to
+output/checkpoints and can be overridden with DOCMAN_CHECKPOINT_DIR::
+
+    {"ods": "A12345", "attempt": "manual", "updated": 1767604442.1,
+     "steps": {"folders": {"done": true, "items": {"betterletter: input": "skipped", ...}},
+               "views": {"done": false, "items": {"betterletter filing": "created"}}}}
+
+The file is rewritten atomically after every item, so a crash loses at most
+the item in flight. A retry with the same attempt_id skips finished steps
+and items and carries on from the first incomplete one. The file is
+removed once the whole run succeeds. Checkpoints older than MAX_AGE_SECONDS
+are ignored.
+
+RetryPolicy sets how often an item is retried within a step, and how long to
+back off between tries.
+"""
+
+import json
+import os
+import random
+import time
+from collections import namedtuple
+
+from docmanInventory import normalize_name
+from work_items_store import atomic_write_json
+
+CHECKPOINT_DIR_ENV = "DOCMAN_CHECKPOINT_DIR"
+DEFAULT_CHECKPOINT_DIR = os.path.join("output", "checkpoints")
+MAX_AGE_SECONDS = 7 * 24 * 3600
+
+RetryPolicy = namedtuple("RetryPolicy", ["attempts", "base_delay", "max_delay"])
+
+DEFAULT_POLICIES = {
+    "folders": RetryPolicy(3, 1.0, 8.0),
+    "user_groups": RetryPolicy(3, 1.0, 8.0),
+    "views": RetryPolicy(3, 2.0, 15.0),
+    "search_settings": RetryPolicy(2, 1.0, 4.0),
+}
+FALLBACK_POLICY = RetryPolicy(2, 1.0, 8.0)
+
+
+def backoff_seconds(policy, attempt):
+    """Delay before try ``attempt + 1``: exponential, capped, with jitter so a wave does not retry in lockstep."""
+    delay = min(policy.max_delay, policy.base_delay * 2 ** (attempt - 1))
+    return delay * (0.5 + random.random() / 2)
+
+
+def checkpoint_dir(default=DEFAULT_CHECKPOINT_DIR):
+    return os.environ.get(CHECKPOINT_DIR_ENV) or default
+
+
+def _safe(part):
+    return "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in str(part)) or "_"
+
+
+class Checkpoint:
+    def __init__(self, path, ods, attempt_id, data=None):
+        self.path = path
+        self.ods = ods
+        self.attempt_id = attempt_id
+        self._steps = (data or {}).get("steps", {})
+
+    @property
+    def resumed(self):
+        """True when this attempt already made progress before."""
+        return any(step.get("items") or step.get("done") for step in self._steps.values())
+
+    def step_done(self, step):
+        return bool(self._steps.get(step, {}).get("done"))
+
+    def done_items(self, step):
+        return set(self._steps.get(step, {}).get("items", {}))
+
+    def item_done(self, step, name):
+        return normalize_name(name) in self._steps.get(step, {}).get("items", {})
+
+    def mark_item(self, step, name, outcome):
+        self._steps.setdefault(step, {"done": False, "items": {}})["items"][normalize_name(name)] = outcome
+        self._save()
+
+    def mark_step(self, step):
+        self._steps.setdefault(step, {"done": False, "items": {}})["done"] = True
+        self._save()
+
+    def _save(self):
+        if self.path is None:
+            return  # in-memory only (steps run outside process())
+        try:
+            atomic_write_json(self.path, {
+                "ods": self.ods, "attempt": self.attempt_id, "updated": time.time(), "steps": self._steps,
+            })
+        except OSError:
+            pass  # losing a checkpoint only costs a longer retry
+
+    def complete(self):
+        if self.path is None:
+            return
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+class CheckpointStore:
+    def __init__(self, directory=None, max_age=MAX_AGE_SECONDS):
+        self.directory = directory or checkpoint_dir()
+        self.max_age = max_age
+
+    def path_for(self, ods, attempt_id):
+        return os.path.join(self.directory, _safe(str(ods).strip().upper()), _safe(attempt_id) + ".json")
+
+    def load(self, ods, attempt_id):
+        """The checkpoint for this attempt, or a fresh one."""
+        path = self.path_for(ods, attempt_id)
+        data = None
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+            if not isinstance(data, dict) or time.time() - float(data.get("updated", 0)) > self.max_age:
+                data = None
+        except (OSError, ValueError, TypeError):
+            data = None
+        return Checkpoint(path, str(ods).strip().upper(), str(attempt_id), data)
@@ -0,0 +1,465 @@
+"""Docman onboarding steps, written once against ``playwright.async_api``.
+
+OnboardingEngine holds the steps: folders, user groups, views, then search
+settings. It awaits page operations, so many practices can share one event
+loop, with one browser context each (see concurrentOnboarding). Memory then
+grows with browser contexts, not with threads and browsers.
+
+The sync OnboardingJob runs the same coroutines on a sync Playwright page.
+SyncPage makes the sync page awaitable: each call runs to completion before
+its "await" returns. ``run_sync`` then drives the coroutine without an event
+loop, because nothing in it ever suspends. For this to work, the engine must
+only await page, locator and helper calls. It must not await
+``asyncio.sleep`` or ``asyncio.gather``. When a step needs to wait for one
+of several outcomes, it uses a comma-separated selector.
+
+Progress is checkpointed per ODS code and attempt_id (onboardingCheckpoint).
+A retried job resumes at the first item that has not finished. Each item is
+retried under its step's RetryPolicy before it counts as failed.
+"""
+
+import functools
+import inspect
+import json
+import time
+import traceback
+
+from adaptiveWait import LatencyTracker, race
+from docmanInventory import (
+    CREATED,
+    FAILED,
+    FOLDER_LIST,
+    SKIPPED,
+    USER_GROUP_LIST,
+    VIEW_LIST,
+    OnboardingReport,
+    existing_names,
+    normalize_name,
+    plan,
+)
+from docmanNavigation import FOLDERS_TOP_LEVEL, SEARCH_SETTINGS, USER_GROUPS, VIEWS, Navigator
+from fieldInput import FieldInput
+from onboardingCheckpoint import (
+    DEFAULT_POLICIES,
+    FALLBACK_POLICY,
+    Checkpoint,
+    CheckpointStore,
+    backoff_seconds,
+)
+from onboardingTrace import ERROR, NullTracer, TracedPage, Tracer
+
+DEFAULT_USER_GROUPS = [
+    "BetterLetter Filing",
+    "BetterLetter Admin",
+    "BetterLetter GPs",
+    "BetterLetter Meds Management",
+    "BetterLetter Safeguarding",
+    "BetterLetter Audit",
+]
+DEFAULT_VIEW_GROUPS = [
+    "BetterLetter Filing",
+    "BetterLetter Rejected",
+    "BetterLetter Processing",
+    "BetterLetter Input",
+]
+
+DUPLICATE_FOLDER_MODAL = ':text("A folder with the name")'
+# Old fixed wait for the duplicate modal; now only the upper bound of the race
+FOLDER_SAVE_TIMEOUT_MS = 3000
+
+ONBOARDING_FOLDERS = [
+    "BetterLetter: Filing",
+    "BetterLetter: Rejected",
+    "BetterLetter: Processing",
+    "BetterLetter: Input",
+]
+
+
+def make_job_payload(practice_id, attempt_id="manual", user_groups=None, view_groups=None):
+    """Mailroom-style job structure the onboarding steps read from."""
+    return {
+        "job": {
+            "practice_id": practice_id,
+            "parameters": {
+                "user_groups": list(DEFAULT_USER_GROUPS if user_groups is None else user_groups),
+                "view_groups": list(DEFAULT_VIEW_GROUPS if view_groups is None else view_groups),
+            },
+        },
+        "attempt_id": attempt_id,
+    }
+
+
+# ── Sync bridge ──────────────────────────────────────────────────────────────
+
+# Calls that return immediately in the async API as well (no await needed)
+_IMMEDIATE = {"locator", "frame_locator", "get_by_text", "get_by_role", "first", "last", "nth", "filter"}
+
+
+class SyncPage:
+    """Awaitable view of a sync Playwright page or locator."""
+
+    def __init__(self, target):
+        self._target = target
+
+    @property
+    def wrapped(self):
+        return self._target
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if name in _IMMEDIATE:
+            if not callable(attr):
+                return SyncPage(attr)  # Locator.first / .last are properties
+            return lambda *args, **kwargs: SyncPage(attr(*args, **kwargs))
+        if not callable(attr):
+            return attr
+
+        async def call(*args, **kwargs):
+            return attr(*args, **kwargs)
+
+        return call
+
+
+def run_sync(coro):
+    """Run a coroutine that never suspends (engine steps on a SyncPage) and return its result."""
+    try:
+        coro.send(None)
+    except StopIteration as done:
+        return done.value
+    coro.close()
+    raise RuntimeError("onboarding coroutine suspended; sync pages must be wrapped in SyncPage")
+
+
+# ── Engine ───────────────────────────────────────────────────────────────────
+
+def _step(name):
+    """Record the decorated step as a "step" span."""
+    def decorate(method):
+        @functools.wraps(method)
+        async def run(self, *args, **kwargs):
+            with self.tracer.span("step", name):
+                return await method(self, *args, **kwargs)
+        return run
+    return decorate
+
+
+class OnboardingEngine:
+    def __init__(self, page, logger, nav_cache=None, checkpoints=None, policies=None, latency=None,
+                 select2=None):
+        """``nav_cache``: a docmanNavigation.NavigationCache to share between engines.
+
+        ``checkpoints``: an onboardingCheckpoint.CheckpointStore, ``policies``: step -> RetryPolicy.
+        ``latency``: an adaptiveWait.LatencyTracker to share between engines.
+        ``select2``: the job's own ``_select_in_select2(container, results_class, text)``, sync or async.
+        """
+        self.raw_page = page
+        self.tracer = NullTracer()
+        # Every page call goes through the tracer; process() swaps in a real one per run
+        self.page = TracedPage(page, self)
+        self._logger = logger
+        self.latency = latency if latency is not None else LatencyTracker()
+        self._field_input = FieldInput(self.page, logger, latency=self.latency)
+        self.navigator = Navigator(self.page, logger, nav_cache, self.latency)
+        self.checkpoints = checkpoints if checkpoints is not None else CheckpointStore()
+        self.checkpoint = Checkpoint(None, "", "")
+        self.policies = dict(DEFAULT_POLICIES, **(policies or {}))
+        self._select2 = select2
+        self._unlisted = set()  # InventoryLists the current pages do not show
+        self.report = None
+
+    async def process(self, job):
+        """Run every step; returns (success, error_message, pause_job) like DocmanBaseJob."""
+        try:
+            ods_code = job["job"]["practice_id"]
+            attempt_id = job.get("attempt_id", "manual")
+            self.tracer = Tracer(ods_code, attempt_id)
+            self.checkpoint = self.checkpoints.load(ods_code, attempt_id)
+            self.navigator.start(ods_code)
+            with self.tracer.span("job", "onboarding", resumed=self.checkpoint.resumed) as run_span:
+                self._logger.info(f"Starting Docman onboarding for ODS code: {ods_code}")
+                if self.checkpoint.resumed:
+                    self._logger.info(f"Resuming attempt {attempt_id} from its checkpoint")
+                self.report = OnboardingReport(ods_code)
+
+                steps = [
+                    ("folders", self.create_folders, ()),
+                    ("user_groups", self.create_user_groups, (job["job"]["parameters"]["user_groups"],)),
+                    ("views", self.create_views, (job["job"]["parameters"]["view_groups"],)),
+                    ("search_settings", self.configure_search_settings, ()),
+                ]
+                for step, run, args in steps:
+                    if self.checkpoint.step_done(step):
+                        self._logger.info(f"Skipping {step}: completed in an earlier try of this attempt")
+                        continue
+                    await run(*args)
+
+                for line in self.report.lines():
+                    self._logger.info(line)
+                failures = self.report.failures
+                if failures:
+                    run_span.outcome, run_span.error = ERROR, f"{len(failures)} item(s) failed"
+                    return False, f"{len(failures)} item(s) failed: " + "; ".join(failures), False
+
+            self.checkpoint.complete()
+            self._logger.info(f"Docman onboarding complete for ODS code: {ods_code}")
+            self._logger.info(f"Waited {self.tracer.wait_ms / 1000:.1f}s of {run_span.ms / 1000:.1f}s")
+            return True, None, False
+
+        except Exception as e:
+            self._logger.error(f"Error during Docman onboarding: {e}")
+            self._logger.error(traceback.format_exc())
+            return False, str(e), False
+        finally:
+            self.tracer.close()
+            self.tracer = NullTracer()
+
+    async def _goto(self, route):
+        with self.tracer.span("nav", route.name) as span:
+            deep_links = self.navigator.deep_links
+            await self.navigator.goto(route)
+            span.attrs["via"] = "deep link" if self.navigator.deep_links > deep_links else "clicks"
+
+    async def _enter(self, selector, value, confirm_selector=None):
+        with self.tracer.span("input", "enter", selector) as span:
+            attempts = len(self._field_input.timings)
+            try:
+                span.attrs["strategy"] = await self._field_input.enter(selector, value, confirm_selector)
+            finally:
+                span.retries = max(0, len(self._field_input.timings) - attempts - 1)
+
+    async def _race(self, key, outcomes, default_ms):
+        """adaptiveWait.race with a learned timeout; returns the outcome name or None."""
+        timeout_ms = self.latency.timeout_ms(key, default_ms)
+        with self.tracer.span("wait", key, timeout_ms=timeout_ms) as span:
+            start = time.perf_counter()
+            outcome = await race(self.page, outcomes, timeout_ms)
+            if outcome:
+                self.latency.record(key, (time.perf_counter() - start) * 1000)
+            else:
+                self.latency.record_timeout(key)
+            span.attrs["result"] = outcome or "timeout"
+        return outcome
+
+    def _step_report(self, step):
+        if self.report is None:
+            self.report = OnboardingReport("unknown")
+        return self.report.step(step)
+
+    async def _with_retries(self, step, route, name, action, landed=None):
+        """Run ``action()`` (returns CREATED/SKIPPED) under the step's RetryPolicy.
+
+        After every failed try, the last one included, it reopens ``route`` so
+        no half-filled dialog or modal is left for the next item, and backs off
+        before trying again. If ``landed()`` says the item exists after all
+        (the failed try got through before timing out), that counts as created.
+        Returns (outcome, error, tries).
+        """
+        policy = self.policies.get(step, FALLBACK_POLICY)
+        for attempt in range(1, policy.attempts + 1):
+            try:
+                return await action(), None, attempt
+            except Exception as e:
+                error = e
+            if attempt < policy.attempts:
+                delay = backoff_seconds(policy, attempt)
+                self._logger.warning(
+                    f"'{name}' failed ({error}); retry {attempt}/{policy.attempts - 1} in {delay:.1f}s"
+                )
+                # A Playwright wait rather than asyncio.sleep, so the sync wrapper can run it too
+                await self.page.wait_for_timeout(delay * 1000)
+            await self._goto(route)
+            if landed is not None and await landed():
+                return CREATED, None, attempt
+        return FAILED, error, policy.attempts
+
+    async def _create_items(self, step, label, kind, route, names, inventory, create_one):
+        """Shared loop for folders, groups and views: resume, diff, then create what is missing."""
+        await self._goto(route)
+        report = self._step_report(label)
+
+        todo = [name for name in names if not self.checkpoint.item_done(step, name)]
+        if len(todo) < len(names):
+            self._logger.info(f"{label}: {len(names) - len(todo)} already done in an earlier try")
+            for name in names:
+                if name not in todo:
+                    report.record(SKIPPED, name)
+
+        existing = await existing_names(self.page, inventory)
+        self._unlisted.discard(inventory)
+        if existing is None:
+            self._unlisted.add(inventory)
+            report.inventory_unavailable = True
+            self._logger.warning(
+                f"{label}: could not find the list of existing {kind.replace('_', ' ')}s on the page "
+                "(inventory unavailable); nothing can be skipped or confirmed from it"
+            )
+        missing, present = plan(todo, existing)
+        for name in present:
+            report.record(SKIPPED, name)
+            self.checkpoint.mark_item(step, name, SKIPPED)
+        if present:
+            self._logger.info(f"{label} already present: {', '.join(present)}")
+
+        for name in missing:
+            async def landed(name=name):
+                listed = await existing_names(self.page, inventory)
+                return listed is not None and normalize_name(name) in listed
+
+            with self.tracer.span("item", kind, item=name) as span:
+                outcome, error, tries = await self._with_retries(
+                    step, route, name, lambda name=name: create_one(name), landed,
+                )
+                span.retries = tries - 1
+                if outcome != CREATED:
+                    span.outcome = outcome
+                    span.error = str(error) if error else None
+            if outcome == FAILED:
+                self._logger.warning(f"Could not create {kind.replace('_', ' ')} '{name}': {error}")
+                report.record(FAILED, name, str(error))
+                continue
+            if outcome == CREATED:
+                self._logger.info(f"Created {kind.replace('_', ' ')}: {name}")
+            report.record(outcome, name)
+            self.checkpoint.mark_item(step, name, outcome)
+
+        if not report.failed:
+            self.checkpoint.mark_step(step)
+
+    @_step("folders")
+    async def create_folders(self, folders=ONBOARDING_FOLDERS):
+        self._logger.info("Creating folders...")
+        await self._create_items(
+            "folders", "Folders", "folder", FOLDERS_TOP_LEVEL, folders, FOLDER_LIST, self.create_folder,
+        )
+
+    async def create_folder(self, folder):
+        page = self.page
+        await page.click("a#addFolder")
+        # Verified by the confirm button enabling, so no fixed sleeps are needed
+        await self._enter("input#txtNewFolderName", folder, confirm_selector="a#addFolderConfirm")
+        await page.click("a#addFolderConfirm")
+
+        # Whichever comes first: the duplicate modal, or the folder showing up in the list.
+        # Without a folder list only the modal can answer; that wait has its own key, so its
+        # timeouts stay out of the folder_saved figures.
+        outcomes, key = {"duplicate": DUPLICATE_FOLDER_MODAL}, "folder_duplicate"
+        if FOLDER_LIST not in self._unlisted:
+            outcomes["listed"] = ", ".join(
+                f"{item}:text-is({json.dumps(folder)})" for item in FOLDER_LIST.items.split(", ")
+            )
+            key = "folder_saved"
+        outcome = await self._race(key, outcomes, FOLDER_SAVE_TIMEOUT_MS)
+        if outcome is None:
+            # One last look: the modal may be late. A save that cannot be confirmed is an error,
+            # so the step's retry policy reopens the page and tries again (a duplicate then skips).
+            if await page.is_visible(DUPLICATE_FOLDER_MODAL):
+                outcome = "duplicate"
+            else:
+                listed_names = await existing_names(page, FOLDER_LIST)
+                if listed_names is None:
+                    raise RuntimeError(f"Could not confirm folder '{folder}' was saved: no folder list on the page")
+                if normalize_name(folder) not in listed_names:
+                    raise RuntimeError(f"Folder '{folder}' did not appear after saving")
+        if outcome == "duplicate":
+            self._logger.warning(f"Duplicate detected: {folder} — clicking 'No'")
+            await page.click("text=No")
+            return SKIPPED
+        return CREATED
+
+    @_step("user_groups")
+    async def create_user_groups(self, groups_to_create):
+        self._logger.info("Creating user groups...")
+        await self._create_items(
+            "user_groups", "User groups", "user_group", USER_GROUPS, groups_to_create, USER_GROUP_LIST,
+            self.create_user_group,
+        )
+
+    async def create_user_group(self, group_name):
+        page = self.page
+        await page.click(selector="a:has-text('Create')")
+        await self._enter("input#group_name_input", group_name)
+        await page.click(selector="a:has-text('Confirm')")
+        return CREATED
+
+    @_step("views")
+    async def create_views(self, views_to_create):
+        self._logger.info("Creating views...")
+        await self._create_items(
+            "views", "Views", "view", VIEWS, views_to_create, VIEW_LIST, self.create_view,
+        )
+
+    async def create_view(self, view_name):
+        page = self.page
+        await page.click(selector="a:has-text('Create New View')")
+        await self._enter("input#view_name_input", view_name)
+        await page.fill(selector="input#available_to_input", value="Everyone")
+
+        await page.click(selector='//select[@id="sent_to_select"]')
+        await page.press(selector='//select[@id="sent_to_select"]', key="ArrowDown")
+        await page.press(selector='//select[@id="sent_to_select"]', key="Enter")
+
+        await page.click(selector='//input[@id="sent_to_group_select"]')
+        await page.fill(selector='//input[@id="sent_to_group_select"]', value=view_name)
+        await page.press(selector='//input[@id="sent_to_group_select"]', key="Enter")
+
+        await page.click(selector="button#confirm_create_view")
+        return CREATED
+
+    @_step("search_settings")
+    async def configure_search_settings(self):
+        self._logger.info("Configuring search settings...")
+        await self._goto(SEARCH_SETTINGS)
+        report = self._step_report("Search settings")
+
+        settings = [
+            ("search in", lambda: self.select_in_select2("div#s2id_dm-search-in", "select2-results", "patient")),
+            ("search using",
+             lambda: self.select_in_select2("div#s2id_dm-search-using", "select2-results", "Name, DOB or NHS")),
+            ("hide synthetic patients", self.hide_synthetic_patients),
+        ]
+        for name, apply in settings:
+            if self.checkpoint.item_done("search_settings", name):
+                report.record(SKIPPED, name)
+                continue
+
+            async def action(apply=apply):
+                await apply()
+                return CREATED
+
+            with self.tracer.span("item", "search_setting", item=name) as span:
+                outcome, error, tries = await self._with_retries("search_settings", SEARCH_SETTINGS, name, action)
+                span.retries = tries - 1
+                if outcome == FAILED:
+                    span.outcome, span.error = FAILED, str(error)
+            if outcome == FAILED:
+                self._logger.warning(f"Could not set {name}: {error}")
+                report.record(FAILED, name, str(error))
+                continue
+            report.record(outcome, name)
+            self.checkpoint.mark_item("search_settings", name, outcome)
+
+        if not report.failed:
+            self.checkpoint.mark_step("search_settings")
+
+    async def hide_synthetic_patients(self):
+        # The label toggles the box, so only click it while it is unticked (safe to retry)
+        if not await self.page.is_checked("#hide_synthetic_patients"):
+            await self.page.click(selector='label[for="hide_synthetic_patients"]')
+
+    async def select_in_select2(self, container_selector, results_class, text):
+        """Open a select2 picker and choose the result labelled exactly ``text``.
+
+        Uses the job's helper when one was given; this fallback serves the
+        async wave, where that sync helper cannot run.
+        """
+        if self._select2 is not None:
+            result = self._select2(container_selector, results_class, text)
+            if inspect.isawaitable(result):
+                await result
+            return
+        page = self.page
+        await page.click(container_selector)
+        # Exact text: has-text would also pick e.g. "patient list" for "patient"
+        option = f".{results_class} li:visible:text-is({json.dumps(text)})"
+        await page.wait_for_selector(option)
+        await page.click(option)
@@ -0,0 +1,288 @@
+"""Span tracing for onboarding runs, and a summary across runs.
+
+Every run writes one JSON line per span to
+``<trace dir>/<ODS>/<attempt_id>.jsonl``. The trace dir defaults to
+output/traces and can be overridden with DOCMAN_TRACE_DIR. A span looks like::
+
+    {"run": "20260105T091402-3f2a", "ods": "A12345", "attempt": "manual",
+     "id": 7, "parent": 3, "kind": "page", "name": "wait_for_selector",
+     "selector": "text=A folder with the name", "start": 1767604442.12,
+     "ms": 3001.4, "retries": 0, "outcome": "timeout", "error": "..."}
+
+Kinds, outermost first:
+
+* job:   the whole onboarding run
+* step:  folders, user_groups, views, search_settings
+* item:  one folder, group or view, with its name in ``item``
+* nav:   reaching a settings page, with ``via`` set to "deep link" or "clicks"
+* input: a FieldInput entry; ``retries`` counts the strategies that failed
+* wait:  an adaptive race (adaptiveWait), with its timeout and outcome
+* page:  each Playwright call (click, fill, wait_for_selector, goto, ...)
+
+The job span also carries ``wait_ms`` and ``work_ms``. wait_ms is time spent
+in explicit waits (wait spans and wait_* page calls, not counting nested
+ones), and work_ms is everything else.
+
+To summarise, run ``python onboardingTrace.py [dir-or-file ...]``. It prints
+count, p50, p95 and total per step and span, the slowest selectors, and the
+slowest runs.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import secrets
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+
+TRACE_DIR_ENV = "DOCMAN_TRACE_DIR"
+DEFAULT_TRACE_DIR = os.path.join("output", "traces")
+
+OK = "ok"
+ERROR = "error"
+TIMEOUT = "timeout"
+
+# Page and locator calls recorded as "page" spans
+TRACED_CALLS = {
+    "click", "fill", "press", "goto", "wait_for_selector", "wait_for_load_state",
+    "eval_on_selector_all", "evaluate", "input_value", "press_sequentially", "type",
+    "is_checked", "is_visible", "wait_for_timeout",
+}
+# Page calls that count as waiting rather than working
+WAIT_CALLS = {"wait_for_selector", "wait_for_timeout", "wait_for_load_state"}
+
+
+def trace_dir(default=DEFAULT_TRACE_DIR):
+    return os.environ.get(TRACE_DIR_ENV) or default
+
+
+def _safe(part):
+    return "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in str(part)) or "_"
+
+
+def _is_wait(span):
+    return span.kind == "wait" or (span.kind == "page" and span.name in WAIT_CALLS)
+
+
+def _outcome(exc):
+    return TIMEOUT if "Timeout" in type(exc).__name__ else ERROR
+
+
+class Span:
+    def __init__(self, span_id, parent, kind, name, selector=None, **attrs):
+        self.id = span_id
+        self.parent = parent
+        self.kind = kind
+        self.name = name
+        self.selector = selector
+        self.attrs = attrs
+        self.retries = 0
+        self.outcome = OK
+        self.error = None
+        self.start = time.time()
+        self._t0 = time.perf_counter()
+        self.ms = None
+
+
+class Tracer:
+    def __init__(self, ods, attempt_id, directory=None):
+        self.ods = str(ods).strip().upper()
+        self.attempt_id = str(attempt_id)
+        self.path = os.path.join(directory or trace_dir(), _safe(self.ods), _safe(self.attempt_id) + ".jsonl")
+        self.run = f"{datetime.now():%Y%m%dT%H%M%S}-{secrets.token_hex(2)}"
+        self._ids = itertools.count(1)
+        self._stack = []
+        self._handle = None
+        self.wait_ms = 0.0
+
+    @contextmanager
+    def span(self, kind, name, selector=None, **attrs):
+        """Time the block; an exception marks the span error/timeout and propagates."""
+        span = Span(next(self._ids), self._stack[-1].id if self._stack else None, kind, name, selector, **attrs)
+        self._stack.append(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.outcome = _outcome(e)
+            span.error = str(e).splitlines()[0][:300] if str(e) else type(e).__name__
+            raise
+        finally:
+            self._stack.pop()
+            span.ms = (time.perf_counter() - span._t0) * 1000
+            if _is_wait(span) and not any(_is_wait(outer) for outer in self._stack):
+                self.wait_ms += span.ms
+            if span.kind == "job":
+                span.attrs["wait_ms"] = round(self.wait_ms, 1)
+                span.attrs["work_ms"] = round(span.ms - self.wait_ms, 1)
+            self._write(span)
+
+    def _write(self, span):
+        record = {
+            "run": self.run, "ods": self.ods, "attempt": self.attempt_id,
+            "id": span.id, "parent": span.parent, "kind": span.kind, "name": span.name,
+            "selector": span.selector, "start": round(span.start, 3), "ms": round(span.ms, 1),
+            "retries": span.retries, "outcome": span.outcome, "error": span.error,
+        }
+        record.update(span.attrs)
+        try:
+            if self._handle is None:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                self._handle = open(self.path, "a", encoding="utf-8")
+            self._handle.write(json.dumps(record) + "\n")
+        except OSError:
+            pass  # tracing must never break a run
+
+    def close(self):
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+
+class NullTracer:
+    """Stands in until a run knows its ODS code and attempt."""
+
+    wait_ms = 0.0
+
+    @contextmanager
+    def span(self, kind, name, selector=None, **attrs):
+        yield Span(0, None, kind, name, selector, **attrs)
+
+    def close(self):
+        pass
+
+
+class TracedPage:
+    """Async page or locator proxy that records a "page" span for every TRACED_CALLS call."""
+
+    def __init__(self, target, holder, selector=None):
+        # holder.tracer is read on every call, so the engine can swap tracers per run
+        self._target = target
+        self._holder = holder
+        self._selector = selector
+
+    @property
+    def wrapped(self):
+        return self._target
+
+    def locator(self, selector, **kwargs):
+        return TracedPage(self._target.locator(selector, **kwargs), self._holder, selector)
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if name not in TRACED_CALLS or not callable(attr):
+            return attr
+
+        async def call(*args, **kwargs):
+            attrs = {}
+            if name == "goto":
+                selector = None
+                attrs["url"] = args[0] if args else kwargs.get("url")
+            elif name in ("evaluate", "wait_for_load_state"):
+                selector = self._selector
+            else:
+                selector = self._selector or kwargs.get("selector") or (args[0] if args else None)
+            with self._holder.tracer.span("page", name, selector, **attrs):
+                return await attr(*args, **kwargs)
+
+        return call
+
+
+# ── Summary ──────────────────────────────────────────────────────────────────
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def iter_spans(paths):
+    for path in paths:
+        files = []
+        if not os.path.exists(path):
+            continue
+        if os.path.isdir(path):
+            for root, _dirs, names in os.walk(path):
+                files.extend(os.path.join(root, name) for name in names if name.endswith(".jsonl"))
+        else:
+            files.append(path)
+        for name in sorted(files):
+            with open(name, "r", encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        span = json.loads(line)
+                    except ValueError:
+                        continue
+                    if isinstance(span, dict) and "ms" in span:
+                        yield span
+
+
+class TraceSummary:
+    def __init__(self, spans, top=10):
+        self.top = top
+        self.by_name = defaultdict(list)
+        self.by_selector = defaultdict(list)
+        self.failures = defaultdict(int)
+        self.runs = {}
+        self.wait_shares = []
+        for span in spans:
+            key = (span["kind"], span["name"])
+            self.by_name[key].append(span["ms"])
+            if span["outcome"] != OK:
+                self.failures[key] += 1
+            if span["kind"] == "page" and span.get("selector"):
+                self.by_selector[(span["name"], span["selector"])].append(span["ms"])
+            if span["kind"] == "job":
+                self.runs[(span["ods"], span["attempt"], span["run"])] = (span["ms"], span["outcome"])
+                if span.get("wait_ms") is not None and span["ms"]:
+                    self.wait_shares.append(span["wait_ms"] / span["ms"])
+
+    def lines(self):
+        lines = [f"{len(self.runs)} run(s)"]
+        if self.wait_shares:
+            lines.append(
+                f"Waiting: p50 {percentile(self.wait_shares, 50):.0%} / p95 {percentile(self.wait_shares, 95):.0%} "
+                "of each run's time (the rest is work)"
+            )
+        lines += ["", f"{'kind':<7}{'span':<24}{'count':>7}{'p50 ms':>10}"
+                 f"{'p95 ms':>10}{'total s':>10}{'not ok':>8}"]
+        kinds = ("job", "step", "nav", "item", "input", "wait", "page")
+        for key in sorted(self.by_name, key=lambda k: (kinds.index(k[0]) if k[0] in kinds else 99, k[1])):
+            values = self.by_name[key]
+            lines.append(
+                f"{key[0]:<7}{key[1][:23]:<24}{len(values):>7}{percentile(values, 50):>10.0f}"
+                f"{percentile(values, 95):>10.0f}{sum(values) / 1000:>10.1f}{self.failures[key]:>8}"
+            )
+        lines += ["", f"Slowest selectors (by p95, top {self.top}):"]
+        ranked = sorted(self.by_selector.items(), key=lambda item: percentile(item[1], 95), reverse=True)
+        for (call, selector), values in ranked[:self.top]:
+            lines.append(
+                f"  {percentile(values, 95):>8.0f} ms p95 {max(values):>8.0f} ms max  x{len(values):<5} "
+                f"{call} {selector}"
+            )
+        lines += ["", f"Slowest runs (top {self.top}):"]
+        for (ods, attempt, run), (ms, outcome) in sorted(self.runs.items(), key=lambda item: -item[1][0])[:self.top]:
+            lines.append(f"  {ms / 1000:>8.1f} s  {ods} {attempt} {run} {outcome}")
+        return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarise onboarding span traces.")
+    parser.add_argument("paths", nargs="*", help=f"trace files or directories (default: {trace_dir()})")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+    summary = TraceSummary(iter_spans(args.paths or [trace_dir()]), args.top)
+    if not summary.by_name:
+        print("No spans found.")
+        return 1
+    for line in summary.lines():
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
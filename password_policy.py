@@ -0,0 +1,219 @@
+"""Password policies shared by practice-admin and the Docman password reset.
+
+A policy is a set of disjoint character classes, some of which must appear at
+least once. Passwords are drawn uniformly from *every* string that satisfies
+the policy, with no generate-and-reject loop: first the number of characters
+taken from each class is sampled, weighted by how many valid passwords have
+that make-up; then the classes are laid out in a uniformly random order, and
+each position gets a uniform character from its class.
+
+All randomness comes from ``os.urandom`` (the source behind ``secrets``). Each
+``generate_many`` call takes it in one bulk read, topped up only in the rare
+case that read runs short.
+"""
+
+import math
+import os
+import string
+from collections import namedtuple
+from functools import lru_cache
+
+CharClass = namedtuple("CharClass", ["chars", "required"])
+PasswordPolicy = namedtuple("PasswordPolicy", ["name", "length", "classes"])
+
+UPPER = string.ascii_uppercase
+LOWER = string.ascii_lowercase
+DIGITS = string.digits
+DOCMAN_SYMBOLS = "!@#$%^&*()"
+
+# EMIS resets: letters and digits, at least one uppercase letter and one digit
+STRICT_POLICY = PasswordPolicy("strict", 10, (
+    CharClass(UPPER, True),
+    CharClass(LOWER, False),
+    CharClass(DIGITS, True),
+))
+# Docman expiry modal: one of each class, symbols included
+DOCMAN_POLICY = PasswordPolicy("docman", 10, (
+    CharClass(UPPER, True),
+    CharClass(LOWER, True),
+    CharClass(DIGITS, True),
+    CharClass(DOCMAN_SYMBOLS, True),
+))
+
+
+def check_policy(policy):
+    """Raise ValueError if the policy cannot produce a password."""
+    if not policy.classes:
+        raise ValueError(f"Policy '{policy.name}' has no character classes.")
+    seen = set()
+    for char_class in policy.classes:
+        chars = set(char_class.chars)
+        if not chars or len(chars) != len(char_class.chars):
+            raise ValueError(f"Policy '{policy.name}' has an empty class or repeated characters.")
+        if chars & seen:
+            raise ValueError(f"Policy '{policy.name}' character classes overlap.")
+        seen |= chars
+    required = sum(1 for char_class in policy.classes if char_class.required)
+    if policy.length < max(1, required):
+        raise ValueError(f"Policy '{policy.name}' needs length >= {max(1, required)}.")
+
+
+def satisfies(password, policy):
+    if len(password) != policy.length:
+        return False
+    allowed = "".join(char_class.chars for char_class in policy.classes)
+    if any(ch not in allowed for ch in password):
+        return False
+    return all(
+        any(ch in char_class.chars for ch in password)
+        for char_class in policy.classes
+        if char_class.required
+    )
+
+
+@lru_cache(maxsize=None)
+def _compositions(policy):
+    """Return ([(counts, cumulative weight)], total) for every valid class make-up.
+
+    The weight of a make-up (k_1..k_m characters per class) is the number of
+    passwords with it: L! / (k_1!..k_m!) * |C_1|^k_1 .. |C_m|^k_m. ``total``
+    is therefore the number of valid passwords.
+    """
+    check_policy(policy)
+    length = policy.length
+    sizes = [len(c.chars) for c in policy.classes]
+    minimums = [1 if c.required else 0 for c in policy.classes]
+    table = []
+    total = 0
+
+    def walk(index, remaining, counts):
+        nonlocal total
+        if index == len(sizes) - 1:
+            if remaining < minimums[index]:
+                return
+            counts = counts + [remaining]
+            weight = math.factorial(length)
+            for count, size in zip(counts, sizes):
+                weight = weight // math.factorial(count) * size ** count
+            total += weight
+            table.append((tuple(counts), total))
+            return
+        reserve = sum(minimums[index + 1:])
+        for count in range(minimums[index], remaining - reserve + 1):
+            walk(index + 1, remaining - count, counts + [count])
+
+    walk(0, length, [])
+    return table, total
+
+
+class _RandomBytes:
+    """Unbiased integers from a bulk buffer of random bytes (os.urandom by default)."""
+
+    def __init__(self, size, random_bytes=os.urandom):
+        self._random_bytes = random_bytes
+        self._buf = random_bytes(max(16, size))
+        self._pos = 0
+
+    def _refill(self, needed):
+        self._buf = self._buf[self._pos:] + self._random_bytes(max(needed, len(self._buf) // 4, 64))
+        self._pos = 0
+
+    def small(self, n):
+        """Uniform integer in [0, n) for 1 <= n <= 256, one byte per attempt."""
+        limit = 256 - 256 % n
+        buf, pos = self._buf, self._pos
+        while True:
+            if pos >= len(buf):
+                self._pos = pos
+                self._refill(1)
+                buf, pos = self._buf, self._pos
+            value = buf[pos]
+            pos += 1
+            if value < limit:
+                self._pos = pos
+                return value % n
+
+    def below(self, n):
+        """Uniform integer in [0, n) for any n >= 1."""
+        if n <= 256:
+            return self.small(n)
+        bits = (n - 1).bit_length()
+        nbytes = (bits + 7) // 8
+        mask = (1 << bits) - 1
+        while True:
+            if self._pos + nbytes > len(self._buf):
+                self._refill(nbytes)
+            value = int.from_bytes(self._buf[self._pos:self._pos + nbytes], "big") & mask
+            self._pos += nbytes
+            if value < n:
+                return value
+
+
+def _generate(policy, table, total, source):
+    # 1. Class make-up, weighted by the number of passwords that have it
+    pick = source.below(total)
+    lo, hi = 0, len(table) - 1
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if table[mid][1] > pick:
+            hi = mid
+        else:
+            lo = mid + 1
+    remaining = list(table[lo][0])
+
+    # 2. Uniform arrangement of that multiset of classes, 3. uniform characters
+    classes = policy.classes
+    left = policy.length
+    chars = []
+    for _ in range(policy.length):
+        slot = source.below(left)
+        index = 0
+        while slot >= remaining[index]:
+            slot -= remaining[index]
+            index += 1
+        remaining[index] -= 1
+        left -= 1
+        pool = classes[index].chars
+        chars.append(pool[source.below(len(pool))])
+    return "".join(chars)
+
+
+def generate_many(n, policy=STRICT_POLICY, random_bytes=None):
+    """Return ``n`` independent passwords drawn uniformly from the valid set.
+
+    ``random_bytes(k)`` supplies the randomness (default os.urandom); tests
+    pass a seeded source so their statistics are repeatable.
+    """
+    if n < 0:
+        raise ValueError("n must be >= 0")
+    table, total = _compositions(policy)
+    # Expected use: ~2 multi-byte draws for the make-up (up to half are
+    # rejected) plus two bytes per character; the slack covers rejected bytes
+    per_password = 2 * ((total.bit_length() + 7) // 8) + 2 * policy.length + 8
+    source = _RandomBytes(n * per_password, random_bytes or os.urandom)
+    return [_generate(policy, table, total, source) for _ in range(n)]
+
+
+def generate_password(policy=STRICT_POLICY):
+    return generate_many(1, policy)[0]
+
+
+def expected_char_frequencies(policy):
+    """Exact probability of each character at any single position.
+
+    Used by the uniformity check in benchmarks/bench_passwords.py.
+    """
+    table, total = _compositions(policy)
+    frequencies = {}
+    previous = 0
+    expected_counts = [0] * len(policy.classes)
+    for counts, cumulative in table:
+        weight = cumulative - previous
+        previous = cumulative
+        for index, count in enumerate(counts):
+            expected_counts[index] += weight * count
+    for index, char_class in enumerate(policy.classes):
+        share = expected_counts[index] / (total * policy.length * len(char_class.chars))
+        for ch in char_class.chars:
+            frequencies[ch] = share
+    return frequencies
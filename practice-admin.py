@@ -2,32 +2,35 @@ import ctypes
 import json
 import logging
 import os
-import secrets
-import string
 import subprocess
 import sys
+import threading
 import time
 import tkinter as tk
 from datetime import datetime
 from tkinter import filedialog, messagebox, scrolledtext, ttk
 
-try:
-    import pyautogui
-    import pygetwindow as gw
-    import pyperclip
-    from pywinauto import Application, Desktop
-
-    AUTOMATION_READY = True
-    AUTOMATION_IMPORT_ERROR = ""
-except Exception as exc:
-    pyautogui = None
-    gw = None
-    pyperclip = None
-    Application = None
-    Desktop = None
-    AUTOMATION_READY = False
-    AUTOMATION_IMPORT_ERROR = str(exc)
-
+from automation_loader import AUTOMATION_MODULES, AutomationLoader, AutomationUnavailable
+from credential_journal import CredentialJournal, journal_path
+from git_service import GitCommandError, GitService, PushFailedAfterCommit
+from log_pipeline import DURABILITY_BATCH, DURABILITY_MODES, GroupCommitFileHandler, LogPipeline
+from log_view import RingLogView
+from ods_validation import INFO, ValidationCache, format_findings, validate_roots
+from password_policy import STRICT_POLICY, generate_many
+from practice_count import PracticeCountRegistry
+from practice_onboarding import (
+    PendingChanges,
+    PracticeRequest,
+    batch_branch_name,
+    batch_commit_message,
+    load_batch_file,
+    make_request,
+    offboard_practice,
+    onboard_practices,
+    run_batch_cli,
+    validate_creation,
+)
+from task_runner import DONE, TaskRunner, current_task
 
 if getattr(sys, "frozen", False):
     SCRIPT_DIR = sys._MEIPASS
@@ -36,9 +39,11 @@ else:
 
 # ── Default paths (used when no saved config exists) ─────────────────────────
 _DEFAULT_PROJECT_BASE = r"C:\rpa\postie"
-CHECK_ODS_MISMATCH_SCRIPT = os.path.join(SCRIPT_DIR, "check-ods-mismatch.ps1")
 GIT_PROFILE_FILE = "git-account-profile.json"
 PATHS_CONFIG_FILE = os.path.join(SCRIPT_DIR, "paths-config.json")
+# Per-user state (SCRIPT_DIR is a throwaway temp dir in the frozen build)
+APP_STATE_DIR = os.path.join(os.environ.get("LOCALAPPDATA") or os.path.expanduser("~"), "practice-admin")
+VALIDATION_CACHE_FILE = os.path.join(APP_STATE_DIR, "validation-cache.json")
 
 
 def _load_paths_config():
@@ -67,10 +72,6 @@ def _load_paths_config():
     )
 
 
-# Module-level defaults (overridden per-instance via self.* at runtime)
-PROJECT_BASE, ROOT_FOLDERS, GIT_REPO_PATH = _load_paths_config()
-
-
 def get_safe_log_path(filename):
     user_profile = os.environ.get("USERPROFILE", "")
     paths_to_try = [
@@ -84,52 +85,57 @@ def get_safe_log_path(filename):
     return os.path.join(SCRIPT_DIR, filename)
 
 
-LOG_FILE_PATH = get_safe_log_path("password_log.txt")
-DEBUG_LOG_PATH = get_safe_log_path("debug_log.txt")
+# Entries kept per practice/context when the credential journal compacts itself
+CREDENTIAL_KEEP = 20
+CREDENTIAL_COMPACT_AT = 5000
+# Lines kept in the on-screen log; older lines are only in the file logs
+LOG_VIEW_CAPACITY = 2000
+# "record" (fsync every line), "batch" (group commit) or "none" (no fsync)
+LOG_DURABILITY = os.environ.get("PRACTICE_ADMIN_LOG_DURABILITY", DURABILITY_BATCH)
 
-for path in [LOG_FILE_PATH, DEBUG_LOG_PATH]:
-    if not os.path.exists(path):
-        with open(path, "w", encoding="utf-8") as handle:
-            handle.write("")
 
+def _init_log_files():
+    """Resolve (credential_journal, debug_log) and make sure the debug log exists."""
+    journal = journal_path(get_safe_log_path("password_journal.jsonl"))
+    debug_log = get_safe_log_path("debug_log.txt")
+    if not os.path.exists(debug_log):
+        with open(debug_log, "w", encoding="utf-8") as handle:
+            handle.write("")
+    return journal, debug_log
 
-class SafeFileHandler(logging.FileHandler):
-    def emit(self, record):
-        super().emit(record)
-        self.flush()
 
-    def flush(self):
-        super().flush()
-        try:
-            if self.stream and hasattr(self.stream, "fileno"):
-                os.fsync(self.stream.fileno())
-        except OSError:
-            pass
+class TextHandler(logging.Handler):
+    """Buffers records from any thread; the Tk loop appends them once per frame."""
 
+    FRAME_MS = 50
 
-class TextHandler(logging.Handler):
-    def __init__(self, text_widget):
+    def __init__(self, log_view):
         super().__init__()
-        self.text_widget = text_widget
+        self.log_view = log_view
+        self.text_widget = log_view.widget
+        self._pending = []
+        self._pending_lock = threading.Lock()
 
     def emit(self, record):
         msg = self.format(record)
+        with self._pending_lock:
+            self._pending.append(msg)
 
-        def append():
-            self.text_widget.configure(state="normal")
-            self.text_widget.insert(tk.END, msg + "\n")
-            self.text_widget.configure(state="disabled")
-            self.text_widget.see(tk.END)
+    def start(self):
+        """Begin draining on the Tk main thread; call from the main thread."""
+        self.text_widget.after(self.FRAME_MS, self._drain)
 
-        self.text_widget.after(0, append)
+    def _drain(self):
+        with self._pending_lock:
+            lines, self._pending = self._pending, []
+        if lines:
+            self.log_view.append(lines)
+        self.text_widget.after(self.FRAME_MS, self._drain)
 
 
 def generate_strict_password(length=10):
-    alphabet = string.ascii_letters + string.digits
-    while True:
-        password = "".join(secrets.choice(alphabet) for _ in range(length))
-        if any(ch.isupper() for ch in password) and any(ch.isdigit() for ch in password):
-            return password
+    """Letters and digits with at least one uppercase letter and one digit."""
+    return generate_many(1, STRICT_POLICY._replace(length=length))[0]
 
 
 class UnifiedToolApp:
@@ -141,19 +147,34 @@ class UnifiedToolApp:
 
         self.generated_pwd = ""
         self.last_practices = []
+        # Everything onboarded/offboarded since the last git commit
+        self.pending_git_changes = PendingChanges()
         self.emis_logger = None
+        # pyautogui/pywinauto & co. are only imported the first time an EMIS action runs
+        self._automation = AutomationLoader()
 
+        # Startup side effects live here rather than at import time
+        self._journal_path, self._debug_log_path = _init_log_files()
+        self._journal = None
         # Load path config into instance variables so UI can update them live
         self._project_base, self._root_folders, self._git_repo_path = _load_paths_config()
+        # Shared, mtime-checked cache of the Practice Count files for all roots
+        self._practice_counts = PracticeCountRegistry()
+        self._validation_cache = None
+        # One serial lane per resource so file writes and git runs never interleave
+        self._tasks = TaskRunner(lanes={"files": 1, "git": 1, "config": 1})
 
         self._setup_styles()
         self._build_ui()
         self._setup_logging()
         self._check_admin()
 
-        self._load_git_account_from_global()
         self._log_info("Unified tool ready.")
 
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        self._refresh_task_list()
+        self._pump_tasks()
+
     def _setup_styles(self):
         # ── Colour palette ──────────────────────────────────────────────────
         self.C = {
@@ -346,8 +367,20 @@ class UnifiedToolApp:
         notebook.add(self.onboarding_tab, text="  Operations  ")
         notebook.add(self.git_sync_tab,   text="  Git Account Sync  ")
 
+        # Only the Operations tab is built up front; the rest on first selection
+        self._notebook = notebook
+        self._pending_tabs = {str(self.git_sync_tab): self._open_git_sync_tab}
+        notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
         self._build_onboarding_tab()
+
+    def _on_tab_changed(self, _event=None):
+        builder = self._pending_tabs.pop(self._notebook.select(), None)
+        if builder is not None:
+            builder()
+
+    def _open_git_sync_tab(self):
         self._build_git_sync_tab()
+        self._load_git_account_from_global(keep_edits=True)
 
     def _build_onboarding_tab(self):
         """Merged Operations tab: Onboard + Offboard side-by-side,
@@ -389,6 +422,8 @@ class UnifiedToolApp:
         btn_row.grid(row=4, column=0, columnspan=2, sticky="w")
         ttk.Button(btn_row, text="Create Files", style="Accent.TButton",
                    command=self.create_json_files).pack(side="left", padx=(0, 5))
+        ttk.Button(btn_row, text="Batch…",
+                   command=self.create_batch_from_file).pack(side="left", padx=(0, 5))
         ttk.Button(btn_row, text="Validate ODS",
                    command=self.run_validation_script).pack(side="left", padx=(0, 5))
         ttk.Button(btn_row, text="Git Push",
@@ -422,11 +457,11 @@ class UnifiedToolApp:
                                   style="Card.TLabelframe", padding=(12, 8))
         controls.grid(row=0, column=0, sticky="nsew", padx=(0, 6))
 
-        if not AUTOMATION_READY:
+        if not self._automation.available():
             banner = tk.Frame(controls, bg="#2d2008", highlightbackground="#9e6a03",
                               highlightthickness=1)
             banner.grid(row=0, column=0, columnspan=2, sticky="ew", pady=(0, 6))
-            tk.Label(banner, text="Automation libraries unavailable — install pyautogui, pygetwindow, pyperclip, pywinauto",
+            tk.Label(banner, text="Automation libraries unavailable — install " + ", ".join(AUTOMATION_MODULES),
                      bg="#2d2008", fg="#d29922", font=("Consolas", 8),
                      anchor="w", pady=5, padx=8).pack(fill="x")
             controls.grid_columnconfigure(0, weight=1)
@@ -469,11 +504,35 @@ class UnifiedToolApp:
         ttk.Button(quick, text="Clear Logs",
                    command=self.clear_log).grid(row=2, column=1, sticky="ew", padx=(4, 0))
 
-        # ── Row 3: Shared live log (fills remaining space) ────────────────────
+        # ── Row 3: In-flight background tasks ─────────────────────────────────
+        tasks_box = ttk.LabelFrame(tab, text=" TASKS",
+                                   style="Card.TLabelframe", padding=(6, 4))
+        tasks_box.pack(fill="x", pady=(0, 8))
+        tasks_box.columnconfigure(0, weight=1)
+
+        self.task_listbox = tk.Listbox(
+            tasks_box, height=2, font=("Consolas", 9),
+            bg=C["log_bg"], fg=C["text2"],
+            selectbackground=C["surface2"], selectforeground=C["text"],
+            relief="flat", bd=0, highlightthickness=0, activestyle="none",
+        )
+        self.task_listbox.grid(row=0, column=0, sticky="ew", padx=(0, 6))
+        ttk.Button(tasks_box, text="Cancel", style="Danger.TButton",
+                   command=self.cancel_selected_task).grid(row=0, column=1, sticky="n")
+
+        # ── Row 4: Shared live log (fills remaining space) ────────────────────
         log_box = ttk.LabelFrame(tab, text=" LIVE LOG",
                                  style="Card.TLabelframe", padding=(6, 4))
         log_box.pack(fill="both", expand=True)
 
+        filter_row = ttk.Frame(log_box, style="Surface.TFrame")
+        filter_row.pack(fill="x", pady=(0, 4))
+        ttk.Label(filter_row, text="filter", style="CardMono.TLabel").pack(side="left", padx=(2, 6))
+        self.log_filter_var = tk.StringVar()
+        ttk.Entry(filter_row, textvariable=self.log_filter_var,
+                  font=("Consolas", 9)).pack(side="left", fill="x", expand=True)
+        self.log_filter_var.trace_add("write", lambda *_: self._schedule_log_filter())
+
         # Single shared log widget — both onboarding and EMIS write here
         shared_log = scrolledtext.ScrolledText(
             log_box,
@@ -486,10 +545,21 @@ class UnifiedToolApp:
         shared_log.pack(fill="both", expand=True)
         shared_log.configure(state="disabled")
 
-        # Both logger references point to the same widget
+        # Both logger references point to the same widget; the ring view
+        # keeps it bounded (full history stays in the file logs)
         self.onboarding_log_widget = shared_log
         self.log_widget = shared_log
+        self.log_view = RingLogView(shared_log, capacity=LOG_VIEW_CAPACITY)
 
+    def _schedule_log_filter(self):
+        pending = getattr(self, "_log_filter_after", None)
+        if pending is not None:
+            self.root.after_cancel(pending)
+        self._log_filter_after = self.root.after(150, self._apply_log_filter)
+
+    def _apply_log_filter(self):
+        self._log_filter_after = None
+        self.log_view.set_filter(self.log_filter_var.get())
 
     def _build_git_sync_tab(self):
         C = self.C
@@ -620,33 +690,92 @@ class UnifiedToolApp:
         self.emis_logger.setLevel(logging.DEBUG)
         self.emis_logger.propagate = False
 
-        for handler in list(self.emis_logger.handlers):
-            self.emis_logger.removeHandler(handler)
-
         formatter = logging.Formatter("%(relativeCreated)d INFO: %(message)s")
-        file_handler = SafeFileHandler(DEBUG_LOG_PATH, encoding="utf-8")
+        durability = LOG_DURABILITY
+        if durability not in DURABILITY_MODES:
+            durability = DURABILITY_BATCH
+        file_handler = GroupCommitFileHandler(self._debug_log_path, encoding="utf-8", durability=durability)
         file_handler.setFormatter(formatter)
 
-        gui_handler = TextHandler(self.log_widget)
+        gui_handler = TextHandler(self.log_view)
         gui_handler.setFormatter(formatter)
-
-        self.emis_logger.addHandler(file_handler)
-        self.emis_logger.addHandler(gui_handler)
+        # Onboarding lines are put on screen by _log_onboarding itself
+        gui_handler.addFilter(lambda record: not getattr(record, "file_only", False))
+        gui_handler.start()
+
+        # Callers only enqueue; one writer thread batches records and fsyncs per batch
+        self._log_pipeline = LogPipeline(self.emis_logger, [file_handler, gui_handler]).start()
+        if durability != LOG_DURABILITY:
+            self.emis_logger.warning(
+                f"Unknown PRACTICE_ADMIN_LOG_DURABILITY '{LOG_DURABILITY}' (expected one of "
+                f"{', '.join(DURABILITY_MODES)}); using '{DURABILITY_BATCH}'."
+            )
 
     def _log_info(self, message):
         if self.emis_logger:
             self.emis_logger.info(message)
 
     def _log_onboarding(self, message):
-        if not hasattr(self, "onboarding_log_widget"):
+        task = current_task()
+        if task is not None:
+            # Worker threads must not touch Tk; _pump_tasks re-logs this
+            task.log(message)
+            return
+        if getattr(self, "emis_logger", None):
+            # The debug log keeps the full history; the view below is trimmed
+            self.emis_logger.info(f"[onboarding] {message}", extra={"file_only": True})
+        if not hasattr(self, "log_view"):
             return
 
         stamp = datetime.now().strftime("%H:%M:%S")
-        line = f"[{stamp}] {message}"
-        self.onboarding_log_widget.configure(state="normal")
-        self.onboarding_log_widget.insert(tk.END, line + "\n")
-        self.onboarding_log_widget.configure(state="disabled")
-        self.onboarding_log_widget.see(tk.END)
+        self.log_view.append(f"[{stamp}] {message}")
+
+    def _task_progress(self, fraction, text=""):
+        task = current_task()
+        if task is not None:
+            task.check_cancelled()
+            task.progress(fraction, text)
+
+    # ── Background tasks ─────────────────────────────────────────────────────
+
+    def _pump_tasks(self):
+        changed = self._tasks.poll(on_log=self._log_onboarding)
+        active = self._tasks.tasks()
+        if changed or active:
+            # Also refreshes the elapsed-time counters of running tasks
+            self._refresh_task_list()
+        self.root.after(100 if active else 250, self._pump_tasks)
+
+    def _refresh_task_list(self):
+        if not hasattr(self, "task_listbox"):
+            return
+        ids = getattr(self, "_task_list_ids", [])
+        selected = {ids[i] for i in self.task_listbox.curselection() if i < len(ids)}
+        tasks = self._tasks.tasks()
+        self.task_listbox.delete(0, tk.END)
+        if not tasks:
+            self.task_listbox.insert(tk.END, "idle")
+        for index, handle in enumerate(tasks):
+            self.task_listbox.insert(tk.END, handle.describe())
+            if handle.id in selected:
+                self.task_listbox.selection_set(index)
+        self._task_list_ids = [handle.id for handle in tasks]
+
+    def cancel_selected_task(self):
+        selection = self.task_listbox.curselection()
+        ids = getattr(self, "_task_list_ids", [])
+        targets = [ids[i] for i in selection if i < len(ids)] or ids[:1]
+        for handle in self._tasks.tasks():
+            if handle.id in targets:
+                handle.cancel()
+                self._log_onboarding(f"Cancel requested: {handle.name}")
+
+    def _on_close(self):
+        self._tasks.shutdown(wait=False)
+        if self._journal is not None:
+            self._journal.close()
+        self._log_pipeline.stop()
+        self.root.destroy()
 
     def _check_admin(self):
         try:
@@ -663,240 +792,161 @@ class UnifiedToolApp:
             if hasattr(self, "_admin_status_label"):
                 self._admin_status_label.config(text="● ADMIN N/A", style="StatusWarn.TLabel")
 
-    def _run_command(self, args, cwd=None):
+    def _run_command(self, args, cwd=None, echo=True):
+        # Inside a background task, stream output to the log as it arrives
+        task = current_task()
+        if task is not None:
+            return task.run(args, cwd=cwd, echo=echo)
         result = subprocess.run(args, cwd=cwd, capture_output=True, text=True, shell=False)
         return result
 
+    def _git(self):
+        """Return the GitService for the configured repo (rebuilt if the path changes)."""
+        service = getattr(self, "_git_service", None)
+        if service is None or service.repo_path != self._git_repo_path:
+            service = self._git_service = GitService(self._git_repo_path, run=self._run_command)
+        return service
+
     def _run_git(self, git_args):
-        return self._run_command(["git"] + git_args, cwd=self._git_repo_path)
+        return self._git().run(git_args)
 
     def _run_git_checked(self, git_args):
-        result = self._run_git(git_args)
-        if result.returncode != 0:
-            cmd = "git " + " ".join(git_args)
-            raise RuntimeError(f"{cmd} failed\nSTDOUT:\n{result.stdout}\nSTDERR:\n{result.stderr}")
-        return result
+        return self._git().run_checked(git_args)
 
     def _git_repo_ready(self):
-        p = self._git_repo_path
-        return os.path.isdir(p) and os.path.isdir(os.path.join(p, ".git"))
+        return self._git().ready()
 
     def _suggest_branch_base(self):
-        branch = "main"
-        if not self._git_repo_ready():
-            return branch
-        try:
-            result = self._run_git(["symbolic-ref", "refs/remotes/origin/HEAD"])
-            if result.returncode == 0 and result.stdout.strip():
-                branch = result.stdout.strip().split("/")[-1]
-            else:
-                fallback = self._run_git(["branch", "--list", "main"])
-                if not fallback.stdout.strip():
-                    branch = "master"
-        except Exception:
-            pass
-        return branch
+        return self._git().default_branch()
 
     def run_validation_script(self):
         self._log_onboarding("Validate ODS clicked.")
-        outputs = []
-        if not os.path.exists(CHECK_ODS_MISMATCH_SCRIPT):
-            self._log_onboarding(f"Validation script missing: {CHECK_ODS_MISMATCH_SCRIPT}")
-            messagebox.showerror("Validation", f"Script not found: {CHECK_ODS_MISMATCH_SCRIPT}")
-            return
-
-        for folder in self._root_folders:
-            if not os.path.isdir(folder):
-                outputs.append(f"Skipped missing folder: {folder}")
-                continue
-
-            result = self._run_command(
-                [
-                    "powershell",
-                    "-ExecutionPolicy",
-                    "Bypass",
-                    "-File",
-                    CHECK_ODS_MISMATCH_SCRIPT,
-                    "-BasePath",
-                    folder,
-                ]
-            )
+        if self._validation_cache is None:
+            self._validation_cache = ValidationCache(VALIDATION_CACHE_FILE)
+        self._tasks.submit(
+            "Validate ODS", self._validation_task, list(self._root_folders),
+            lane="files", on_done=self._validation_done,
+        )
 
-            if result.stdout.strip():
-                outputs.append(f"[{os.path.basename(folder)}]\n{result.stdout.strip()}")
-            if result.stderr.strip():
-                outputs.append(f"Errors in {os.path.basename(folder)}:\n{result.stderr.strip()}")
+    def _validation_task(self, task, root_folders):
+        findings = validate_roots(root_folders, registry=self._practice_counts, cache=self._validation_cache)
+        return findings, root_folders
 
-        final = "\n\n".join(outputs) if outputs else "No issues detected."
-        self._log_onboarding("ODS validation completed.")
-        messagebox.showinfo("ODS Mismatch Check", final)
+    def _validation_done(self, handle):
+        if handle.status != DONE:
+            self._log_onboarding(f"ODS validation {handle.status}: {handle.error}")
+            messagebox.showerror("ODS Mismatch Check", str(handle.error))
+            return
+        findings, root_folders = handle.result
+        issues = [f for f in findings if f.severity != INFO]
+        stats = self._validation_cache.stats
+        self._log_onboarding(
+            f"ODS validation completed ({len(issues)} finding(s); "
+            f"{stats['hit'] + stats['rehash']} folder(s) unchanged, {stats['parsed']} reparsed, "
+            f"{stats['pruned']} removed)."
+        )
+        messagebox.showinfo("ODS Mismatch Check", format_findings(findings, root_folders))
 
     def _validate_current_creation(self, practice_name, ods, system_type):
-        folder_name = f"{practice_name.title()} ({ods})"
-        check_notes = []
-        check_passed = 0
-        check_issues = 0
-
-        for root_folder in self._root_folders:
-            if not os.path.isdir(root_folder):
-                check_notes.append(f"Skipped missing root folder: {root_folder}")
-                continue
-
-            root_label = os.path.basename(root_folder)
-            practice_file = os.path.join(root_folder, folder_name, "work-items.json")
-            if not os.path.exists(practice_file):
-                check_issues += 1
-                check_notes.append(f"[{root_label}] Missing practice file: {practice_file}")
-                continue
-
-            try:
-                with open(practice_file, "r", encoding="utf-8") as handle:
-                    practice_data = json.load(handle)
-                first_item = practice_data[0] if isinstance(practice_data, list) and practice_data else {}
-                file_ods = str(first_item.get("payload", {}).get("ods_code", "")).upper()
-            except Exception as exc:
-                check_issues += 1
-                check_notes.append(f"[{root_label}] Invalid practice JSON: {exc}")
-                continue
-
-            if file_ods == ods:
-                check_passed += 1
-            else:
-                check_issues += 1
-                check_notes.append(f"[{root_label}] ODS mismatch in practice file (found: {file_ods or '[None]'})")
-
-            if system_type != "Docman":
-                continue
-
-            count_path = os.path.join(root_folder, "Practice Count", "work-items.json")
-            if not os.path.exists(count_path):
-                check_issues += 1
-                check_notes.append(f"[{root_label}] Missing Practice Count file: {count_path}")
-                continue
-
-            try:
-                with open(count_path, "r", encoding="utf-8") as handle:
-                    count_data = json.load(handle)
-            except Exception as exc:
-                check_issues += 1
-                check_notes.append(f"[{root_label}] Invalid Practice Count JSON: {exc}")
-                continue
-
-            found = any(str(item.get("payload", {}).get("ods_code", "")).upper() == ods for item in count_data)
-            if found:
-                check_passed += 1
-            else:
-                check_issues += 1
-                check_notes.append(f"[{root_label}] ODS {ods} not found in Practice Count.")
-
-        if system_type != "Docman":
-            check_notes.append("Practice Count check skipped for EMIS mode.")
-
-        return check_passed, check_issues, check_notes
+        return validate_creation(
+            self._root_folders,
+            [PracticeRequest(practice_name, ods, system_type)],
+            registry=self._practice_counts,
+        )
 
     def create_json_files(self):
         self._log_onboarding("Create Files clicked.")
-        system_type = self.system_var.get().strip() or "Docman"
-        practice_name = self.entry_practice.get().strip()
-        ods = self.entry_ods.get().strip().upper()
-
-        if not practice_name or not ods:
+        try:
+            request = make_request(self.entry_practice.get(), self.entry_ods.get(), self.system_var.get())
+        except ValueError:
             self._log_onboarding("Create failed: Practice Name or ODS missing.")
             messagebox.showerror("Error", "Please enter both Practice Name and ODS Code.")
             return
 
-        self.last_practices.append((practice_name, ods))
-
-        folders_created = 0
-        counts_updated = 0
-        notes = []
-
-        for root_folder in self._root_folders:
-            if not os.path.isdir(root_folder):
-                notes.append(f"Skipped missing root folder: {root_folder}")
-                continue
-
-            try:
-                folder_name = f"{practice_name.title()} ({ods})"
-                practice_folder = os.path.join(root_folder, folder_name)
-                practice_file = os.path.join(practice_folder, "work-items.json")
-
-                if not os.path.exists(practice_folder):
-                    os.makedirs(practice_folder, exist_ok=True)
-                    folders_created += 1
-                    notes.append(f"Created folder: {practice_folder}")
-                elif not os.path.isdir(practice_folder):
-                    raise RuntimeError(f"A file exists with the folder name: {practice_folder}")
+        self.last_practices.append((request.practice_name, request.ods))
+        self._tasks.submit(
+            f"Create {request.ods}", self._onboarding_task, list(self._root_folders), [request], True,
+            lane="files", on_done=self._onboarding_done,
+        )
 
-                with open(practice_file, "w", encoding="utf-8") as handle:
-                    json.dump([{"payload": {"ods_code": ods}}], handle, indent=4)
-                    handle.write("\n")
+    def create_batch_from_file(self):
+        self._log_onboarding("Batch Create clicked.")
+        path = filedialog.askopenfilename(
+            title="Select Onboarding Batch",
+            filetypes=[("Batch file", "*.csv *.jsonl"), ("All files", "*.*")],
+        )
+        if not path:
+            return
 
-                if system_type != "Docman":
-                    notes.append(f"{root_folder}: skipped Practice Count update for EMIS mode")
-                    continue
+        dropped = []
+        try:
+            practices = load_batch_file(path, default_system=self.system_var.get().strip() or "Docman",
+                                        dropped=dropped)
+        except (OSError, ValueError) as exc:
+            self._log_onboarding(f"Batch create failed: {exc}")
+            messagebox.showerror("Batch Create", str(exc))
+            return
+        if not practices:
+            messagebox.showinfo("Batch Create", "The batch file contains no practices.")
+            return
 
-                count_path = os.path.join(root_folder, "Practice Count", "work-items.json")
-                data = []
-                if os.path.exists(count_path):
-                    try:
-                        with open(count_path, "r", encoding="utf-8") as handle:
-                            data = json.load(handle)
-                    except Exception:
-                        data = []
-                        notes.append(f"Reset invalid JSON in {count_path}")
-
-                exists = any(str(item.get("payload", {}).get("ods_code", "")).upper() == ods for item in data)
-                if not exists:
-                    data.append(
-                        {
-                            "payload": {
-                                "ods_code": ods,
-                                "docman_practice_display_name": practice_name.upper(),
-                            }
-                        }
-                    )
-                    os.makedirs(os.path.dirname(count_path), exist_ok=True)
-                    with open(count_path, "w", encoding="utf-8") as handle:
-                        json.dump(data, handle, indent=4)
-                        handle.write("\n")
-                    counts_updated += 1
-                else:
-                    notes.append(f"ODS {ods} already exists in Practice Count at {root_folder}")
+        self.last_practices.extend((p.practice_name, p.ods) for p in practices)
+        self._log_onboarding(f"Applying batch of {len(practices)} practice(s) from {os.path.basename(path)}.")
+        for row in dropped:
+            self._log_onboarding(f"Dropped duplicate ODS row: {row}")
+        self._tasks.submit(
+            f"Batch create ({len(practices)})", self._onboarding_task, list(self._root_folders), practices, False,
+            dropped, lane="files", on_done=self._onboarding_done,
+        )
 
-            except Exception as exc:
-                self._log_onboarding(f"Create failed in {root_folder}: {exc}")
-                messagebox.showerror("Create Files", f"Failed in {root_folder}: {exc}")
-                return
+    def _onboarding_task(self, task, root_folders, practices, stop_on_error, dropped=()):
+        task.progress(0.0, "writing files")
+        summary = onboard_practices(root_folders, practices, stop_on_error=stop_on_error,
+                                    registry=self._practice_counts, dropped=dropped)
+        for failure in summary.failures:
+            self._log_onboarding(f"Create failed in {failure}")
+        if stop_on_error and not summary.ok:
+            return summary, practices, None
+        task.progress(0.8, "checking")
+        checks = validate_creation(root_folders, practices, registry=self._practice_counts)
+        return summary, practices, checks
+
+    def _onboarding_done(self, handle):
+        if handle.status != DONE:
+            self._log_onboarding(f"Create {handle.status}: {handle.error}")
+            messagebox.showerror("Create Files", str(handle.error))
+            return
+        summary, practices, checks = handle.result
+        if checks is None:
+            messagebox.showerror("Create Files", f"Failed in {summary.failures[0]}")
+            return
+        # Only practices whose files were written are waiting to be pushed
+        self.pending_git_changes.record_onboard(summary.succeeded)
 
-        summary = [
-            f"Onboarding Summary for {practice_name} ({system_type})",
-            f"Folders created: {folders_created}",
-            f"Practice Count updates: {counts_updated}",
-        ]
-        if notes:
-            summary.append("")
-            summary.append("Details:")
-            summary.extend(notes)
-
-        checks_ok, checks_failed, check_notes = self._validate_current_creation(practice_name, ods, system_type)
-        summary.append("")
-        summary.append("Current Creation Check:")
+        lines = summary.lines()
+        checks_ok, checks_failed, check_notes = checks
+        lines.append("")
+        lines.append("Current Creation Check:")
         if checks_failed == 0:
-            summary.append(f"Passed ({checks_ok} checks).")
+            lines.append(f"Passed ({checks_ok} checks).")
         else:
-            summary.append(f"Completed with {checks_failed} issue(s) ({checks_ok} checks passed).")
-        if check_notes:
-            summary.extend(check_notes)
+            lines.append(f"Completed with {checks_failed} issue(s) ({checks_ok} checks passed).")
+        lines.extend(check_notes)
 
+        if len(practices) == 1:
+            label = f"{practices[0].practice_name} ({practices[0].ods})"
+            target = f"ODS {practices[0].ods}"
+        else:
+            label = f"batch of {len(practices)} practices"
+            target = label
         self._log_onboarding(
-            f"Create completed for {practice_name} ({ods}). Folders: {folders_created}, Count updates: {counts_updated}"
+            f"Create completed for {label}. Folders: {summary.folders_created}, Count updates: {summary.counts_updated}"
         )
         if checks_failed == 0:
-            self._log_onboarding(f"Current creation validation passed for ODS {ods}.")
+            self._log_onboarding(f"Current creation validation passed for {target}.")
         else:
-            self._log_onboarding(f"Current creation validation found {checks_failed} issue(s) for ODS {ods}.")
-        messagebox.showinfo("Status", "\n".join(summary))
+            self._log_onboarding(f"Current creation validation found {checks_failed} issue(s) for {target}.")
+        messagebox.showinfo("Status", "\n".join(lines))
 
     def offboard_practice(self):
         self._log_onboarding("Offboard clicked.")
@@ -906,44 +956,32 @@ class UnifiedToolApp:
             messagebox.showerror("Offboard", "Enter the ODS code to remove.")
             return
 
-        removed = 0
-        for root_folder in self._root_folders:
-            count_path = os.path.join(root_folder, "Practice Count", "work-items.json")
-            if not os.path.exists(count_path):
-                continue
-
-            try:
-                with open(count_path, "r", encoding="utf-8") as handle:
-                    data = json.load(handle)
-
-                original_len = len(data)
-                data = [
-                    item
-                    for item in data
-                    if str(item.get("payload", {}).get("ods_code", "")).upper() != ods_code
-                ]
-                if len(data) < original_len:
-                    with open(count_path, "w", encoding="utf-8") as handle:
-                        json.dump(data, handle, indent=4)
-                        handle.write("\n")
-                    removed += 1
-            except Exception as exc:
-                self._log_onboarding(f"Offboard failed updating {count_path}: {exc}")
-                messagebox.showerror("Offboard", f"Failed to update {count_path}: {exc}")
+        root_folders = list(self._root_folders)
+
+        def offboard(task):
+            return offboard_practice(root_folders, ods_code, registry=self._practice_counts)
+
+        def done(handle):
+            if handle.status != DONE:
+                self._log_onboarding(f"Offboard failed: {handle.error}")
+                messagebox.showerror("Offboard", str(handle.error))
                 return
+            removed = handle.result
+            if removed:
+                self.pending_git_changes.record_offboard(ods_code)
+                self._log_onboarding(f"Offboard success: removed {ods_code} from {removed} file(s).")
+                messagebox.showinfo("Offboard", f"Removed ODS {ods_code} from {removed} Practice Count file(s).")
+            else:
+                self._log_onboarding(f"Offboard completed: {ods_code} not found.")
+                messagebox.showinfo("Offboard", f"ODS {ods_code} was not found in Practice Count files.")
 
-        if removed:
-            self._log_onboarding(f"Offboard success: removed {ods_code} from {removed} file(s).")
-            messagebox.showinfo("Offboard", f"Removed ODS {ods_code} from {removed} Practice Count file(s).")
-        else:
-            self._log_onboarding(f"Offboard completed: {ods_code} not found.")
-            messagebox.showinfo("Offboard", f"ODS {ods_code} was not found in Practice Count files.")
+        self._tasks.submit(f"Offboard {ods_code}", offboard, lane="files", on_done=done)
 
     def open_git_push_window(self):
         self._log_onboarding("Git Push window opened.")
         window = tk.Toplevel(self.root)
         window.title("Git Push")
-        window.geometry("440x250")
+        window.geometry("440x290")
         window.resizable(False, False)
 
         ttk.Label(window, text="Branch Name").pack(anchor="w", padx=16, pady=(16, 4))
@@ -953,32 +991,97 @@ class UnifiedToolApp:
         last_name, last_ods = (
             self.last_practices[-1] if self.last_practices else ("practice", datetime.now().strftime("%Y%m%d"))
         )
-        branch_entry.insert(0, f"onboard/{last_ods}".lower().replace(" ", "-"))
+        single_branch = f"onboard/{last_ods}".lower().replace(" ", "-")
+        single_message = f"Onboarded: {last_name} ({last_ods})"
+        branch_entry.insert(0, single_branch)
 
         ttk.Label(window, text="Commit Message").pack(anchor="w", padx=16, pady=(12, 4))
         commit_entry = ttk.Entry(window, width=58)
         commit_entry.pack(padx=16)
-        commit_entry.insert(0, f"Onboarded: {last_name} ({last_ods})")
+        commit_entry.insert(0, single_message)
 
         push_confirm = tk.BooleanVar(value=True)
         ttk.Checkbutton(window, text="Push to origin after commit", variable=push_confirm).pack(
             anchor="w", padx=16, pady=(12, 0)
         )
 
+        # Batch mode: one branch + one commit for every pending change
+        pending = self.pending_git_changes.snapshot()
+        batch_mode = tk.BooleanVar(value=len(pending) > 1)
+        batch_subject, batch_body = batch_commit_message(pending)
+
+        def apply_mode():
+            branch_entry.delete(0, tk.END)
+            commit_entry.delete(0, tk.END)
+            if batch_mode.get():
+                branch_entry.insert(0, batch_branch_name(datetime.now()))
+                commit_entry.insert(0, batch_subject)
+            else:
+                branch_entry.insert(0, single_branch)
+                commit_entry.insert(0, single_message)
+
+        batch_check = ttk.Checkbutton(
+            window,
+            text=f"Batch all pending changes ({len(pending)} practice(s)) into one commit",
+            variable=batch_mode,
+            command=apply_mode,
+        )
+        batch_check.pack(anchor="w", padx=16, pady=(4, 0))
+        if not pending:
+            batch_check.state(["disabled"])
+        apply_mode()
+
         def handle_push():
-            try:
-                self._log_onboarding("Git push flow started.")
-                result = self.run_git_push(branch_entry.get().strip(), commit_entry.get().strip(), push_confirm.get())
-                self._log_onboarding(result)
-                messagebox.showinfo("Git Push", result)
-                window.destroy()
-            except Exception as exc:
-                self._log_onboarding(f"Git push failed: {exc}")
-                messagebox.showerror("Git Push", str(exc))
-
-        ttk.Button(window, text="Run Git Flow", style="Accent.TButton", command=handle_push).pack(pady=18)
+            branch_name = branch_entry.get().strip()
+            commit_message = commit_entry.get().strip()
+            push = push_confirm.get()
+            batch = batch_mode.get() and bool(pending)
+            # Checked here, not only in run_git_push, so bad input keeps the dialog open
+            if not branch_name or not commit_message:
+                messagebox.showerror(
+                    "Git Push", "Branch name cannot be empty." if not branch_name else "Commit message cannot be empty.",
+                    parent=window,
+                )
+                return
+            if not self._git_repo_ready():
+                messagebox.showerror(
+                    "Git Push", f"Git repo not found at: {self._git_repo_path}\n\n"
+                    "Go to Git Account Sync tab -> Paths to set the correct repo path.", parent=window,
+                )
+                return
+            if batch and batch_body:
+                commit_message = f"{commit_message}\n\n{batch_body}"
+            self._log_onboarding(
+                f"Git push flow started (batch of {len(pending)} change(s))." if batch else "Git push flow started."
+            )
+            window.destroy()
+
+            def done(handle):
+                if handle.status == DONE:
+                    committed, result = handle.result
+                else:
+                    committed = isinstance(handle.error, PushFailedAfterCommit)
+                if committed:
+                    # add -A commits every pending file, whichever mode wrote the message
+                    self.pending_git_changes.discard(pending)
+                if handle.status == DONE:
+                    self._log_onboarding(result)
+                    messagebox.showinfo("Git Push", result)
+                else:
+                    self._log_onboarding(f"Git push {handle.status}: {handle.error}")
+                    messagebox.showerror("Git Push", str(handle.error))
+
+            self._tasks.submit(
+                f"Git flow {branch_name}",
+                lambda task: self.run_git_push(branch_name, commit_message, push),
+                lane="git",
+                on_done=done,
+            )
+
+        ttk.Button(window, text="Run Git Flow", style="Accent.TButton", command=handle_push).pack(pady=14)
 
     def run_git_push(self, branch_name, commit_message, push_to_origin=True):
+        """Run the branch/commit/push flow; returns (committed, result message)."""
         self._log_onboarding(f"Preparing git flow for branch '{branch_name}'.")
         if not branch_name:
             raise RuntimeError("Branch name cannot be empty.")
@@ -990,37 +1093,51 @@ class UnifiedToolApp:
                 f"Go to Git Account Sync tab -> Paths to set the correct repo path."
             )
 
-        default_branch = self._suggest_branch_base()
-        self._run_git_checked(["fetch", "origin"])
-        self._run_git_checked(["checkout", default_branch])
-        self._run_git_checked(["pull", "--ff-only", "origin", default_branch])
+        git = self._git()
+        first_timing = len(git.timings)
+        default_branch = git.default_branch()
+        self._task_progress(0.1, "fetch")
+        if not git.fetch_if_stale(default_branch):
+            self._log_onboarding("Skipped fetch: no branch on origin has moved.")
+        self._task_progress(0.4, "update base")
+        git.update_base(default_branch)
         self._log_onboarding(f"Base branch '{default_branch}' updated.")
 
-        branch_exists = self._run_git(["show-ref", "--verify", f"refs/heads/{branch_name}"]).returncode == 0
-        if branch_exists:
-            self._run_git_checked(["checkout", branch_name])
-        else:
-            self._run_git_checked(["checkout", "-b", branch_name])
-
-        self._run_git_checked(["add", "-A"])
-        status = self._run_git(["status", "--porcelain"])
-        if not status.stdout.strip():
+        self._task_progress(0.6, "commit")
+        git.switch_branch(branch_name)
+        if not git.stage_all():
             self._log_onboarding("No git changes detected.")
-            return "No changes detected. Nothing to commit."
-
-        self._run_git_checked(["commit", "-m", commit_message])
+            self._log_onboarding(git.timing_summary(first_timing))
+            return False, "No changes detected. Nothing to commit."
 
-        if push_to_origin:
-            self._run_git_checked(["push", "-u", "origin", branch_name])
-            return f"Commit and push completed on branch '{branch_name}'."
+        git.commit(commit_message)
 
-        return f"Commit created locally on branch '{branch_name}'. Push was skipped."
-
-    def _read_git_global(self, key):
-        result = self._run_command(["git", "config", "--global", "--get", key])
-        if result.returncode == 0:
-            return result.stdout.strip()
-        return ""
+        try:
+            if push_to_origin:
+                self._task_progress(0.8, "push")
+                try:
+                    git.push(branch_name)
+                except GitCommandError as exc:
+                    raise PushFailedAfterCommit(
+                        f"Commit created locally on branch '{branch_name}', but the push failed.\n{exc}"
+                    ) from exc
+                return True, f"Commit and push completed on branch '{branch_name}'."
+            return True, f"Commit created locally on branch '{branch_name}'. Push was skipped."
+        finally:
+            self._log_onboarding(git.timing_summary(first_timing))
+
+    def _read_git_globals(self, keys):
+        """Return {key: value} for keys in the global git config, in one git call."""
+        pattern = "^(" + "|".join(key.replace(".", r"\.") for key in keys) + ")$"
+        result = self._run_command(["git", "config", "--global", "--get-regexp", pattern], echo=False)
+        values = dict.fromkeys(keys, "")
+        for line in result.stdout.splitlines() if result.returncode == 0 else []:
+            key, _, value = line.partition(" ")
+            # Multi-valued keys: the last one wins, as with --get
+            for wanted in keys:
+                if wanted.lower() == key.lower():
+                    values[wanted] = value.strip()
+        return values
 
     def _set_git_global(self, key, value):
         result = self._run_command(["git", "config", "--global", key, value])
@@ -1028,20 +1145,40 @@ class UnifiedToolApp:
             cmd = f"git config --global {key} {value}"
             raise RuntimeError(f"{cmd} failed\nSTDOUT:\n{result.stdout}\nSTDERR:\n{result.stderr}")
 
-    def _load_git_account_from_global(self):
-        self.git_name_entry.delete(0, tk.END)
-        self.git_name_entry.insert(0, self._read_git_global("user.name"))
-
-        self.git_email_entry.delete(0, tk.END)
-        self.git_email_entry.insert(0, self._read_git_global("user.email"))
+    def _load_git_account_from_global(self, keep_edits=False):
+        """Fill the identity fields from global git config without blocking the UI.
 
-        self.git_username_entry.delete(0, tk.END)
-        username = self._read_git_global("credential.username")
-        self.git_username_entry.insert(0, username)
+        With ``keep_edits`` (the fill when the tab first opens), a field typed
+        into while git was being read keeps what the user typed.
+        """
+        entries = [self.git_name_entry, self.git_email_entry, self.git_username_entry, self.git_helper_entry]
+        started = [entry.get() for entry in entries]
 
-        self.git_helper_entry.delete(0, tk.END)
-        helper = self._read_git_global("credential.helper")
-        self.git_helper_entry.insert(0, helper or "manager-core")
+        def done(handle):
+            if handle.status != DONE:
+                self._log_info(f"Could not read global git config: {handle.error}")
+                return
+            values = handle.result
+            loaded = [
+                values["user.name"],
+                values["user.email"],
+                values["credential.username"],
+                values["credential.helper"] or "manager-core",
+            ]
+            for entry, before, value in zip(entries, started, loaded):
+                if keep_edits and entry.get() != before:
+                    continue
+                entry.delete(0, tk.END)
+                entry.insert(0, value)
+
+        self._tasks.submit(
+            "Load git identity",
+            lambda task: self._read_git_globals(
+                ["user.name", "user.email", "credential.username", "credential.helper"]
+            ),
+            lane="config",
+            on_done=done,
+        )
 
     def apply_git_account(self):
         name = self.git_name_entry.get().strip()
@@ -1126,37 +1263,49 @@ class UnifiedToolApp:
         else:
             messagebox.showinfo("Git Account", f"No .gitconfig found at {gitconfig}")
 
-    def log_password(self, password, context):
-        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-        entry = f"{timestamp} [{context}] - {password}\n"
+    def _credentials(self):
+        if self._journal is None:
+            self._journal = CredentialJournal(
+                self._journal_path, auto_compact=CREDENTIAL_COMPACT_AT, keep=CREDENTIAL_KEEP
+            )
+        return self._journal
+
+    def log_password(self, password, context, ods=""):
         try:
-            with open(LOG_FILE_PATH, "a", encoding="utf-8") as handle:
-                handle.write(entry)
-                handle.flush()
-                os.fsync(handle.fileno())
+            self._credentials().append(context, password, ods=ods)
             self._log_info(f"Password recorded for {context}.")
         except Exception as exc:
             self._log_info(f"Password save error: {exc}")
 
+    def _automation_modules(self, quiet=False):
+        """Load the EMIS automation libraries on first use; None if unavailable."""
+        try:
+            return self._automation.load()
+        except AutomationUnavailable as exc:
+            if not quiet:
+                self._log_info(f"Automation unavailable due to missing libraries ({exc}).")
+            return None
+
     def generate_ui(self):
         self.generated_pwd = generate_strict_password(10)
         self.pwd_entry.delete(0, tk.END)
         self.pwd_entry.insert(0, self.generated_pwd)
-        if pyperclip:
-            pyperclip.copy(self.generated_pwd)
+        auto = self._automation_modules(quiet=True)
+        if auto:
+            auto.pyperclip.copy(self.generated_pwd)
         self._log_info(f"Generated password: {self.generated_pwd}")
         return self.generated_pwd
 
     def run_settings_automation(self):
-        if not AUTOMATION_READY:
-            self._log_info("Automation unavailable due to missing libraries.")
+        auto = self._automation_modules()
+        if auto is None:
             return
 
         password = self.generate_ui()
         self._log_info("Searching for EMIS Edit User modal...")
 
         try:
-            desktop = Desktop(backend="uia")
+            desktop = auto.Desktop(backend="uia")
             main_emis = desktop.window(title_re=".*EMIS Web Health Care System.*")
             wizard = main_emis.child_window(auto_id="UserWizardForm", control_type="Window")
 
@@ -1170,14 +1319,14 @@ class UnifiedToolApp:
             confirm_field = container.child_window(auto_id="confirmPasswordTextBox", control_type="Edit")
 
             pass_field.set_focus()
-            pyautogui.hotkey("ctrl", "a")
-            pyautogui.press("backspace")
-            pyautogui.write(password, interval=0.01)
+            auto.pyautogui.hotkey("ctrl", "a")
+            auto.pyautogui.press("backspace")
+            auto.pyautogui.write(password, interval=0.01)
 
             confirm_field.set_focus()
-            pyautogui.hotkey("ctrl", "a")
-            pyautogui.press("backspace")
-            pyautogui.write(password, interval=0.01)
+            auto.pyautogui.hotkey("ctrl", "a")
+            auto.pyautogui.press("backspace")
+            auto.pyautogui.write(password, interval=0.01)
 
             self.log_password(password, "Settings")
             self._log_info("Settings reset fields were populated.")
@@ -1185,13 +1334,13 @@ class UnifiedToolApp:
             self._log_info(f"Settings automation failure: {exc}")
 
     def run_standard_automation(self):
-        if not AUTOMATION_READY:
-            self._log_info("Automation unavailable due to missing libraries.")
+        auto = self._automation_modules()
+        if auto is None:
             return
 
         password = self.generate_ui()
         self._log_info("Standard reset started.")
-        windows = gw.getWindowsWithTitle("Authentication")
+        windows = auto.gw.getWindowsWithTitle("Authentication")
         target = next((window for window in windows if 500 < window.width < 700), None)
 
         if not target:
@@ -1201,33 +1350,33 @@ class UnifiedToolApp:
         target.activate()
         time.sleep(0.5)
 
-        pyautogui.click(target.left + 350, target.top + 215)
-        pyautogui.hotkey("ctrl", "a")
-        pyautogui.press("backspace")
-        pyautogui.write(password, interval=0.01)
-        pyautogui.press("tab")
-        pyautogui.hotkey("ctrl", "a")
-        pyautogui.press("backspace")
-        pyautogui.write(password, interval=0.01)
-        pyautogui.press("enter")
+        auto.pyautogui.click(target.left + 350, target.top + 215)
+        auto.pyautogui.hotkey("ctrl", "a")
+        auto.pyautogui.press("backspace")
+        auto.pyautogui.write(password, interval=0.01)
+        auto.pyautogui.press("tab")
+        auto.pyautogui.hotkey("ctrl", "a")
+        auto.pyautogui.press("backspace")
+        auto.pyautogui.write(password, interval=0.01)
+        auto.pyautogui.press("enter")
 
         self.log_password(password, "Expired")
         self._log_info("Standard reset fields were populated.")
 
     def unlock_locked_screen(self):
-        if not AUTOMATION_READY:
-            self._log_info("Automation unavailable due to missing libraries.")
+        auto = self._automation_modules()
+        if auto is None:
             return
 
         self._log_info("Unlock flow started.")
-        password = pyperclip.paste()
+        password = auto.pyperclip.paste()
 
         try:
-            app = Application(backend="uia").connect(title_re=".*Locked.*", timeout=5)
+            app = auto.Application(backend="uia").connect(title_re=".*Locked.*", timeout=5)
             dialog = app.window(title_re=".*Locked.*")
             dialog.set_focus()
             dialog.child_window(auto_id="textBoxPassword", control_type="Edit").set_focus()
-            pyautogui.write(password, interval=0.01)
+            auto.pyautogui.write(password, interval=0.01)
             dialog.child_window(auto_id="buttonUnlock", control_type="Button").click()
             self.log_password(password, "Unlock")
             self._log_info("Unlock action sent.")
@@ -1235,19 +1384,19 @@ class UnifiedToolApp:
             self._log_info(f"Unlock failure: {exc}")
 
     def delayed_paste(self):
-        if not AUTOMATION_READY:
-            self._log_info("Automation unavailable due to missing libraries.")
+        auto = self._automation_modules()
+        if auto is None:
             return
 
         self._log_info("Pasting in 3 seconds.")
-        self.root.after(3000, lambda: pyautogui.write(pyperclip.paste(), interval=0.01))
+        self.root.after(3000, lambda: auto.pyautogui.write(auto.pyperclip.paste(), interval=0.01))
 
     def auto_detect_and_run(self):
-        if not AUTOMATION_READY:
-            self._log_info("Automation unavailable due to missing libraries.")
+        auto = self._automation_modules()
+        if auto is None:
             return
 
-        titles = [window.title for window in gw.getAllWindows()]
+        titles = [window.title for window in auto.gw.getAllWindows()]
         if any("Locked" in title for title in titles):
             self.unlock_locked_screen()
         elif any("Edit user" in title for title in titles):
@@ -1296,6 +1445,7 @@ class UnifiedToolApp:
         self._project_base = base
         self._git_repo_path = git_repo
         self._root_folders = root_folders
+        self._git_service = None
 
         # Refresh the read-only root folders display
         self._root_folders_text.delete("1.0", tk.END)
@@ -1330,17 +1480,22 @@ class UnifiedToolApp:
     # ── Log helpers ──────────────────────────────────────────────────────────
 
     def open_log(self):
-        if os.path.exists(LOG_FILE_PATH):
-            os.startfile(LOG_FILE_PATH)
+        if os.path.exists(self._journal_path):
+            os.startfile(self._journal_path)
 
     def clear_log(self):
-        for path in [LOG_FILE_PATH, DEBUG_LOG_PATH]:
-            with open(path, "w", encoding="utf-8") as handle:
-                handle.write("")
+        self._credentials().clear()
+        with open(self._debug_log_path, "w", encoding="utf-8") as handle:
+            handle.write("")
         self._log_info("Logs cleared.")
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # Headless batch mode: practice-admin.py wave.csv [--root DIR ...]
+        _base, root_folders, _git_repo = _load_paths_config()
+        sys.exit(run_batch_cli(sys.argv[1:], root_folders))
+
     tk_root = tk.Tk()
     app = UnifiedToolApp(tk_root)
     tk_root.mainloop()
@@ -0,0 +1,197 @@
+"""Cached, indexed access to the per-root ``Practice Count/work-items.json`` files.
+
+The create, validate and offboard paths all ask the same questions of these
+files ("is ODS X listed?", "add X", "drop X"). PracticeCountRegistry parses
+each file once, indexes it by ODS code and display name, and only reparses
+when the file's mtime or size changes underneath it.
+"""
+
+import json
+import os
+import re
+
+from work_items_store import atomic_write_json
+
+PRACTICE_COUNT_DIR = "Practice Count"
+WORK_ITEMS_FILE = "work-items.json"
+
+_ODS_SUFFIX_RE = re.compile(r"\s*\([A-Z0-9]+\)$", re.IGNORECASE)
+
+
+def normalize_ods(ods):
+    return str(ods or "").strip().upper()
+
+
+def normalize_practice_name(name):
+    """Mirror Format-PracticeName: drop a trailing "(ODS)" and upper-case."""
+    return _ODS_SUFFIX_RE.sub("", str(name or "")).strip().upper()
+
+
+def practice_count_path(root_folder):
+    return os.path.join(root_folder, PRACTICE_COUNT_DIR, WORK_ITEMS_FILE)
+
+
+def _payload(item):
+    payload = item.get("payload") if isinstance(item, dict) else None
+    return payload if isinstance(payload, dict) else {}
+
+
+def item_ods(item):
+    """Return the normalised ODS code of a work-item entry ("" if absent)."""
+    return normalize_ods(_payload(item).get("ods_code", ""))
+
+
+def item_display_name(item):
+    return normalize_practice_name(_payload(item).get("docman_practice_display_name", ""))
+
+
+def _file_stamp(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class PracticeCountFile:
+    """One root's Practice Count list, indexed by ODS code and display name.
+
+    Entries keep their on-disk order. Duplicate ODS entries are preserved on
+    save and removed together, matching the behaviour of the old list scans.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.exists = False
+        self.load_error = None
+        self._stamp = False  # never loaded
+        self._slots = {}
+        self._next_slot = 0
+        self._by_ods = {}
+        self._by_name = {}
+
+    # ── Loading ──────────────────────────────────────────────────────────
+
+    def refresh(self):
+        """Reload from disk if the file changed since it was last seen."""
+        stamp = _file_stamp(self.path)
+        if stamp == self._stamp:
+            return self
+        self._clear()
+        self._stamp = stamp
+        self.exists = stamp is not None
+        if not self.exists:
+            return self
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+            if not isinstance(data, list):
+                raise ValueError("expected a JSON list")
+        except Exception as exc:
+            self.load_error = exc
+            return self
+        for item in data:
+            self._insert(item)
+        return self
+
+    def _clear(self):
+        self.load_error = None
+        self._slots = {}
+        self._next_slot = 0
+        self._by_ods = {}
+        self._by_name = {}
+
+    def _insert(self, item):
+        slot = self._next_slot
+        self._next_slot += 1
+        self._slots[slot] = item
+        ods = item_ods(item)
+        if ods:
+            self._by_ods.setdefault(ods, []).append(slot)
+        name = item_display_name(item)
+        if name:
+            self._by_name.setdefault(name, set()).add(ods)
+        return slot
+
+    # ── Queries ──────────────────────────────────────────────────────────
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, ods):
+        return normalize_ods(ods) in self._by_ods
+
+    def get(self, ods):
+        slots = self._by_ods.get(normalize_ods(ods))
+        return self._slots[slots[0]] if slots else None
+
+    def ods_for_name(self, display_name):
+        """Return the set of ODS codes listed under a display name."""
+        return set(self._by_name.get(normalize_practice_name(display_name), ()))
+
+    def display_names(self):
+        return set(self._by_name)
+
+    def items(self):
+        return list(self._slots.values())
+
+    # ── Mutations (in memory until save) ─────────────────────────────────
+
+    def add(self, ods, display_name):
+        """Append an entry unless the ODS code is already listed."""
+        ods = normalize_ods(ods)
+        if ods in self._by_ods:
+            return False
+        self._insert({"payload": {"ods_code": ods, "docman_practice_display_name": display_name}})
+        return True
+
+    def remove(self, ods):
+        """Drop every entry for an ODS code; returns how many were removed."""
+        slots = self._by_ods.pop(normalize_ods(ods), [])
+        for slot in slots:
+            item = self._slots.pop(slot)
+            name = item_display_name(item)
+            codes = self._by_name.get(name)
+            if codes is not None:
+                codes.discard(item_ods(item))
+                if not codes:
+                    del self._by_name[name]
+        return len(slots)
+
+    def save(self, txn=None):
+        """Write the entries back, atomically.
+
+        With a WorkItemsTransaction the write is staged and only lands (and
+        updates the cached stamp) when the transaction commits.
+        """
+        if txn is not None:
+            txn.write_json(self.path, self.items(), on_commit=self._mark_saved)
+            return
+        atomic_write_json(self.path, self.items())
+        self._mark_saved()
+
+    def _mark_saved(self):
+        self.exists = True
+        self.load_error = None
+        self._stamp = _file_stamp(self.path)
+
+
+class PracticeCountRegistry:
+    """Process-wide cache of PracticeCountFile objects keyed by root folder."""
+
+    def __init__(self):
+        self._files = {}
+
+    def get(self, root_folder):
+        path = os.path.normcase(os.path.abspath(practice_count_path(root_folder)))
+        count_file = self._files.get(path)
+        if count_file is None:
+            count_file = self._files[path] = PracticeCountFile(practice_count_path(root_folder))
+        return count_file.refresh()
+
+    def invalidate(self, root_folder=None):
+        if root_folder is None:
+            self._files.clear()
+            return
+        path = os.path.normcase(os.path.abspath(practice_count_path(root_folder)))
+        self._files.pop(path, None)
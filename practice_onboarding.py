@@ -0,0 +1,489 @@
+"""Tk-free onboarding core shared by practice-admin.py and its batch CLI.
+
+Everything here works on plain paths and returns data; the GUI layer is
+responsible for showing the results.
+"""
+
+import argparse
+import csv
+import json
+import os
+from collections import namedtuple
+
+from practice_count import (
+    WORK_ITEMS_FILE,
+    PracticeCountRegistry,
+    item_ods,
+    normalize_ods,
+    practice_count_path,
+)
+from work_items_store import (
+    DEFAULT_LOCK_TIMEOUT,
+    LockTimeout,
+    TransactionError,
+    WorkItemsTransaction,
+    atomic_write_json,
+)
+
+SYSTEM_TYPES = ("Docman", "EMIS")
+
+PracticeRequest = namedtuple("PracticeRequest", ["practice_name", "ods", "system_type"])
+
+
+def practice_folder_name(practice_name, ods):
+    return f"{practice_name.title()} ({ods})"
+
+
+def make_request(practice_name, ods, system_type="Docman"):
+    practice_name = str(practice_name or "").strip()
+    ods = normalize_ods(ods)
+    system_type = str(system_type or "").strip() or "Docman"
+    if not practice_name or not ods:
+        raise ValueError("Practice name and ODS code are both required.")
+    match = next((s for s in SYSTEM_TYPES if s.lower() == system_type.lower()), None)
+    if match is None:
+        raise ValueError(f"Unknown system type '{system_type}' (expected one of {', '.join(SYSTEM_TYPES)}).")
+    return PracticeRequest(practice_name, ods, match)
+
+
+# ── Batch input ──────────────────────────────────────────────────────────────
+
+_NAME_KEYS = ("practice_name", "practice", "name")
+_ODS_KEYS = ("ods", "ods_code")
+_SYSTEM_KEYS = ("system_type", "system")
+
+
+def _pick(row, keys):
+    for key in keys:
+        if row.get(key) not in (None, ""):
+            return row[key]
+    return ""
+
+
+def _row_to_request(row, default_system):
+    row = {str(k).strip().lower(): v for k, v in row.items() if k is not None}
+    return make_request(
+        _pick(row, _NAME_KEYS),
+        _pick(row, _ODS_KEYS),
+        _pick(row, _SYSTEM_KEYS) or default_system,
+    )
+
+
+def load_batch_file(path, default_system="Docman", dropped=None):
+    """Parse a CSV or JSONL batch file into a list of PracticeRequest.
+
+    CSV files may have a header row (practice_name, ods, system_type) or be
+    plain ``name,ods[,system]`` rows. JSONL files hold one object per line
+    with the same keys. Duplicate ODS codes keep their first occurrence; pass
+    a list as ``dropped`` to get one message per row that was left out.
+    Raises ValueError with the offending line number on bad input.
+    """
+    requests = []
+    with open(path, "r", encoding="utf-8-sig", newline="") as handle:
+        if path.lower().endswith((".jsonl", ".ndjson")):
+            for line_no, line in enumerate(handle, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    requests.append((line_no, _row_to_request(json.loads(line), default_system)))
+                except (ValueError, AttributeError) as exc:
+                    raise ValueError(f"{path}:{line_no}: {exc}") from exc
+        else:
+            rows = [row for row in csv.reader(handle) if any(cell.strip() for cell in row)]
+            header = [cell.strip().lower() for cell in rows[0]] if rows else []
+            has_header = any(key in header for key in _NAME_KEYS + _ODS_KEYS)
+            start = 2 if has_header else 1
+            for line_no, row in enumerate(rows[1:] if has_header else rows, start=start):
+                if not has_header:
+                    row = dict(zip(("practice_name", "ods", "system_type"), row))
+                else:
+                    row = dict(zip(header, row))
+                try:
+                    requests.append((line_no, _row_to_request(row, default_system)))
+                except ValueError as exc:
+                    raise ValueError(f"{path}:{line_no}: {exc}") from exc
+
+    first = {}
+    unique = []
+    for line_no, request in requests:
+        if request.ods in first:
+            if dropped is not None:
+                kept_line, kept = first[request.ods]
+                same = "a repeat of" if kept == request else "conflicts with"
+                dropped.append(
+                    f"{os.path.basename(path)}:{line_no}: {request.practice_name} ({request.ods}, "
+                    f"{request.system_type}) {same} line {kept_line}: {kept.practice_name} ({kept.system_type})"
+                )
+            continue
+        first[request.ods] = (line_no, request)
+        unique.append(request)
+    return unique
+
+
+# ── Onboarding ───────────────────────────────────────────────────────────────
+
+class OnboardingSummary:
+    def __init__(self, practices):
+        self.practices = list(practices)
+        self.folders_created = 0
+        self.practice_files_written = 0
+        self.counts_updated = 0
+        self.count_entries_added = 0
+        self.notes = []
+        self.failures = []
+        self.failed_ods = set()
+        self.dropped = []
+
+    @property
+    def ok(self):
+        return not self.failures
+
+    @property
+    def succeeded(self):
+        """Practices no failure was recorded against."""
+        return [request for request in self.practices if request.ods not in self.failed_ods]
+
+    def fail(self, where, exc, practices=()):
+        self.failures.append(f"{where}: {exc}")
+        self.failed_ods.update(request.ods for request in practices)
+
+    def lines(self, title=None):
+        if title is None:
+            if len(self.practices) == 1:
+                p = self.practices[0]
+                title = f"Onboarding Summary for {p.practice_name} ({p.system_type})"
+            else:
+                title = f"Batch Onboarding Summary ({len(self.practices)} practices)"
+        lines = [
+            title,
+            f"Folders created: {self.folders_created}",
+            f"Practice Count updates: {self.counts_updated}",
+        ]
+        if len(self.practices) > 1:
+            lines.append(f"Practice files written: {self.practice_files_written}")
+            lines.append(f"Practice Count entries added: {self.count_entries_added}")
+        if self.dropped:
+            lines.append("")
+            lines.append(f"Dropped duplicate ODS rows ({len(self.dropped)}):")
+            lines.extend(self.dropped)
+        if self.failures:
+            lines.append("")
+            lines.append(f"Failures ({len(self.failures)}):")
+            lines.extend(self.failures)
+        if self.notes:
+            lines.append("")
+            lines.append("Details:")
+            lines.extend(self.notes)
+        return lines
+
+
+def _write_practice_file(root_folder, request, summary):
+    practice_folder = os.path.join(root_folder, practice_folder_name(request.practice_name, request.ods))
+    if not os.path.exists(practice_folder):
+        os.makedirs(practice_folder, exist_ok=True)
+        summary.folders_created += 1
+        summary.notes.append(f"Created folder: {practice_folder}")
+    elif not os.path.isdir(practice_folder):
+        raise RuntimeError(f"A file exists with the folder name: {practice_folder}")
+
+    atomic_write_json(os.path.join(practice_folder, WORK_ITEMS_FILE), [{"payload": {"ods_code": request.ods}}])
+    summary.practice_files_written += 1
+
+
+def onboard_practices(root_folders, practices, stop_on_error=False, registry=None,
+                      lock_timeout=DEFAULT_LOCK_TIMEOUT, dropped=()):
+    """Create practice folders and Practice Count entries for every practice.
+
+    Practice files are written atomically. All roots' Practice Count files
+    are then updated in one locked transaction: each is read once (under its
+    lock) and written at most once, and a failed write rolls every root back.
+    A Practice Count file that is not valid JSON is reported and left alone
+    rather than reset. Failures are collected in the returned
+    OnboardingSummary; with ``stop_on_error`` the first failure aborts the
+    remaining work instead. ``dropped`` (from load_batch_file) is listed in
+    the summary so left-out batch rows are not lost silently.
+    """
+    registry = registry or PracticeCountRegistry()
+    summary = OnboardingSummary(practices)
+    summary.dropped = list(dropped)
+    docman_by_root = {}
+
+    for root_folder in root_folders:
+        if not os.path.isdir(root_folder):
+            summary.notes.append(f"Skipped missing root folder: {root_folder}")
+            continue
+
+        docman = []
+        for request in summary.practices:
+            try:
+                _write_practice_file(root_folder, request, summary)
+            except Exception as exc:
+                summary.fail(f"{request.ods} in {root_folder}", exc, [request])
+                if stop_on_error:
+                    return summary
+                continue
+            if request.system_type == "Docman":
+                docman.append(request)
+            else:
+                summary.notes.append(f"{root_folder}: skipped Practice Count update for {request.ods} (EMIS mode)")
+        if docman:
+            docman_by_root[root_folder] = docman
+
+    if not docman_by_root:
+        return summary
+
+    pending = []
+    try:
+        with WorkItemsTransaction(
+            [practice_count_path(root) for root in docman_by_root], timeout=lock_timeout
+        ) as txn:
+            count_files = {root: registry.get(root) for root in docman_by_root}
+            for root_folder, count_file in count_files.items():
+                if count_file.load_error is not None:
+                    summary.fail(count_file.path, f"invalid JSON, not overwritten ({count_file.load_error})",
+                                 docman_by_root[root_folder])
+            if stop_on_error and not summary.ok:
+                return summary
+
+            for root_folder, docman in docman_by_root.items():
+                count_file = count_files[root_folder]
+                if count_file.load_error is not None:
+                    continue
+                added = 0
+                for request in docman:
+                    if count_file.add(request.ods, request.practice_name.upper()):
+                        added += 1
+                    else:
+                        summary.notes.append(f"ODS {request.ods} already exists in Practice Count at {root_folder}")
+                if added:
+                    count_file.save(txn)
+                    pending.append(added)
+    except Exception as exc:
+        for root_folder in docman_by_root:
+            registry.invalidate(root_folder)
+        summary.fail("Practice Count update", exc, [r for docman in docman_by_root.values() for r in docman])
+        return summary
+
+    summary.counts_updated += len(pending)
+    summary.count_entries_added += sum(pending)
+    return summary
+
+
+def offboard_practice(root_folders, ods, registry=None, lock_timeout=DEFAULT_LOCK_TIMEOUT):
+    """Remove an ODS code from every root's Practice Count file.
+
+    All files are updated in one locked transaction. Returns the number of
+    files changed. Raises RuntimeError naming the file if one cannot be read,
+    and nothing is written in that case.
+    """
+    registry = registry or PracticeCountRegistry()
+    paths = [practice_count_path(root) for root in root_folders]
+    removed = 0
+    try:
+        with WorkItemsTransaction(paths, timeout=lock_timeout) as txn:
+            for root_folder in root_folders:
+                count_file = registry.get(root_folder)
+                if not count_file.exists:
+                    continue
+                if count_file.load_error is not None:
+                    raise RuntimeError(f"Failed to update {count_file.path}: {count_file.load_error}")
+                if count_file.remove(ods):
+                    count_file.save(txn)
+                    removed += 1
+    except (LockTimeout, TransactionError, OSError) as exc:
+        for root_folder in root_folders:
+            registry.invalidate(root_folder)
+        raise RuntimeError(f"Failed to update Practice Count files: {exc}") from exc
+    except RuntimeError:
+        for root_folder in root_folders:
+            registry.invalidate(root_folder)
+        raise
+    return removed
+
+
+def validate_creation(root_folders, practices, registry=None):
+    """Check that each practice's files exist and agree with its ODS code.
+
+    Returns (passed, issues, notes).
+    """
+    registry = registry or PracticeCountRegistry()
+    passed = 0
+    issues = 0
+    notes = []
+    practices = list(practices)
+
+    for root_folder in root_folders:
+        if not os.path.isdir(root_folder):
+            notes.append(f"Skipped missing root folder: {root_folder}")
+            continue
+
+        root_label = os.path.basename(root_folder)
+
+        for request in practices:
+            practice_file = os.path.join(
+                root_folder, practice_folder_name(request.practice_name, request.ods), WORK_ITEMS_FILE
+            )
+            if not os.path.exists(practice_file):
+                issues += 1
+                notes.append(f"[{root_label}] Missing practice file: {practice_file}")
+                continue
+
+            try:
+                with open(practice_file, "r", encoding="utf-8") as handle:
+                    practice_data = json.load(handle)
+                first_item = practice_data[0] if isinstance(practice_data, list) and practice_data else {}
+                file_ods = item_ods(first_item)
+            except Exception as exc:
+                issues += 1
+                notes.append(f"[{root_label}] Invalid practice JSON: {exc}")
+                continue
+
+            if file_ods == request.ods:
+                passed += 1
+            else:
+                issues += 1
+                notes.append(f"[{root_label}] ODS mismatch in practice file (found: {file_ods or '[None]'})")
+
+            if request.system_type != "Docman":
+                continue
+
+            count_file = registry.get(root_folder)
+            if not count_file.exists:
+                issues += 1
+                notes.append(f"[{root_label}] Missing Practice Count file: {count_file.path}")
+            elif count_file.load_error is not None:
+                issues += 1
+                notes.append(f"[{root_label}] Invalid Practice Count JSON: {count_file.load_error}")
+            elif request.ods in count_file:
+                passed += 1
+            else:
+                issues += 1
+                notes.append(f"[{root_label}] ODS {request.ods} not found in Practice Count.")
+
+    if any(request.system_type != "Docman" for request in practices):
+        notes.append("Practice Count check skipped for EMIS mode.")
+
+    return passed, issues, notes
+
+
+# ── Pending git changes ──────────────────────────────────────────────────────
+
+class PendingChanges:
+    """Onboardings/offboardings made since the last git commit, keyed by ODS.
+
+    Only the latest action per ODS code is kept, so onboarding and then
+    offboarding the same practice before a push is reported as an offboard.
+    """
+
+    ONBOARD = "onboard"
+    OFFBOARD = "offboard"
+
+    def __init__(self):
+        self._changes = {}
+
+    def __len__(self):
+        return len(self._changes)
+
+    def record_onboard(self, practices):
+        for request in practices:
+            self._changes.pop(request.ods, None)
+            self._changes[request.ods] = (self.ONBOARD, request.practice_name)
+
+    def record_offboard(self, ods):
+        ods = normalize_ods(ods)
+        self._changes.pop(ods, None)
+        self._changes[ods] = (self.OFFBOARD, "")
+
+    def snapshot(self):
+        return dict(self._changes)
+
+    def discard(self, snapshot):
+        """Forget the entries in snapshot that have not changed since it was taken."""
+        for ods, change in snapshot.items():
+            if self._changes.get(ods) == change:
+                del self._changes[ods]
+
+    @classmethod
+    def split(cls, snapshot):
+        onboarded = [(ods, name) for ods, (action, name) in snapshot.items() if action == cls.ONBOARD]
+        offboarded = [ods for ods, (action, _name) in snapshot.items() if action == cls.OFFBOARD]
+        return onboarded, offboarded
+
+
+def batch_branch_name(now):
+    return f"onboard/batch-{now:%Y%m%d-%H%M}"
+
+
+def batch_commit_message(snapshot):
+    """Return (subject, body) describing every pending onboarding/offboarding."""
+    onboarded, offboarded = PendingChanges.split(snapshot)
+    parts = []
+    if onboarded:
+        parts.append(f"Onboarded {len(onboarded)}")
+    if offboarded:
+        parts.append(f"offboarded {len(offboarded)}" if parts else f"Offboarded {len(offboarded)}")
+    subject = (" and ".join(parts) or "No practice changes") + " practice(s)"
+
+    body = []
+    if onboarded:
+        body.append("Onboarded:")
+        body.extend(f"- {ods} {name}" for ods, name in onboarded)
+    if offboarded:
+        if body:
+            body.append("")
+        body.append("Offboarded:")
+        body.extend(f"- {ods}" for ods in offboarded)
+    return subject, "\n".join(body)
+
+
+# ── CLI ──────────────────────────────────────────────────────────────────────
+
+def run_batch_cli(argv, default_root_folders):
+    parser = argparse.ArgumentParser(
+        prog="practice-admin",
+        description="Onboard a wave of practices into every work-items-in root in one pass.",
+    )
+    parser.add_argument("batch_file", help="CSV or JSONL file of practice_name, ods, system_type rows")
+    parser.add_argument(
+        "--root",
+        action="append",
+        dest="root_folders",
+        help="work-items-in root folder (repeatable; defaults to the saved paths config)",
+    )
+    parser.add_argument("--system", default="Docman", choices=SYSTEM_TYPES,
+                        help="system type for rows that do not specify one")
+    parser.add_argument("--stop-on-error", action="store_true",
+                        help="abort the batch at the first failure")
+    parser.add_argument("--no-validate", action="store_true",
+                        help="skip the post-creation consistency check")
+    args = parser.parse_args(argv)
+
+    dropped = []
+    try:
+        practices = load_batch_file(args.batch_file, default_system=args.system, dropped=dropped)
+    except (OSError, ValueError) as exc:
+        print(f"Could not read batch file: {exc}")
+        return 2
+    if not practices:
+        print("Batch file contains no practices.")
+        return 2
+
+    root_folders = args.root_folders or list(default_root_folders)
+    registry = PracticeCountRegistry()
+    summary = onboard_practices(root_folders, practices, stop_on_error=args.stop_on_error, registry=registry,
+                                dropped=dropped)
+    print("\n".join(summary.lines()))
+
+    issues = 0
+    if not args.no_validate:
+        passed, issues, notes = validate_creation(root_folders, practices, registry=registry)
+        print("")
+        print("Current Creation Check:")
+        if issues == 0:
+            print(f"Passed ({passed} checks).")
+        else:
+            print(f"Completed with {issues} issue(s) ({passed} checks passed).")
+        for note in notes:
+            print(note)
+
+    return 0 if summary.ok and issues == 0 else 1
@@ -0,0 +1,274 @@
+"""Background task execution for the practice-admin UI.
+
+Tasks run on worker threads, one executor per *lane*: tasks in the same lane
+run one after another (so, say, two git flows never interleave), while
+different lanes run concurrently. Workers never touch Tk. Everything they
+report (log lines, progress, state changes, completion) goes through a
+thread-safe queue that the UI drains on the main thread with ``poll()``.
+
+Inside a task, ``current_task()`` returns its TaskContext, and
+``TaskContext.run`` starts a subprocess whose stdout/stderr are streamed
+line by line while the process runs and can be cancelled.
+"""
+
+import itertools
+import queue
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+_local = threading.local()
+
+
+class TaskCancelled(Exception):
+    pass
+
+
+def current_task():
+    """Return the TaskContext of the task running on this thread, if any."""
+    return getattr(_local, "context", None)
+
+
+class TaskHandle:
+    def __init__(self, task_id, name, lane):
+        self.id = task_id
+        self.name = name
+        self.lane = lane
+        self.status = QUEUED
+        self.progress = None
+        self.progress_text = ""
+        self.result = None
+        self.error = None
+        self.created = time.monotonic()
+        self.started = None
+        self.finished = None
+        self._cancel = threading.Event()
+        self._processes = set()
+        self._lock = threading.Lock()
+
+    @property
+    def active(self):
+        return self.status in (QUEUED, RUNNING)
+
+    @property
+    def cancel_requested(self):
+        return self._cancel.is_set()
+
+    @property
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.monotonic()) - self.started
+
+    def cancel(self):
+        """Ask the task to stop; any subprocess it is running is terminated."""
+        self._cancel.set()
+        with self._lock:
+            processes = list(self._processes)
+        for proc in processes:
+            try:
+                proc.terminate()
+            except OSError:
+                pass
+
+    def describe(self):
+        text = f"#{self.id} {self.name} [{self.status}]"
+        if self.status == RUNNING:
+            if self.progress is not None:
+                text += f" {int(self.progress * 100)}%"
+            if self.progress_text:
+                text += f" {self.progress_text}"
+            text += f" ({self.elapsed:.0f}s)"
+        return text
+
+
+class TaskContext:
+    """Handed to task functions; the only way a task talks to the UI."""
+
+    def __init__(self, runner, handle):
+        self._runner = runner
+        self.handle = handle
+
+    @property
+    def cancelled(self):
+        return self.handle.cancel_requested
+
+    def check_cancelled(self):
+        if self.handle.cancel_requested:
+            raise TaskCancelled(f"{self.handle.name} cancelled")
+
+    def log(self, line):
+        self._runner._emit("log", self.handle, line)
+
+    def progress(self, fraction=None, text=""):
+        self.handle.progress = fraction
+        self.handle.progress_text = text
+        self._runner._emit("state", self.handle)
+
+    def run(self, args, cwd=None, echo=True):
+        """Run a subprocess, streaming its output; returns CompletedProcess.
+
+        stdout and stderr are both collected (as subprocess.run would) and,
+        with ``echo``, forwarded to the log as they arrive. Raises
+        TaskCancelled if the task is cancelled while the process runs.
+        """
+        self.check_cancelled()
+        proc = subprocess.Popen(
+            args,
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            stdin=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+            shell=False,
+        )
+        with self.handle._lock:
+            self.handle._processes.add(proc)
+        collected = {"stdout": [], "stderr": []}
+
+        def pump(stream, key):
+            for line in iter(stream.readline, ""):
+                collected[key].append(line)
+                if echo and line.strip():
+                    self.log(line.rstrip())
+            stream.close()
+
+        readers = [
+            threading.Thread(target=pump, args=(proc.stdout, "stdout"), daemon=True),
+            threading.Thread(target=pump, args=(proc.stderr, "stderr"), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+        try:
+            while True:
+                try:
+                    proc.wait(timeout=0.1)
+                    break
+                except subprocess.TimeoutExpired:
+                    if self.handle.cancel_requested:
+                        proc.terminate()
+                        try:
+                            proc.wait(timeout=3)
+                        except subprocess.TimeoutExpired:
+                            proc.kill()
+                            proc.wait()
+                        break
+            for reader in readers:
+                reader.join()
+        finally:
+            with self.handle._lock:
+                self.handle._processes.discard(proc)
+
+        self.check_cancelled()
+        return subprocess.CompletedProcess(
+            args, proc.returncode, "".join(collected["stdout"]), "".join(collected["stderr"])
+        )
+
+
+class TaskRunner:
+    def __init__(self, lanes=None, history=20):
+        self._lane_workers = dict(lanes or {})
+        self._executors = {}
+        self._events = queue.Queue()
+        self._ids = itertools.count(1)
+        self._tasks = []
+        self._history = history
+        self._callbacks = {}
+        self._lock = threading.Lock()
+
+    def _executor(self, lane):
+        with self._lock:
+            executor = self._executors.get(lane)
+            if executor is None:
+                executor = self._executors[lane] = ThreadPoolExecutor(
+                    max_workers=self._lane_workers.get(lane, 1), thread_name_prefix=f"task-{lane}"
+                )
+            return executor
+
+    def _emit(self, kind, handle, payload=None):
+        self._events.put((kind, handle, payload))
+
+    def submit(self, name, fn, *args, lane="default", on_done=None, **kwargs):
+        """Queue fn(ctx, *args, **kwargs) and return its TaskHandle.
+
+        ``on_done(handle)`` is called from ``poll()`` (i.e. on the UI thread)
+        once the task finishes, fails or is cancelled.
+        """
+        handle = TaskHandle(next(self._ids), name, lane)
+        with self._lock:
+            self._tasks.append(handle)
+            if on_done is not None:
+                self._callbacks[handle.id] = on_done
+        self._emit("state", handle)
+        self._executor(lane).submit(self._run, handle, fn, args, kwargs)
+        return handle
+
+    def _run(self, handle, fn, args, kwargs):
+        context = TaskContext(self, handle)
+        _local.context = context
+        handle.started = time.monotonic()
+        try:
+            if handle.cancel_requested:
+                raise TaskCancelled(f"{handle.name} cancelled")
+            handle.status = RUNNING
+            self._emit("state", handle)
+            handle.result = fn(context, *args, **kwargs)
+            handle.status = DONE
+        except TaskCancelled as exc:
+            handle.error = exc
+            handle.status = CANCELLED
+        except Exception as exc:
+            handle.error = exc
+            handle.status = FAILED
+        finally:
+            handle.finished = time.monotonic()
+            _local.context = None
+            self._emit("done", handle)
+
+    def poll(self, on_log=None, on_state=None, limit=500):
+        """Drain pending events on the UI thread. Returns True if any arrived."""
+        seen = False
+        for _ in range(limit):
+            try:
+                kind, handle, payload = self._events.get_nowait()
+            except queue.Empty:
+                break
+            seen = True
+            if kind == "log":
+                if on_log is not None:
+                    on_log(payload)
+                continue
+            if kind == "done":
+                with self._lock:
+                    callback = self._callbacks.pop(handle.id, None)
+                    finished = [t for t in self._tasks if not t.active]
+                    for stale in finished[:-self._history or None]:
+                        self._tasks.remove(stale)
+                if callback is not None:
+                    callback(handle)
+            if on_state is not None:
+                on_state(handle)
+        return seen
+
+    def tasks(self, include_finished=False):
+        with self._lock:
+            return [t for t in self._tasks if include_finished or t.active]
+
+    def cancel_all(self):
+        for handle in self.tasks():
+            handle.cancel()
+
+    def shutdown(self, wait=False):
+        self.cancel_all()
+        with self._lock:
+            executors = list(self._executors.values())
+        for executor in executors:
+            executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,54 @@
+import asyncio
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from adaptiveWait import FLOOR_MS, MIN_SAMPLES, LatencyTracker, race
+
+
+def test_timeout_is_learned_from_p95_within_floor_and_default():
+    tracker = LatencyTracker()
+    for _ in range(MIN_SAMPLES - 1):
+        tracker.record("saved", 100)
+    assert tracker.timeout_ms("saved", 3000) == 3000
+    tracker.record("saved", 100)
+    assert tracker.timeout_ms("saved", 3000) == 100 * 4 + 250
+
+    for _ in range(MIN_SAMPLES):
+        tracker.record("fast", 10)
+        tracker.record("slow", 2000)
+    assert tracker.timeout_ms("fast", 3000) == FLOOR_MS
+    assert tracker.timeout_ms("slow", 3000) == 3000
+    assert tracker.snapshot()["saved"] == (MIN_SAMPLES, 100, 100)
+
+
+def test_timeout_restores_the_default_until_a_wait_succeeds():
+    tracker = LatencyTracker(min_samples=1)
+    tracker.record("saved", 100)
+    tracker.record_timeout("saved")
+    assert tracker.timeout_ms("saved", 3000) == 3000
+    assert tracker.snapshot()["saved"] == (1, 100, 100)
+    tracker.record("saved", 100)
+    assert tracker.timeout_ms("saved", 3000) == 650
+
+
+class OutcomePage:
+    def __init__(self, visible=()):
+        self.visible = set(visible)
+        self.waited = None
+
+    async def wait_for_selector(self, selector, state=None, timeout=None):
+        self.waited = (selector, state, timeout)
+        if not self.visible:
+            raise PlaywrightTimeoutError(selector)
+
+    async def is_visible(self, selector):
+        return selector in self.visible
+
+
+def test_race_returns_the_first_listed_visible_outcome():
+    outcomes = {"duplicate": "div.modal", "listed": "li.folder"}
+    page = OutcomePage(visible={"li.folder", "div.modal"})
+    assert asyncio.run(race(page, outcomes, 1200)) == "duplicate"
+    assert page.waited == ("div.modal, li.folder", "visible", 1200)
+    assert asyncio.run(race(OutcomePage(visible={"li.folder"}), outcomes, 1200)) == "listed"
+    assert asyncio.run(race(OutcomePage(), outcomes, 1200)) is None
@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from browserPool import DEFAULT_MAX_JOBS, DEFAULT_SIZE, DISCONNECTED, MAX_JOBS, BrowserPool, pool_settings
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.contexts = 0
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **kwargs):
+        self.contexts += 1
+        return FakeContext()
+
+    async def close(self):
+        self.connected = False
+
+
+class FakeContext:
+    async def close(self):
+        pass
+
+
+class FakePlaywright:
+    def __init__(self):
+        self.chromium = self
+        self.launched = []
+
+    async def launch(self, headless=True, executable_path=None):
+        browser = FakeBrowser()
+        self.launched.append(browser)
+        return browser
+
+
+def test_pool_settings_defaults(monkeypatch):
+    for name in ("DOCMAN_POOL_BROWSERS", "DOCMAN_POOL_MAX_JOBS", "DOCMAN_POOL_MAX_RSS_MB"):
+        monkeypatch.delenv(name, raising=False)
+    assert pool_settings() == {"size": DEFAULT_SIZE, "max_jobs": DEFAULT_MAX_JOBS, "max_rss_mb": None}
+    monkeypatch.setenv("DOCMAN_POOL_BROWSERS", " 3 ")
+    monkeypatch.setenv("DOCMAN_POOL_MAX_RSS_MB", "512.5")
+    assert pool_settings() == {"size": 3, "max_jobs": DEFAULT_MAX_JOBS, "max_rss_mb": 512.5}
+
+
+@pytest.mark.parametrize("name, value, message", [
+    ("DOCMAN_POOL_BROWSERS", "two", "must be a number"),
+    ("DOCMAN_POOL_BROWSERS", "0", "must be greater than 0"),
+    ("DOCMAN_POOL_MAX_JOBS", "-1", "must be greater than 0"),
+    ("DOCMAN_POOL_MAX_RSS_MB", "nan", "must be greater than 0"),
+])
+def test_pool_settings_reject_bad_values(monkeypatch, name, value, message):
+    monkeypatch.setenv(name, value)
+    with pytest.raises(ValueError, match=f"{name} {message}"):
+        pool_settings()
+
+
+def test_browsers_are_recycled_after_max_jobs():
+    playwright = FakePlaywright()
+
+    async def wave():
+        pool = BrowserPool(playwright, size=1, max_jobs=2)
+        await pool.start()
+        for _ in range(5):
+            async with pool.context():
+                pass
+        await pool.close()
+        return pool.stats
+
+    stats = asyncio.run(wave())
+    assert [browser.contexts for browser in playwright.launched] == [2, 2, 1]
+    assert stats.recycled[MAX_JOBS] == 2
+    assert stats.hits + stats.misses == 5
+
+
+def test_disconnected_browser_is_replaced():
+    playwright = FakePlaywright()
+
+    async def wave():
+        pool = BrowserPool(playwright, size=1, max_jobs=None)
+        await pool.start()
+        playwright.launched[0].connected = False
+        async with pool.context():
+            pass
+        await pool.close()
+        return pool.stats
+
+    stats = asyncio.run(wave())
+    assert len(playwright.launched) == 2
+    assert playwright.launched[1].contexts == 1
+    assert stats.recycled[DISCONNECTED] == 1
@@ -0,0 +1,42 @@
+import json
+
+from credential_journal import CredentialJournal
+
+
+def _counting(journal):
+    calls = []
+    compact = journal._compact_locked
+
+    def counted(keep):
+        calls.append(keep)
+        return compact(keep)
+
+    journal._compact_locked = counted
+    return calls
+
+
+def test_auto_compaction_does_not_repeat_once_kept_entries_pass_threshold(tmp_path):
+    journal = CredentialJournal(str(tmp_path / "journal.jsonl"), lock_dir=str(tmp_path), auto_compact=500, keep=5)
+    for _round in range(5):
+        journal.append_many([("Expired", f"pw-{n}", f"A{n:05d}") for n in range(200)])
+    # 200 practices x keep=5 leaves 1000 entries, already past auto_compact
+    assert len(journal) == 1000
+
+    calls = _counting(journal)
+    for n in range(50):
+        journal.append("Expired", f"again-{n}", f"A{n:05d}")
+    assert len(calls) <= 1
+    assert journal.latest(ods="A00049").password == "again-49"
+
+
+def test_corrupt_seq_does_not_stop_the_journal_opening(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    path.write_text(
+        json.dumps({"seq": "x", "context": "Expired", "ods": "A1", "password": "old"}) + "\n"
+        + json.dumps({"seq": 2, "context": "Expired", "ods": "A2", "password": "new"}) + "\n",
+        encoding="utf-8",
+    )
+    journal = CredentialJournal(str(path), lock_dir=str(tmp_path))
+    assert len(journal) == 2
+    assert journal.latest(ods="A1").password == "old"
+    assert journal.append("Expired", "next", "A1").seq == 3
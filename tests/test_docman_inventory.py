@@ -0,0 +1,59 @@
+import asyncio
+
+from docmanInventory import (
+    CREATED,
+    FAILED,
+    FOLDER_LIST,
+    SKIPPED,
+    OnboardingReport,
+    existing_names,
+    normalize_name,
+    plan,
+)
+
+
+class ListPage:
+    """Answers eval_on_selector_all for one list: its container (if present) and the names in it."""
+
+    def __init__(self, names=(), container=True):
+        self.names = list(names)
+        self.container = container
+
+    async def eval_on_selector_all(self, selector, js):
+        if selector == FOLDER_LIST.items:
+            return list(self.names)
+        assert selector == FOLDER_LIST.container
+        return 1 if self.container else 0
+
+
+def test_existing_names_are_normalised():
+    page = ListPage(["  BetterLetter:\n Filing ", "Other", " "])
+    assert asyncio.run(existing_names(page, FOLDER_LIST)) == {"betterletter: filing", "other"}
+
+
+def test_empty_list_is_not_the_same_as_a_missing_list():
+    assert asyncio.run(existing_names(ListPage(), FOLDER_LIST)) == set()
+    assert asyncio.run(existing_names(ListPage(container=False), FOLDER_LIST)) is None
+
+
+def test_plan_keeps_request_order_and_drops_repeats():
+    existing = {normalize_name("BetterLetter GPs")}
+    missing, present = plan(["BetterLetter Filing", "betterletter  gps", "BetterLetter Filing", "B"], existing)
+    assert missing == ["BetterLetter Filing", "B"]
+    assert present == ["betterletter  gps"]
+
+
+def test_plan_without_an_inventory_creates_everything():
+    assert plan(["A", "B"], None) == (["A", "B"], [])
+
+
+def test_report_marks_unavailable_inventory_and_clears_retried_failures():
+    report = OnboardingReport("A12345")
+    folders = report.step("Folders")
+    folders.record(FAILED, "F1", "timed out")
+    folders.record(CREATED, "F1")
+    folders.record(SKIPPED, "F2")
+    folders.inventory_unavailable = True
+    assert report.step("Folders") is folders
+    assert report.failures == []
+    assert folders.line() == "Folders: 1 created, 1 skipped, 0 failed (inventory unavailable)"
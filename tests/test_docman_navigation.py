@@ -0,0 +1,150 @@
+import asyncio
+import json
+import logging
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from docmanNavigation import (
+    CACHE_VERSION,
+    FOLDERS_TOP_LEVEL,
+    MAX_FAILURES,
+    SHARED_AFTER,
+    USER_GROUPS,
+    VIEWS,
+    NavigationCache,
+    Navigator,
+)
+
+LOGGER = logging.getLogger("test_docman_navigation")
+SITE = "docman.test|b1"
+PAGES = {FOLDERS_TOP_LEVEL: "/Filing/TopLevel", USER_GROUPS: "/Users/Groups", VIEWS: "/Tasks/Views"}
+
+
+class SettingsPage:
+    """Docman settings menus: a route's last menu link, or its deep link, opens its page."""
+
+    def __init__(self, moved=(), org=None):
+        self.url = "http://docman.test/Home"
+        self.moved = set(moved)
+        self.org = org
+        self.clicks = []
+        self.gotos = []
+
+    async def evaluate(self, js):
+        return "b1"
+
+    async def goto(self, url):
+        self.gotos.append(url)
+        self.url = url
+        if any(url.endswith(PAGES[route]) for route in self.moved):
+            self.url = "http://docman.test/NotFound"
+
+    async def click(self, selector):
+        self.clicks.append(selector)
+        for route, path in PAGES.items():
+            if selector == route.chain[-1]:
+                self.url = "http://docman.test" + path + (f"?org={self.org}" if self.org else "")
+
+    async def wait_for_selector(self, selector, timeout=None):
+        route = next(route for route in PAGES if route.ready == selector)
+        if self.url.split("?")[0] != "http://docman.test" + PAGES[route]:
+            raise PlaywrightTimeoutError(selector)
+
+
+def _visit(cache, ods, routes=(FOLDERS_TOP_LEVEL, USER_GROUPS, VIEWS), **page_options):
+    page = SettingsPage(**page_options)
+    navigator = Navigator(page, LOGGER, cache)
+    navigator.start(ods)
+
+    async def run():
+        for route in routes:
+            await navigator.goto(route)
+
+    asyncio.run(run())
+    return navigator, page
+
+
+def test_url_is_shared_once_enough_practices_land_on_it(tmp_path):
+    cache = NavigationCache(str(tmp_path / "nav.json"))
+    cache.learn(SITE, "views", "/Tasks/Views", "A1")
+    assert cache.lookup(SITE, "views", "A1") == "/Tasks/Views"
+    assert cache.lookup(SITE, "views", "B1") is None
+    for n in range(2, SHARED_AFTER + 1):
+        cache.learn(SITE, "views", "/Tasks/Views", f"P{n}")
+    assert cache.lookup(SITE, "views", "B1") == "/Tasks/Views"
+    # Learning without an ODS code cannot tell a shared URL from a practice's own
+    cache.learn(SITE, "user_groups", "/Users/Groups", None)
+    assert cache.lookup(SITE, "user_groups", "A1") is None
+
+    saved = json.load(open(cache.path))
+    assert saved["version"] == CACHE_VERSION
+    assert len(saved["sites"][SITE]["views"]["seen"]) == SHARED_AFTER
+
+
+def test_url_that_differs_per_practice_is_pinned(tmp_path):
+    cache = NavigationCache(str(tmp_path / "nav.json"))
+    cache.learn(SITE, "user_groups", "/Users/Groups?org=A1", "A1")
+    cache.learn(SITE, "user_groups", "/Users/Groups?org=B1", "B1")
+    assert cache.pinned(SITE, "user_groups")
+    assert cache.lookup(SITE, "user_groups", "A1") is None
+
+
+def test_failures_pin_the_route_until_confirmed(tmp_path):
+    cache = NavigationCache(str(tmp_path / "nav.json"))
+    cache.learn(SITE, "views", "/Tasks/Views", "A1")
+    cache.forget(SITE, "views")
+    cache.confirm(SITE, "views")
+    for _ in range(MAX_FAILURES - 1):
+        cache.forget(SITE, "views")
+    assert cache.lookup(SITE, "views", "A1") == "/Tasks/Views"
+    cache.forget(SITE, "views")
+    assert cache.pinned(SITE, "views")
+    assert cache.lookup(SITE, "views", "A1") is None
+
+
+def test_one_url_for_several_pages_is_not_learned(tmp_path):
+    cache = NavigationCache(str(tmp_path / "nav.json"))
+    cache.learn(SITE, "views", "/App", "A1")
+    cache.learn(SITE, "user_groups", "/App", "A1")
+    assert cache.lookup(SITE, "user_groups", "A1") is None
+
+
+def test_stale_or_corrupt_cache_file_is_ignored(tmp_path):
+    path = tmp_path / "nav.json"
+    path.write_text(json.dumps({"version": CACHE_VERSION - 1, "sites": {SITE: {}}}), encoding="utf-8")
+    assert NavigationCache(str(path))._entries == {}
+    path.write_text("{oops", encoding="utf-8")
+    assert NavigationCache(str(path)).lookup(SITE, "views", "A1") is None
+
+
+def test_navigator_learns_then_deep_links(tmp_path):
+    cache = NavigationCache(str(tmp_path / "nav.json"))
+    first, first_page = _visit(cache, "A1")
+    assert (first.deep_links, first.click_chains, first_page.gotos) == (0, 3, [])
+
+    again, again_page = _visit(NavigationCache(cache.path), "a1")
+    assert (again.deep_links, again.click_chains, again_page.clicks) == (3, 0, [])
+
+    # Not shared yet: another practice still clicks, and that makes the URLs shared
+    other, _ = _visit(cache, "B1")
+    assert other.click_chains == 3
+    third, _ = _visit(cache, "C1")
+    assert third.deep_links == 3
+
+
+def test_moved_page_falls_back_to_clicks(tmp_path):
+    cache = NavigationCache(str(tmp_path / "nav.json"))
+    _visit(cache, "A1", routes=(VIEWS,))
+    navigator, page = _visit(cache, "A1", routes=(VIEWS,), moved=[VIEWS])
+    assert (navigator.deep_links, navigator.click_chains) == (0, 1)
+    # The failed deep link, then back to the page the run signed in to
+    assert page.gotos == ["http://docman.test/Tasks/Views", "http://docman.test/Home"]
+    assert page.url == "http://docman.test/Tasks/Views"
+
+
+def test_practice_specific_url_stays_on_clicks(tmp_path):
+    cache = NavigationCache(str(tmp_path / "nav.json"))
+    _visit(cache, "A1", routes=(USER_GROUPS,), org="A1")
+    _visit(cache, "B1", routes=(USER_GROUPS,), org="B1")
+    navigator, _ = _visit(cache, "A1", routes=(USER_GROUPS,), org="A1")
+    assert (navigator.deep_links, navigator.click_chains) == (0, 1)
@@ -0,0 +1,82 @@
+import os
+import subprocess
+
+import pytest
+
+from git_service import GitService
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "Test", "GIT_AUTHOR_EMAIL": "test@example.com",
+    "GIT_COMMITTER_NAME": "Test", "GIT_COMMITTER_EMAIL": "test@example.com",
+}
+
+
+def _git(args, cwd):
+    subprocess.run(["git"] + args, cwd=cwd, check=True, capture_output=True, env={**os.environ, **GIT_ENV})
+
+
+def _commit(repo, name):
+    with open(os.path.join(repo, name), "w", encoding="utf-8") as handle:
+        handle.write(name)
+    _git(["add", name], repo)
+    _git(["commit", "-q", "-m", name], repo)
+
+
+@pytest.fixture
+def repos(tmp_path):
+    """(origin bare repo, working clone, a second clone standing in for another user)."""
+    origin, seed = str(tmp_path / "origin.git"), str(tmp_path / "seed")
+    _git(["init", "-q", "--bare", "-b", "main", origin], str(tmp_path))
+    _git(["clone", "-q", origin, seed], str(tmp_path))
+    _git(["checkout", "-q", "-b", "main"], seed)
+    _commit(seed, "a.txt")
+    _git(["push", "-q", "origin", "main"], seed)
+    work = str(tmp_path / "work")
+    _git(["clone", "-q", origin, work], str(tmp_path))
+    return origin, work, seed
+
+
+def test_refs_snapshot_is_reused_until_refs_change(repos):
+    _origin, work, _seed = repos
+    git = GitService(work)
+    assert git.default_branch() == "main"
+    assert git.current_branch() == "main"
+    reads = len(git.timings)
+    git.refs()
+    assert len(git.timings) == reads
+
+    # A branch made outside the tool is picked up from the ref files changing
+    _git(["checkout", "-q", "-b", "onboard/a1"], work)
+    assert git.current_branch() == "onboard/a1"
+    assert git.branch_exists("onboard/a1")
+
+
+def test_fetch_skipped_only_when_no_origin_branch_moved(repos):
+    _origin, work, seed = repos
+    git = GitService(work)
+    assert git.fetch_if_stale("main") is False
+    assert git.timings[-1].command == "ls-remote --heads origin"
+
+    # Only a non-base branch moves on origin; the fetch must still run
+    _git(["checkout", "-q", "-b", "onboard/b2"], seed)
+    _commit(seed, "b.txt")
+    _git(["push", "-q", "origin", "onboard/b2"], seed)
+    assert git.fetch_if_stale("main") is True
+    assert "onboard/b2" in git.refs()["remote"]
+    assert git.fetch_if_stale("main") is False
+
+    # A branch deleted on origin is pruned, so the next probe matches again
+    _git(["push", "-q", "origin", "--delete", "onboard/b2"], seed)
+    assert git.fetch_if_stale("main") is True
+    assert "onboard/b2" not in git.refs()["remote"]
+    assert git.fetch_if_stale("main") is False
+
+
+def test_ready_expires_with_the_refs_ttl(tmp_path, repos):
+    _origin, work, _seed = repos
+    missing = tmp_path / "later"
+    git = GitService(str(missing), refs_ttl=0)
+    assert git.ready() is False
+    _git(["clone", "-q", work, str(missing)], str(tmp_path))
+    assert git.ready() is True
+    assert GitService(str(missing)).ready() is True
@@ -0,0 +1,99 @@
+import json
+import urllib.request
+from http.cookiejar import CookieJar
+from urllib.parse import urlencode
+
+import pytest
+
+from mockDocman import LOGIN_PATH, FaultProfile, MockDocmanServer
+
+
+@pytest.fixture
+def server():
+    with MockDocmanServer() as server:
+        yield server
+
+
+def _opener():
+    return urllib.request.build_opener(urllib.request.HTTPCookieProcessor(CookieJar()))
+
+
+def _post_json(opener, url, body):
+    request = urllib.request.Request(url, json.dumps(body).encode(), {"Content-Type": "application/json"})
+    with opener.open(request) as response:
+        return json.load(response)
+
+
+def test_state_is_kept_per_signed_in_practice(server):
+    opener = _opener()
+    opener.open(server.url + LOGIN_PATH, urlencode({"OdsCode": "m00001", "Username": "u", "Password": "p"}).encode())
+    server.seed("M00002", folders=["BetterLetter: Filing"])
+    assert _post_json(opener, server.url + "/api/folders", {"name": "BetterLetter: Filing"}) == {"ok": True}
+    with pytest.raises(urllib.request.HTTPError) as duplicate:
+        _post_json(opener, server.url + "/api/folders", {"name": "betterletter: filing"})
+    assert duplicate.value.code == 409
+
+    with opener.open(server.url + "/__state?ods=M00001") as response:
+        assert json.load(response)["folders"] == ["BetterLetter: Filing"]
+    assert server.state("M00002")["folders"] == ["BetterLetter: Filing"]
+    assert server.state("M00003") is None
+
+
+def test_seeded_faults_do_not_depend_on_request_order():
+    profile = FaultProfile(error_rate=0.5, seed=7)
+    requests = [(ods, path) for ods in ("M00001", "M00002") for path in ("/Settings/Views", "/api/views")] * 5
+
+    def draws(order):
+        with MockDocmanServer(faults=profile) as server:
+            outcomes = {}
+            for ods, path in order:
+                outcomes.setdefault((ods, path), []).append(server.inject(path, ods))
+            return outcomes, server.fault_counts["requests"]
+
+    forward, backward = draws(requests), draws(list(reversed(requests)))
+    assert forward == backward
+    assert forward[1] == len(requests)
+    assert any(any(outcomes) for outcomes in forward[0].values())
+    with MockDocmanServer(faults=profile) as server:
+        assert server.inject(LOGIN_PATH, "M00001") is False
+        assert server.fault_counts["requests"] == 0
+
+
+@pytest.fixture(scope="module")
+def chromium():
+    """Skips unless Playwright's Chromium can start here (``playwright install chromium``)."""
+    from playwright.sync_api import Error as PlaywrightError
+    from playwright.sync_api import sync_playwright
+
+    try:
+        with sync_playwright() as playwright:
+            playwright.chromium.launch().close()
+    except PlaywrightError as e:
+        pytest.skip(f"Chromium cannot start: {str(e).splitlines()[0]}")
+
+
+def test_engine_onboards_practices_against_the_mock(chromium, tmp_path, monkeypatch):
+    from concurrentOnboarding import PracticeCredentials, run_concurrent
+    from docmanNavigation import CACHE_ENV
+    from onboardingCheckpoint import CHECKPOINT_DIR_ENV
+    from onboardingEngine import DEFAULT_USER_GROUPS, DEFAULT_VIEW_GROUPS, ONBOARDING_FOLDERS
+    from onboardingTrace import TRACE_DIR_ENV
+
+    monkeypatch.setenv(TRACE_DIR_ENV, str(tmp_path / "traces"))
+    monkeypatch.setenv(CHECKPOINT_DIR_ENV, str(tmp_path / "checkpoints"))
+    monkeypatch.setenv(CACHE_ENV, str(tmp_path / "nav-cache.json"))
+    practices = [PracticeCredentials(ods, "user", "secret") for ods in ("M00001", "M00002")]
+    with MockDocmanServer(faults=FaultProfile(latency_ms=20, jitter_ms=20, seed=3)) as server:
+        # A partly onboarded practice only gets what it is missing
+        server.seed("M00002", folders=ONBOARDING_FOLDERS[:1], groups=DEFAULT_USER_GROUPS[:2])
+        report = run_concurrent(practices, base_url=server.url, concurrency=2, attempt_id="test")
+        states = {practice.ods: server.state(practice.ods) for practice in practices}
+
+    assert [(result.ods, result.success, result.error) for result in sorted(report.results)] == [
+        ("M00001", True, None), ("M00002", True, None),
+    ]
+    for state in states.values():
+        assert sorted(state["folders"]) == sorted(ONBOARDING_FOLDERS)
+        assert sorted(state["groups"]) == sorted(DEFAULT_USER_GROUPS)
+        assert sorted(state["views"]) == sorted(DEFAULT_VIEW_GROUPS)
+        assert state["search"] == {"search_in": "patient", "search_using": "Name, DOB or NHS", "hide_synthetic": True}
@@ -0,0 +1,125 @@
+import json
+import os
+
+import pytest
+
+import ods_validation
+from ods_validation import INFO, ValidationCache, folder_ods, format_findings, validate_roots
+
+
+def _practice(root, folder, ods, display_name=None):
+    path = root / folder
+    path.mkdir(parents=True, exist_ok=True)
+    payload = {"ods_code": ods}
+    if display_name:
+        payload["docman_practice_display_name"] = display_name
+    (path / "work-items.json").write_text(json.dumps([{"payload": payload}]), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def root(tmp_path):
+    root = tmp_path / "in"
+    _practice(root, "Alpha Surgery (A12345)", "A12345", "Alpha Surgery")
+    _practice(root, "Beta Practice (B67890)", "C11111")
+    (root / "Practice Count").mkdir()
+    (root / "Practice Count" / "work-items.json").write_text(json.dumps([
+        {"payload": {"ods_code": "A12345", "docman_practice_display_name": "ALPHA SURGERY"}},
+        {"payload": {"ods_code": "Z99999", "docman_practice_display_name": "GONE PRACTICE"}},
+    ]), encoding="utf-8")
+    return root
+
+
+def _codes(findings):
+    return sorted((finding.folder, finding.code) for finding in findings)
+
+
+def test_findings_match_the_powershell_checks(root):
+    assert _codes(validate_roots([str(root)])) == [
+        ("Beta Practice (B67890)", "ods_mismatch"),
+        ("Practice Count", "count_entry_unmapped"),
+    ]
+
+
+def test_each_per_folder_check(tmp_path):
+    root = tmp_path / "in"
+    _practice(root, "Renamed Surgery (A12345)", "a12345", "Old Name Surgery")
+    _practice(root, "No Code Surgery", "A12345")
+    (root / "Empty (E12345)").mkdir()
+    (root / "Broken (B12345)").mkdir()
+    (root / "Broken (B12345)" / "work-items.json").write_text("{oops", encoding="utf-8")
+    _practice(root, "Scanner", "ignored")
+    findings = validate_roots([str(root)])
+    assert _codes(findings) == [
+        ("Broken (B12345)", "invalid_json"),
+        ("Empty (E12345)", "missing_work_items"),
+        ("No Code Surgery", "folder_missing_ods"),
+        ("Practice Count", "missing_practice_count"),
+        ("Renamed Surgery (A12345)", "name_mismatch"),
+    ]
+    assert folder_ods("Renamed Surgery (a12345)") == "A12345"
+    assert folder_ods("Short (A1)") is None
+
+
+def test_missing_root_is_reported_and_formatted(tmp_path, root):
+    missing = str(tmp_path / "offline")
+    findings = validate_roots([str(root), missing])
+    assert [f for f in findings if f.severity == INFO][0].code == "missing_root"
+    text = format_findings(findings, [str(root), missing])
+    assert text.startswith("[in]\nERROR: ODS mismatch in 'Beta Practice (B67890)'")
+    assert text.endswith(f"Skipped missing folder: {missing}")
+    assert format_findings([], [str(root)]) == "No issues detected."
+
+
+def test_cache_hit_rehash_and_parse(tmp_path, root):
+    cache = ValidationCache(str(tmp_path / "cache.json"))
+    first = validate_roots([str(root)], cache=cache)
+    assert cache.stats == {"hit": 0, "rehash": 0, "parsed": 2, "pruned": 0}
+
+    # Same contents, new mtime: rehashed, not reparsed
+    beta = root / "Beta Practice (B67890)" / "work-items.json"
+    os.utime(beta, ns=(1, 1))
+    reloaded = ValidationCache(str(tmp_path / "cache.json"))
+    assert validate_roots([str(root)], cache=reloaded) == first
+    assert reloaded.stats == {"hit": 1, "rehash": 1, "parsed": 0, "pruned": 0}
+
+    _practice(root, "Beta Practice (B67890)", "B67890")
+    assert _codes(validate_roots([str(root)], cache=reloaded)) == [("Practice Count", "count_entry_unmapped")]
+    assert reloaded.stats["parsed"] == 1
+
+
+def test_unreadable_work_items_is_never_a_cache_hit(tmp_path, root, monkeypatch):
+    cache = ValidationCache(str(tmp_path / "cache.json"))
+    stat = os.stat
+
+    def denied(path, *args, **kwargs):
+        if str(path).endswith(os.path.join("Alpha Surgery (A12345)", "work-items.json")):
+            raise PermissionError(path)
+        return stat(path, *args, **kwargs)
+
+    monkeypatch.setattr(ods_validation.os, "stat", denied)
+    validate_roots([str(root)], cache=cache)
+    validate_roots([str(root)], cache=cache)
+    assert cache.stats["hit"] == 1
+    assert cache.stats["hit"] + cache.stats["rehash"] + cache.stats["parsed"] == 2
+
+
+def test_prune_removes_deleted_folders_and_unconfigured_roots(tmp_path, root):
+    other = tmp_path / "other"
+    _practice(other, "Gamma (G12345)", "G12345")
+    cache = ValidationCache(str(tmp_path / "cache.json"))
+    validate_roots([str(root), str(other)], cache=cache)
+    assert len(cache) == 3
+
+    # The same root spelled differently prunes its deleted folder
+    (root / "Beta Practice (B67890)" / "work-items.json").unlink()
+    (root / "Beta Practice (B67890)").rmdir()
+    validate_roots([str(root) + os.sep + ".", str(other)], cache=cache)
+    assert cache.stats["pruned"] == 1
+    assert len(cache) == 2
+
+    # A root that is no longer configured is dropped; a configured one that is offline is kept
+    offline = tmp_path / "offline"
+    validate_roots([str(root), str(offline)], cache=cache)
+    assert cache.stats["pruned"] == 1
+    assert len(cache) == 1
@@ -0,0 +1,52 @@
+import json
+import os
+
+import onboardingCheckpoint
+from onboardingCheckpoint import CheckpointStore, RetryPolicy, backoff_seconds
+
+
+def test_progress_survives_a_reload_and_is_removed_on_completion(tmp_path):
+    store = CheckpointStore(str(tmp_path))
+    checkpoint = store.load(" a12345 ", "wave/1")
+    assert not checkpoint.resumed
+    assert checkpoint.path == os.path.join(str(tmp_path), "A12345", "wave_1.json")
+
+    checkpoint.mark_item("folders", "  BetterLetter: Input ", "skipped")
+    checkpoint.mark_step("folders")
+    checkpoint.mark_item("views", "BetterLetter Filing", "created")
+
+    resumed = store.load("A12345", "wave/1")
+    assert resumed.resumed
+    assert resumed.step_done("folders") and not resumed.step_done("views")
+    assert resumed.item_done("views", "betterletter filing")
+    assert resumed.done_items("folders") == {"betterletter: input"}
+    # A different attempt_id starts from scratch
+    assert not store.load("A12345", "wave/2").resumed
+
+    resumed.complete()
+    assert not os.path.exists(resumed.path)
+    assert not store.load("A12345", "wave/1").resumed
+
+
+def test_old_or_corrupt_checkpoint_is_ignored(tmp_path):
+    store = CheckpointStore(str(tmp_path), max_age=60)
+    checkpoint = store.load("A12345", "manual")
+    checkpoint.mark_step("folders")
+    with open(checkpoint.path, encoding="utf-8") as handle:
+        data = json.load(handle)
+    data["updated"] -= 120
+    with open(checkpoint.path, "w", encoding="utf-8") as handle:
+        json.dump(data, handle)
+    assert not store.load("A12345", "manual").resumed
+
+    with open(checkpoint.path, "w", encoding="utf-8") as handle:
+        handle.write("[1, 2")
+    assert not store.load("A12345", "manual").resumed
+
+
+def test_backoff_is_exponential_capped_and_jittered(monkeypatch):
+    policy = RetryPolicy(attempts=5, base_delay=1.0, max_delay=5.0)
+    monkeypatch.setattr(onboardingCheckpoint.random, "random", lambda: 1.0)
+    assert [backoff_seconds(policy, attempt) for attempt in (1, 2, 3, 4)] == [1.0, 2.0, 4.0, 5.0]
+    monkeypatch.setattr(onboardingCheckpoint.random, "random", lambda: 0.0)
+    assert [backoff_seconds(policy, attempt) for attempt in (1, 2, 3, 4)] == [0.5, 1.0, 2.0, 2.5]
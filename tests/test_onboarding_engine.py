@@ -0,0 +1,183 @@
+import asyncio
+import logging
+
+import pytest
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from docmanInventory import CREATED, FAILED, FOLDER_LIST, SKIPPED
+from docmanNavigation import FOLDERS_TOP_LEVEL
+from onboardingCheckpoint import RetryPolicy
+from onboardingEngine import DUPLICATE_FOLDER_MODAL, ONBOARDING_FOLDERS, OnboardingEngine
+
+LOGGER = logging.getLogger("test_onboarding_engine")
+
+
+class FakePage:
+    url = "http://docman.test/Home"
+
+    def __init__(self):
+        self.waits = []
+
+    async def wait_for_timeout(self, ms):
+        self.waits.append(ms)
+
+
+def _engine(attempts=3):
+    engine = OnboardingEngine(FakePage(), LOGGER, policies={"folders": RetryPolicy(attempts, 0.01, 0.02)})
+    engine.reopened = []
+
+    async def goto(route):
+        engine.reopened.append(route.name)
+
+    engine._goto = goto
+    return engine
+
+
+def _failing():
+    async def action():
+        raise RuntimeError("save timed out")
+    return action
+
+
+def test_last_failed_try_still_reopens_the_route():
+    engine = _engine(attempts=3)
+    outcome, error, tries = asyncio.run(engine._with_retries("folders", FOLDERS_TOP_LEVEL, "F", _failing()))
+    assert (outcome, str(error), tries) == (FAILED, "save timed out", 3)
+    # One reopen after each failed try, so the next item never starts on a half-filled dialog
+    assert engine.reopened == [FOLDERS_TOP_LEVEL.name] * 3
+    assert len(engine.raw_page.waits) == 2
+
+
+def test_save_that_landed_on_the_last_try_counts_as_created():
+    engine = _engine(attempts=2)
+    checks = []
+
+    async def landed():
+        checks.append(len(engine.reopened))
+        return len(checks) == 2
+
+    outcome, error, tries = asyncio.run(engine._with_retries("folders", FOLDERS_TOP_LEVEL, "F", _failing(), landed))
+    assert (outcome, error, tries) == (CREATED, None, 2)
+    assert checks == [1, 2]
+
+
+class Field:
+    def __init__(self, page, selector):
+        self.page, self.selector = page, selector
+
+    async def fill(self, value):
+        self.page.values[self.selector] = value
+
+    async def input_value(self):
+        return self.page.values.get(self.selector, "")
+
+
+class FolderPage(FakePage):
+    """Top Level Folder page: the save lands in ``listed`` after ``save`` ("listed", "modal" or "silent")."""
+
+    def __init__(self, listed=(), has_list=True, save="listed"):
+        super().__init__()
+        self.listed = list(listed)
+        self.has_list = has_list
+        self.save = save
+        self.values = {}
+        self.raced = []
+
+    def locator(self, selector):
+        return Field(self, selector)
+
+    async def click(self, selector):
+        if selector == "a#addFolderConfirm" and self.save == "listed":
+            self.listed.append(self.values["input#txtNewFolderName"])
+
+    async def wait_for_selector(self, selector, timeout=None, state=None):
+        if selector.endswith(":not([disabled])"):
+            return True
+        self.raced.append(selector)
+        if not await self._visible(selector):
+            raise PlaywrightTimeoutError(f"Timeout {timeout}ms exceeded")
+        return True
+
+    async def _visible(self, selector):
+        if DUPLICATE_FOLDER_MODAL in selector and self.save == "modal":
+            return True
+        return self.has_list and any(f'"{name}"' in selector for name in self.listed)
+
+    async def is_visible(self, selector):
+        return await self._visible(selector)
+
+    async def eval_on_selector_all(self, selector, js):
+        if selector == FOLDER_LIST.items:
+            return list(self.listed) if self.has_list else []
+        return 1 if self.has_list else 0
+
+
+def _folder_engine(page, unlisted=False):
+    engine = OnboardingEngine(page, LOGGER)
+    if unlisted:
+        engine._unlisted.add(FOLDER_LIST)
+    return engine
+
+
+def test_folder_save_races_modal_against_list():
+    page = FolderPage()
+    engine = _folder_engine(page)
+    assert asyncio.run(engine.create_folder("BetterLetter: Input")) == CREATED
+    assert "BetterLetter: Input" in page.raced[0] and DUPLICATE_FOLDER_MODAL in page.raced[0]
+    assert engine.latency.snapshot()["folder_saved"][0] == 1
+
+
+def test_duplicate_modal_skips_the_folder():
+    page = FolderPage(save="modal")
+    assert asyncio.run(_folder_engine(page).create_folder("BetterLetter: Input")) == SKIPPED
+
+
+def test_unconfirmed_folder_save_is_an_error_when_the_list_is_missing():
+    page = FolderPage(has_list=False)
+    engine = _folder_engine(page, unlisted=True)
+    with pytest.raises(RuntimeError, match="Could not confirm"):
+        asyncio.run(engine.create_folder("BetterLetter: Input"))
+    # Only the modal could answer, and the timeout is kept out of the folder_saved figures
+    assert page.raced == [DUPLICATE_FOLDER_MODAL]
+    assert engine.latency.timeout_ms("folder_saved", 3000) == 3000
+    assert "folder_saved" not in engine.latency._timed_out
+    assert "folder_duplicate" in engine.latency._timed_out
+
+
+def test_folder_missing_from_a_readable_list_after_saving_is_an_error():
+    page = FolderPage(listed=["Other"], save="silent")
+    with pytest.raises(RuntimeError, match="did not appear"):
+        asyncio.run(_folder_engine(page).create_folder("BetterLetter: Input"))
+
+
+def _create_items(page, names):
+    engine = _folder_engine(page)
+    created = []
+
+    async def goto(route):
+        pass
+
+    async def create_one(name):
+        created.append(name)
+        return CREATED
+
+    engine._goto = goto
+    asyncio.run(engine._create_items(
+        "folders", "Folders", "folder", FOLDERS_TOP_LEVEL, names, FOLDER_LIST, create_one,
+    ))
+    return engine, engine.report.step("Folders"), created
+
+
+def test_listed_items_are_skipped_and_the_rest_created():
+    engine, report, created = _create_items(FolderPage(listed=[" betterletter: INPUT"]), ONBOARDING_FOLDERS)
+    assert report.skipped == ["BetterLetter: Input"]
+    assert created == report.created == ONBOARDING_FOLDERS[:3]
+    assert not report.inventory_unavailable and FOLDER_LIST not in engine._unlisted
+    assert engine.checkpoint.step_done("folders")
+
+
+def test_missing_inventory_is_reported_and_nothing_is_skipped():
+    engine, report, created = _create_items(FolderPage(has_list=False), ONBOARDING_FOLDERS)
+    assert created == report.created == ONBOARDING_FOLDERS
+    assert report.inventory_unavailable and report.line().endswith("(inventory unavailable)")
+    assert FOLDER_LIST in engine._unlisted
@@ -0,0 +1,63 @@
+import math
+import random
+from collections import Counter
+
+import pytest
+
+from password_policy import DOCMAN_POLICY, STRICT_POLICY, expected_char_frequencies, generate_many, satisfies
+
+SAMPLES = 20000
+SEED = 20240917
+# Same 0.1% level as benchmarks/bench_passwords.py; the seeded byte source makes the outcome fixed
+Z_CRITICAL = 3.090
+
+
+def _critical(dof):
+    """Upper chi-square critical value (Wilson-Hilferty approximation), as in benchmarks/bench_passwords.py."""
+    k = 2.0 / (9.0 * dof)
+    return dof * (1.0 - k + Z_CRITICAL * math.sqrt(k)) ** 3
+
+
+def _chi_square(observed, expected):
+    return sum((observed.get(key, 0) - value) ** 2 / value for key, value in expected.items())
+
+
+@pytest.fixture(scope="module", params=(STRICT_POLICY, DOCMAN_POLICY), ids=lambda policy: policy.name)
+def sample(request):
+    return request.param, generate_many(SAMPLES, request.param, random.Random(SEED).randbytes)
+
+
+def test_every_password_satisfies_policy(sample):
+    policy, passwords = sample
+    assert len(passwords) == SAMPLES
+    assert [password for password in passwords if not satisfies(password, policy)] == []
+
+
+def test_character_frequencies_match_uniform_draw(sample):
+    policy, passwords = sample
+    frequencies = expected_char_frequencies(policy)
+    total_chars = SAMPLES * policy.length
+    expected = {ch: p * total_chars for ch, p in frequencies.items()}
+    observed = Counter("".join(passwords))
+    assert set(observed) <= set(expected)
+    assert _chi_square(observed, expected) <= _critical(len(expected) - 1)
+
+
+def test_classes_are_spread_evenly_over_positions(sample):
+    policy, passwords = sample
+    frequencies = expected_char_frequencies(policy)
+    class_of = {ch: index for index, char_class in enumerate(policy.classes) for ch in char_class.chars}
+    class_share = [sum(frequencies[ch] for ch in char_class.chars) for char_class in policy.classes]
+    observed = Counter((position, class_of[ch]) for password in passwords for position, ch in enumerate(password))
+    expected = {
+        (position, index): share * SAMPLES
+        for position in range(policy.length)
+        for index, share in enumerate(class_share)
+    }
+    assert _chi_square(observed, expected) <= _critical(len(expected) - policy.length)
+
+
+def test_seeded_source_is_repeatable():
+    first = generate_many(50, DOCMAN_POLICY, random.Random(SEED).randbytes)
+    assert generate_many(50, DOCMAN_POLICY, random.Random(SEED).randbytes) == first
+    assert generate_many(50, DOCMAN_POLICY, random.Random(SEED + 1).randbytes) != first
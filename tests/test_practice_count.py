@@ -0,0 +1,69 @@
+import json
+import os
+
+from practice_count import PracticeCountRegistry, normalize_practice_name, practice_count_path
+
+
+def _entry(ods, name):
+    return {"payload": {"ods_code": ods, "docman_practice_display_name": name}}
+
+
+def _write_count(root, entries):
+    path = practice_count_path(str(root))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(entries, handle)
+    return path
+
+
+def test_lookups_by_ods_and_display_name(tmp_path):
+    _write_count(tmp_path, [_entry("a12345", "Alpha Surgery (A12345)"), _entry("B67890", "ALPHA SURGERY")])
+    count = PracticeCountRegistry().get(str(tmp_path))
+    assert count.exists and len(count) == 2
+    assert "A12345" in count and " a12345 " in count
+    assert count.ods_for_name("alpha surgery") == {"A12345", "B67890"}
+    assert normalize_practice_name("Alpha Surgery (A12345)") == "ALPHA SURGERY"
+
+
+def test_registry_reuses_the_parse_until_the_file_changes(tmp_path):
+    path = _write_count(tmp_path, [_entry("A12345", "ALPHA")])
+    registry = PracticeCountRegistry()
+    count = registry.get(str(tmp_path))
+    assert registry.get(str(tmp_path) + os.sep) is count
+
+    # Same size, new mtime: still reparsed
+    _write_count(tmp_path, [_entry("C12345", "ALPHA")])
+    os.utime(path, ns=(1, 1))
+    assert "C12345" in registry.get(str(tmp_path))
+
+    # Same mtime, new size: reparsed as well
+    _write_count(tmp_path, [_entry("C12345", "ALPHA"), _entry("D12345", "DELTA")])
+    os.utime(path, ns=(1, 1))
+    assert "D12345" in registry.get(str(tmp_path))
+
+    os.remove(path)
+    assert not registry.get(str(tmp_path)).exists
+
+
+def test_own_save_does_not_force_a_reparse(tmp_path):
+    _write_count(tmp_path, [_entry("A12345", "ALPHA")])
+    registry = PracticeCountRegistry()
+    count = registry.get(str(tmp_path))
+    assert count.add("B67890", "BETA") and not count.add("b67890", "BETA")
+    count.save()
+    stamp = count._stamp
+    assert registry.get(str(tmp_path)) is count and count._stamp == stamp
+    assert count.remove("A12345") == 1
+    count.save()
+    assert [entry["payload"]["ods_code"] for entry in json.load(open(count.path))] == ["B67890"]
+
+
+def test_invalid_json_is_reported_not_reset(tmp_path):
+    path = _write_count(tmp_path, [])
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write("{not json")
+    count = PracticeCountRegistry().get(str(tmp_path))
+    assert count.load_error is not None
+    assert len(count) == 0
+    with open(path, encoding="utf-8") as handle:
+        assert handle.read() == "{not json"
@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from practice_count import PracticeCountRegistry, practice_count_path
+from practice_onboarding import PracticeRequest, load_batch_file, onboard_practices, run_batch_cli
+
+
+def _write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_csv_with_header_in_any_column_order(tmp_path):
+    path = _write(tmp_path / "wave.csv", "ODS,Practice_Name,System\na12345,Alpha Surgery,emis\nB67890,Beta,\n")
+    assert load_batch_file(path) == [
+        PracticeRequest("Alpha Surgery", "A12345", "EMIS"),
+        PracticeRequest("Beta", "B67890", "Docman"),
+    ]
+
+
+def test_csv_without_header_uses_default_system(tmp_path):
+    path = _write(tmp_path / "wave.csv", "Alpha Surgery,A12345\n\nBeta,B67890,Docman\n")
+    assert load_batch_file(path, default_system="EMIS") == [
+        PracticeRequest("Alpha Surgery", "A12345", "EMIS"),
+        PracticeRequest("Beta", "B67890", "Docman"),
+    ]
+
+
+def test_jsonl_rows(tmp_path):
+    lines = [{"practice": "Alpha Surgery", "ods_code": "a12345"}, {}, {"name": "Beta", "ods": "B67890"}]
+    path = _write(tmp_path / "wave.jsonl", "\n".join(json.dumps(row) if row else "" for row in lines))
+    assert [request.ods for request in load_batch_file(path)] == ["A12345", "B67890"]
+
+
+@pytest.mark.parametrize("name, text, line", [
+    ("wave.csv", "practice_name,ods\nAlpha,A1\nBeta,\n", 3),
+    ("wave.jsonl", '{"name": "Alpha", "ods": "A1"}\nnot json\n', 2),
+])
+def test_bad_rows_name_their_line(tmp_path, name, text, line):
+    path = _write(tmp_path / name, text)
+    with pytest.raises(ValueError, match=f"{name}:{line}:"):
+        load_batch_file(path)
+
+
+def test_duplicate_ods_rows_are_reported(tmp_path):
+    path = _write(tmp_path / "wave.csv", "Alpha,A1\nBeta,B2\nAlpha,A1\nAlpha Other,a1\n")
+    dropped = []
+    assert [request.practice_name for request in load_batch_file(path, dropped=dropped)] == ["Alpha", "Beta"]
+    assert dropped == [
+        "wave.csv:3: Alpha (A1, Docman) a repeat of line 1: Alpha (Docman)",
+        "wave.csv:4: Alpha Other (A1, Docman) conflicts with line 1: Alpha (Docman)",
+    ]
+
+
+def test_summary_and_cli_list_dropped_rows(tmp_path, capsys):
+    root = tmp_path / "root"
+    root.mkdir()
+    path = _write(tmp_path / "wave.csv", "Alpha,A1\nAlpha Other,A1\n")
+
+    assert run_batch_cli([path, "--root", str(root), "--no-validate"], []) == 0
+    output = capsys.readouterr().out
+    assert "Dropped duplicate ODS rows (1):" in output
+    assert "wave.csv:2: Alpha Other (A1, Docman) conflicts with line 1" in output
+
+    assert PracticeCountRegistry().get(str(root)).ods_for_name("ALPHA") == {"A1"}
+
+
+def test_onboard_writes_practice_files_and_one_count_entry_per_practice(tmp_path):
+    roots = [tmp_path / "in1", tmp_path / "in2"]
+    for root in roots:
+        root.mkdir()
+    practices = [PracticeRequest("alpha surgery", "A1", "Docman"), PracticeRequest("Beta", "B2", "EMIS")]
+    summary = onboard_practices([str(root) for root in roots], practices)
+    assert summary.ok
+    assert summary.practice_files_written == 4
+    for root in roots:
+        assert json.loads((root / "Alpha Surgery (A1)" / "work-items.json").read_text()) == [
+            {"payload": {"ods_code": "A1"}}
+        ]
+        entries = json.loads(open(practice_count_path(str(root)), encoding="utf-8").read())
+        assert [entry["payload"]["ods_code"] for entry in entries] == ["A1"]
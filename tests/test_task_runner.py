@@ -0,0 +1,92 @@
+import sys
+import threading
+import time
+
+import pytest
+
+from task_runner import CANCELLED, DONE, FAILED, TaskRunner, current_task
+
+
+class Runner(TaskRunner):
+    """TaskRunner that remembers finished handles, so tests can wait like the Tk loop does."""
+
+    def __init__(self):
+        super().__init__()
+        self.finished = []
+        self.lines = []
+
+    def submit(self, name, fn, *args, **kwargs):
+        return super().submit(name, fn, *args, on_done=self.finished.append, **kwargs)
+
+    def wait(self, *handles, timeout=10.0):
+        deadline = time.monotonic() + timeout
+        while not all(handle in self.finished for handle in handles):
+            if time.monotonic() > deadline:
+                raise AssertionError(", ".join(handle.describe() for handle in handles) + " did not finish")
+            if not self.poll(on_log=self.lines.append):
+                time.sleep(0.01)
+
+
+@pytest.fixture
+def runner():
+    runner = Runner()
+    yield runner
+    runner.shutdown(wait=True)
+
+
+def test_subprocess_output_is_streamed_and_collected(runner):
+    script = "import sys; print('out'); print('err', file=sys.stderr)"
+    handle = runner.submit("echo", lambda task: task.run([sys.executable, "-c", script]))
+    runner.wait(handle)
+    assert handle.status == DONE
+    assert (handle.result.returncode, handle.result.stdout, handle.result.stderr) == (0, "out\n", "err\n")
+    assert sorted(runner.lines) == ["err", "out"]
+    assert runner.finished == [handle]
+
+
+def test_cancel_terminates_a_running_subprocess(runner):
+    started = threading.Event()
+
+    def long_running(task):
+        started.set()
+        return task.run([sys.executable, "-c", "import time; print('up', flush=True); time.sleep(60)"])
+
+    handle = runner.submit("sleep", long_running)
+    assert started.wait(5)
+    while not handle._processes:
+        time.sleep(0.01)
+    start = time.monotonic()
+    handle.cancel()
+    runner.wait(handle)
+    assert handle.status == CANCELLED
+    assert time.monotonic() - start < 10
+    assert not handle._processes
+
+
+def test_lane_runs_tasks_in_order_and_failures_are_kept(runner):
+    order = []
+
+    def step(task, n):
+        assert current_task() is task
+        order.append(n)
+        if n == 2:
+            raise ValueError("bad")
+        return n
+
+    handles = [runner.submit(f"step {n}", step, n, lane="files") for n in range(4)]
+    runner.wait(*handles)
+    assert order == [0, 1, 2, 3]
+    assert [handle.status for handle in handles] == [DONE, DONE, FAILED, DONE]
+    assert str(handles[2].error) == "bad"
+    assert current_task() is None
+
+
+def test_task_cancelled_before_it_starts_never_runs(runner):
+    gate = threading.Event()
+    ran = []
+    first = runner.submit("blocker", lambda task: gate.wait(5), lane="git")
+    second = runner.submit("queued", lambda task: ran.append(True), lane="git")
+    second.cancel()
+    gate.set()
+    runner.wait(first, second)
+    assert second.status == CANCELLED and ran == []
@@ -0,0 +1,65 @@
+import json
+import os
+
+import pytest
+
+import work_items_store
+from work_items_store import FileLock, LockTimeout, TransactionError, WorkItemsTransaction, atomic_write_json
+
+
+def test_atomic_write_uses_the_repo_layout_and_leaves_no_temp_files(tmp_path):
+    path = tmp_path / "root" / "work-items.json"
+    atomic_write_json(str(path), [{"payload": {"ods_code": "A1"}}])
+    assert path.read_text(encoding="utf-8") == json.dumps([{"payload": {"ods_code": "A1"}}], indent=4) + "\n"
+    assert os.listdir(path.parent) == ["work-items.json"]
+
+
+def test_second_lock_on_the_same_file_times_out(tmp_path):
+    target = str(tmp_path / "work-items.json")
+    with FileLock(target, lock_dir=str(tmp_path / "locks")):
+        with pytest.raises(LockTimeout):
+            FileLock(target, timeout=0.05, lock_dir=str(tmp_path / "locks")).acquire()
+    with FileLock(target, timeout=0.05, lock_dir=str(tmp_path / "locks")) as lock:
+        assert lock.held
+
+
+def test_failed_second_write_rolls_back_the_first(tmp_path, monkeypatch):
+    first, second, third = (str(tmp_path / name / "work-items.json") for name in ("in1", "in2", "in3"))
+    atomic_write_json(first, ["old"])
+    atomic_write_json(second, ["old"])
+    write = work_items_store.atomic_write_bytes
+    calls = []
+
+    def failing(path, data):
+        calls.append(path)
+        if path == second and len(calls) == 2:
+            raise OSError("disk full")
+        write(path, data)
+
+    monkeypatch.setattr(work_items_store, "atomic_write_bytes", failing)
+    committed = []
+    with pytest.raises(TransactionError, match="rolled back: disk full"):
+        with WorkItemsTransaction([first, second, third], lock_dir=str(tmp_path / "locks")) as txn:
+            txn.write_json(first, ["new"], on_commit=lambda: committed.append(first))
+            txn.write_json(second, ["new"])
+            txn.write_json(third, ["new"])
+
+    assert json.load(open(first)) == ["old"]
+    assert json.load(open(second)) == ["old"]
+    assert not os.path.exists(third)
+    assert committed == []
+
+
+def test_write_outside_the_locked_set_is_refused(tmp_path):
+    with WorkItemsTransaction([str(tmp_path / "a.json")], lock_dir=str(tmp_path / "locks")) as txn:
+        with pytest.raises(TransactionError, match="not locked"):
+            txn.write_json(str(tmp_path / "b.json"), [])
+
+
+def test_exception_in_the_block_discards_staged_writes(tmp_path):
+    path = str(tmp_path / "a.json")
+    with pytest.raises(RuntimeError):
+        with WorkItemsTransaction([path], lock_dir=str(tmp_path / "locks")) as txn:
+            txn.write_json(path, ["new"])
+            raise RuntimeError("abort")
+    assert not os.path.exists(path)
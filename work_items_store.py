@@ -0,0 +1,238 @@
+"""Crash-safe, lock-protected writes for work-items.json files.
+
+* atomic_write_json writes to a temp file in the same directory, fsyncs it
+  and swaps it in with os.replace, so readers (including the bots) only ever
+  see the old or the new file, never a truncated one.
+* FileLock is an advisory, cross-process lock. Lock files live in a shared
+  lock directory rather than next to the target so they never end up in a
+  `git add -A` of the postie repo.
+* WorkItemsTransaction locks a set of files up front (in a fixed order, so
+  two operators cannot deadlock), stages writes and commits them together,
+  restoring the previous contents of every file if any write fails.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+DEFAULT_LOCK_DIR = os.path.join(tempfile.gettempdir(), "practice-admin-locks")
+DEFAULT_LOCK_TIMEOUT = 15.0
+
+
+class LockTimeout(RuntimeError):
+    pass
+
+
+class TransactionError(RuntimeError):
+    pass
+
+
+def _canonical(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _fsync_dir(directory):
+    if os.name == "nt":
+        return
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write_bytes(path, data):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix="-" + os.path.basename(path), dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    _fsync_dir(directory)
+
+
+def dump_json_bytes(data):
+    return (json.dumps(data, indent=4) + "\n").encode("utf-8")
+
+
+def atomic_write_json(path, data):
+    """Write data in the repo's usual indent=4 + trailing newline layout."""
+    atomic_write_bytes(path, dump_json_bytes(data))
+
+
+class FileLock:
+    """Advisory exclusive lock for one target path.
+
+    Blocks for up to ``timeout`` seconds, then raises LockTimeout.
+    """
+
+    def __init__(self, target_path, timeout=DEFAULT_LOCK_TIMEOUT, lock_dir=None):
+        self.target_path = target_path
+        self.timeout = timeout
+        lock_dir = lock_dir or DEFAULT_LOCK_DIR
+        digest = hashlib.sha1(_canonical(target_path).encode("utf-8")).hexdigest()[:20]
+        self.lock_path = os.path.join(lock_dir, f"{digest}.lock")
+        self._handle = None
+
+    def _try_lock(self, handle):
+        try:
+            if os.name == "nt":
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            return False
+
+    def acquire(self):
+        if self._handle is not None:
+            return self
+        os.makedirs(os.path.dirname(self.lock_path), exist_ok=True)
+        handle = open(self.lock_path, "a+b")
+        deadline = time.monotonic() + self.timeout
+        delay = 0.01
+        while not self._try_lock(handle):
+            if time.monotonic() >= deadline:
+                handle.close()
+                raise LockTimeout(f"Timed out waiting for lock on {self.target_path}")
+            time.sleep(delay)
+            delay = min(delay * 2, 0.25)
+        self._handle = handle
+        return self
+
+    def release(self):
+        handle, self._handle = self._handle, None
+        if handle is None:
+            return
+        try:
+            if os.name == "nt":
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+        except OSError:
+            pass
+        finally:
+            handle.close()
+
+    @property
+    def held(self):
+        return self._handle is not None
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+class WorkItemsTransaction:
+    """Lock several files, stage JSON writes and commit them all-or-nothing.
+
+    Usage::
+
+        with WorkItemsTransaction([path_a, path_b]) as txn:
+            ...read current contents (the locks are already held)...
+            txn.write_json(path_a, data_a)
+            txn.write_json(path_b, data_b)
+        # committed on clean exit, discarded if the block raised
+
+    If a write fails part-way through commit, files already replaced are
+    restored from their pre-commit contents and TransactionError is raised.
+    """
+
+    def __init__(self, paths, timeout=DEFAULT_LOCK_TIMEOUT, lock_dir=None):
+        unique = {}
+        for path in paths:
+            unique.setdefault(_canonical(path), path)
+        self._locks = [FileLock(unique[key], timeout, lock_dir) for key in sorted(unique)]
+        self._locked = set(unique)
+        self._staged = {}
+        self._callbacks = []
+        self.committed = False
+
+    def __enter__(self):
+        try:
+            for lock in self._locks:
+                lock.acquire()
+        except BaseException:
+            self._release()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None and not self.committed:
+                self.commit()
+        finally:
+            self._release()
+
+    def _release(self):
+        for lock in reversed(self._locks):
+            lock.release()
+
+    def write_json(self, path, data, on_commit=None):
+        key = _canonical(path)
+        if key not in self._locked:
+            raise TransactionError(f"{path} is not locked by this transaction")
+        self._staged[key] = (path, dump_json_bytes(data))
+        if on_commit is not None:
+            self._callbacks.append(on_commit)
+
+    def commit(self):
+        if self.committed:
+            return
+        originals = []
+        try:
+            for path, payload in self._staged.values():
+                try:
+                    with open(path, "rb") as handle:
+                        original = handle.read()
+                except FileNotFoundError:
+                    original = None
+                originals.append((path, original))
+                atomic_write_bytes(path, payload)
+        except Exception as exc:
+            rollback_errors = self._rollback(originals)
+            detail = f"; rollback also failed for {', '.join(rollback_errors)}" if rollback_errors else ""
+            raise TransactionError(f"Commit failed, changes rolled back: {exc}{detail}") from exc
+        self.committed = True
+        self._staged = {}
+        for callback in self._callbacks:
+            callback()
+
+    @staticmethod
+    def _rollback(originals):
+        failed = []
+        for path, original in reversed(originals):
+            try:
+                if original is None:
+                    if os.path.exists(path):
+                        os.unlink(path)
+                else:
+                    atomic_write_bytes(path, original)
+            except OSError:
+                failed.append(path)
+        return failed